@@ -9,56 +9,83 @@
 from __future__ import unicode_literals
 from sys import argv
 import ast
-from resources.lib.Cache import Cache
-from resources.lib.Constants import Constants
-from resources.lib.ContentLoader import ContentLoader
-from resources.lib.Dialogs import Dialogs
-from resources.lib.ItemHelper import ItemHelper
-from resources.lib.Session import Session
-from resources.lib.Settings import Settings
-from resources.lib.Utils import Utils
-
-# setup plugin base stuff
-try:
-    PLUGIN_HANDLE = int(argv[1])
-    KODI_BASE_URL = argv[0]
-except ValueError:
-    PLUGIN_HANDLE = 1
-    KODI_BASE_URL = ''
+import xbmc
+from resources.lib.Plugin import get_plugin
 
 try:
     from urllib.parse import parse_qsl
 except:
     from urlparse import parse_qsl
 
-# init plugin object structure
-CONSTANTS = Constants()
-CACHE = Cache()
-UTILS = Utils(constants=CONSTANTS, kodi_base_url=KODI_BASE_URL)
-DIALOGS = Dialogs(utils=UTILS)
-ITEM_HELPER = ItemHelper(constants=CONSTANTS, utils=UTILS)
-SETTINGS = Settings(utils=UTILS, dialogs=DIALOGS, constants=CONSTANTS)
-SESSION = Session(constants=CONSTANTS, util=UTILS, settings=SETTINGS)
-CONTENT_LOADER = ContentLoader(
-    session=SESSION,
-    item_helper=ITEM_HELPER,
-    cache=CACHE,
-    handle=PLUGIN_HANDLE)
-
-
-def router(paramstring):
+# plugin object structure, built once per interpreter: Kodi reuses the
+# interpreter for the next plugin call (`reuselanguageinvoker`), so the
+# session & the caches survive, per call state is passed to the router
+PLUGIN = get_plugin()
+CONSTANTS = PLUGIN.constants
+UTILS = PLUGIN.utils
+STORAGE = PLUGIN.storage
+DIALOGS = PLUGIN.dialogs
+TRACER = PLUGIN.tracer
+ITEM_HELPER = PLUGIN.item_helper
+SETTINGS = PLUGIN.settings
+CACHE = PLUGIN.cache
+BREAKER = PLUGIN.breaker
+SESSION = PLUGIN.session
+SEARCH = PLUGIN.search
+DIRECTORY = PLUGIN.directory
+CONTENT_LOADER = PLUGIN.content_loader
+
+
+def router(paramstring, handle, kodi_base_url):
     """
     Converts paramstrings into dicts & decides which
     method should be called in order to display contents
 
-    :param user: Telekom account email address or user id
-    :type user: string
-    :param password: Telekom account password
-    :type password: string
+    :param paramstring: Plugin call parameters (without the leading `?`)
+    :type paramstring: string
+    :param handle: Kodi plugin handle
+    :type handle: int
+    :param kodi_base_url: Plugin base url
+    :type kodi_base_url: string
     :returns:  bool -- Matching route found
     """
     params = dict(parse_qsl(paramstring))
     if params.get('for') is not None: params['for'] = ast.literal_eval(params.get('for'))
+    route = __get_route_name(params=params)
+    PLUGIN.start_invocation(handle=handle, kodi_base_url=kodi_base_url)
+    TRACER.start()
+    try:
+        # replay the rendered listing if there is a fresh snapshot
+        # (& the user is still logged in, else the login is checked first)
+        snapshot_ttl = CONSTANTS.get_snapshot_ttl(route=route)
+        if snapshot_ttl > 0 and SESSION.is_logged_in() and DIRECTORY.replay(route=paramstring):
+            return True
+        DIRECTORY.start(route=paramstring, ttl=snapshot_ttl)
+        processed = __dispatch(params=params)
+        # the listing is in Kodis hands, fetch what is likely opened next
+        if SETTINGS.is_prefetch_enabled():
+            CONTENT_LOADER.prefetch()
+        # documents fetched by the call (& the prefetch) are searchable now
+        SEARCH.save()
+        return processed
+    finally:
+        # the counters walk the memo & the cache index, only when tracing
+        if TRACER.enabled is True:
+            TRACER.finish(
+                route=route,
+                counters={
+                    'duplicate_requests': SESSION.get_duplicate_requests(),
+                    'cache_kb': CACHE.get_footprint() // 1024})
+
+
+def __dispatch(params):
+    """
+    Decides which method should be called in order to display contents
+
+    :param params: Route paramters
+    :type params: dict
+    :returns:  bool -- Matching route found
+    """
     keys = params.keys()
     # settings action routes
     user, password, processed = __settings_action(params=params)
@@ -76,21 +103,53 @@ def router(paramstring):
     if __login_failed_action(user=user, password=password, processed=processed) is False:
         return False
     # plugin list & video routes
+    # add/remove a sport to/from the warm-up
+    processed = __warmup_action(params=params, processed=processed) or processed
     # play a video
-    processed = __play_action(params=params, processed=processed)
+    processed = __play_action(params=params, processed=processed) or processed
+    # show live & upcoming events of all sports
+    processed = __live_now_action(params=params, processed=processed) or processed
+    # search matches in the local index
+    processed = __search_action(params=params, processed=processed) or processed
     # show details of the match found (gamereport, relive, interviews...)
-    processed = __match_details_action(params=params, processed=processed)
+    processed = __match_details_action(params=params, processed=processed) or processed
     # show main menue, selection of sport categories
-    processed = __sport_selection_action(keys=keys, processed=processed)
+    processed = __sport_selection_action(keys=keys, processed=processed) or processed
+    # show list of dates with scheduled matches (from the indexed epg)
+    processed = __date_list_action(params=params, processed=processed) or processed
     # show contents (lanes) scraped from the website
-    processed = __event_lane_action(params=params, processed=processed)
+    processed = __event_lane_action(params=params, processed=processed) or processed
+    # show matches scheduled for a date (from the indexed epg)
+    processed = __matches_list_action(params=params, processed=processed) or processed
     # show list of found matches/videos
-    processed = __categories_action(params=params, processed=processed)
-    # show contents scraped from the api (with website scraped id)
-    processed = __matches_list_action(params=params, processed=processed)
+    processed = __categories_action(params=params, processed=processed) or processed
     return processed
 
 
+def __get_route_name(params):
+    """
+    Returns a readable name of the route matching the params (for tracing)
+
+    :param params: Route paramters
+    :type params: dict
+    :returns:  string -- Route name
+    """
+    for key, name in (
+            ('action', 'settings'),
+            ('warmup', 'warmup'),
+            ('video_id', 'play'),
+            ('live', 'live_now'),
+            ('search', 'search'),
+            ('target', 'match_details'),
+            ('static', 'date_list'),
+            ('lane', 'event_lane'),
+            ('date', 'matches_list'),
+            ('for', 'categories')):
+        if params.get(key) is not None:
+            return name
+    return 'sport_selection'
+
+
 def __settings_action(params):
     """
     Operates on actions from within the settings pane
@@ -144,7 +203,68 @@ def __sport_selection_action(keys, processed):
     :returns:  bool -- Route matched
     """
     if len(keys) == 0 and processed is False:
-        CONTENT_LOADER.show_sport_selection()
+        CONTENT_LOADER.show_sport_selection(
+            warmup_sports=SETTINGS.get_warmup_sports() if SETTINGS.is_warmup_enabled() else None)
+        return True
+    return False
+
+
+def __warmup_action(params, processed):
+    """
+    Adds a sport to (or removes it from) the warm-up & refreshes the listing
+
+    :param params: Route paramters
+    :type params: dict
+    :param processed: Other route already matched
+    :type processed: bool
+    :returns:  bool -- Route matched
+    """
+    if params.get('warmup') is not None and processed is False:
+        SETTINGS.toggle_warmup_sport(sport_id=params.get('warmup'))
+        # the sport selection shows the warm-up state in its context menu
+        DIRECTORY.invalidate(route='')
+        xbmc.executebuiltin('Container.Refresh')
+        return True
+    return False
+
+
+def __live_now_action(params, processed):
+    """
+    Show live & upcoming events of all sports
+
+    :param params: Route paramters
+    :type params: dict
+    :param processed: Other route already matched
+    :type processed: bool
+    :returns:  bool -- Route matched
+    """
+    if params.get('live') is not None and processed is False:
+        CONTENT_LOADER.show_live_now()
+        return True
+    return False
+
+
+def __search_action(params, processed):
+    """
+    Show search results. If the search term isn´t given it is asked
+    for & the container is redirected to the url carrying it, so going
+    back (& the snapshot of the route) shows the results again
+
+    :param params: Route paramters
+    :type params: dict
+    :param processed: Other route already matched
+    :type processed: bool
+    :returns:  bool -- Route matched
+    """
+    if params.get('search') is not None and processed is False:
+        if params.get('query'):
+            CONTENT_LOADER.show_search_results(query=params.get('query'))
+            return True
+        query = DIALOGS.show_search_dialog()
+        DIRECTORY.end(succeeded=False)
+        if query != '':
+            xbmc.executebuiltin('Container.Update({0})'.format(
+                UTILS.build_url({'search': True, 'query': query})))
         return True
     return False
 
@@ -186,6 +306,23 @@ def __matches_list_action(params, processed):
     return False
 
 
+def __date_list_action(params, processed):
+    """
+    Show date list selection
+
+    :param params: Route paramters
+    :type params: dict
+    :param processed: Other route already matched
+    :type processed: bool
+    :returns:  bool -- Route matched
+    """
+    if params.get('for') is not None and params.get('static') is not None and params.get('lane') == 'bydate' and processed is False:
+        CONTENT_LOADER.show_date_list(
+            params.get('for'))
+        return True
+    return False
+
+
 def __event_lane_action(params, processed):
     """
     Show event lane selection
@@ -199,7 +336,9 @@ def __event_lane_action(params, processed):
     if params.get('for') is not None and params.get('lane') is not None and processed is False:
         CONTENT_LOADER.show_event_lane(
             sport=params.get('for'),
-            lane=params.get('lane'))
+            lane=params.get('lane'),
+            page=int(params.get('page', 1)),
+            offset=int(params.get('offset', 0)))
         return True
     return False
 
@@ -240,11 +379,17 @@ def __play_action(params, processed):
 
 if __name__ == '__main__':
     # Load addon data & start plugin
-    ADDON = UTILS.get_addon()
     ADDON_DATA = UTILS.get_addon_data()
     UTILS.log('Started (Version {0})'.format(ADDON_DATA.get('version')))
+    # setup plugin call stuff (argv is set anew for every call)
+    try:
+        PLUGIN_HANDLE = int(argv[1])
+        KODI_BASE_URL = argv[0]
+    except ValueError:
+        PLUGIN_HANDLE = 1
+        KODI_BASE_URL = ''
     # Call the router function and pass
     # the plugin call parameters to it.
     # We use string slicing to trim the
     # leading '?' from the plugin call paramstring
-    router(argv[2][1:])
\ No newline at end of file
+    router(argv[2][1:], handle=PLUGIN_HANDLE, kodi_base_url=KODI_BASE_URL)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Module: codec_report
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""
+Decoding speed of the available JSON backends on the recorded fixtures
+
+For every JSON fixture (the lane scaled up to `--lane-size` items) the
+time to decode the raw response body is reported per backend, along
+with the speedup over the stdlib `json` module::
+
+    python -m benchmarks.codec_report --lane-size 1000
+"""
+
+from __future__ import print_function, unicode_literals
+import argparse
+import sys
+import timeit
+from benchmarks.run import ROOT_PATH, load_fixtures
+
+if ROOT_PATH not in sys.path:
+    sys.path.insert(0, ROOT_PATH)
+
+from resources.lib.Codec import Codec
+
+
+def measure(body, backends, repeat):
+    """
+    Measures the decoding of a fixture with every backend
+
+    :param body: Fixture body
+    :type body: bytes
+    :param backends: Backend names
+    :type backends: list
+    :param repeat: Number of timed runs
+    :type repeat: int
+    :returns:  dict -- Decoding time (ms) by backend
+    """
+    result = {}
+    for backend in backends:
+        Codec.set_backend(backend)
+        result[backend] = min(timeit.repeat(
+            lambda: Codec.loads(body), number=1, repeat=repeat)) * 1000
+    return result
+
+
+def main(argv=None):
+    """
+    Command line entry point
+
+    :param argv: Command line arguments
+    :type argv: list
+    :returns:  int -- Exit code
+    """
+    parser = argparse.ArgumentParser(description='Decoding speed of the JSON backends')
+    parser.add_argument('--lane-size', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    backends = Codec.get_backends()
+    fixtures = load_fixtures(args.lane_size)
+    print('{0:<20} {1:>10} {2}'.format(
+        'fixture', 'bytes', ' '.join(['{0:>16}'.format(backend + ' ms') for backend in backends])))
+    for name in sorted(fixtures):
+        if not name.endswith('.json'):
+            continue
+        body = fixtures.get(name)
+        result = measure(body, backends, args.repeat)
+        print('{0:<20} {1:>10} {2}'.format(name, len(body), ' '.join([
+            '{0:>7.3f} ({1:>5.2f}x)'.format(result.get(backend), result.get('json') / result.get(backend))
+            for backend in backends])))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Module: payload_report
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""
+Size report of the payload normalization on the recorded fixtures
+
+For every JSON fixture (the lane scaled up to `--lane-size` items) the
+JSON & pickled sizes of the raw & the normalized document are reported,
+as well as the time of a pickle round trip (storage write & read) &
+the time the normalization takes::
+
+    python -m benchmarks.payload_report --lane-size 300
+"""
+
+from __future__ import print_function, unicode_literals
+import argparse
+import json
+import pickle
+import sys
+import timeit
+from benchmarks.run import ROOT_PATH, load_fixtures
+
+if ROOT_PATH not in sys.path:
+    sys.path.insert(0, ROOT_PATH)
+
+from resources.lib.Normalizer import Normalizer
+
+
+def measure(body, repeat):
+    """
+    Measures a fixture raw & normalized
+
+    :param body: Fixture body
+    :type body: bytes
+    :param repeat: Number of timed runs
+    :type repeat: int
+    :returns:  dict -- Sizes (bytes) & times (ms)
+    """
+    text = body.decode('utf-8')
+    raw = json.loads(text)
+    normalized = Normalizer.normalize(document=json.loads(text))
+    result = {}
+    for name, document in (('raw', raw), ('normalized', normalized)):
+        pickled = pickle.dumps(document, pickle.HIGHEST_PROTOCOL)
+        result['{0}_json'.format(name)] = len(json.dumps(document, separators=(',', ':')))
+        result['{0}_pickle'.format(name)] = len(pickled)
+        result['{0}_pickle_ms'.format(name)] = min(timeit.repeat(
+            lambda: pickle.loads(pickle.dumps(document, pickle.HIGHEST_PROTOCOL)),
+            number=1, repeat=repeat)) * 1000
+    result['normalize_ms'] = min(timeit.repeat(
+        lambda: Normalizer.normalize(document=raw), number=1, repeat=repeat)) * 1000
+    return result
+
+
+def main(argv=None):
+    """
+    Command line entry point
+
+    :param argv: Command line arguments
+    :type argv: list
+    :returns:  int -- Exit code
+    """
+    parser = argparse.ArgumentParser(description='Size report of the payload normalization')
+    parser.add_argument('--lane-size', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    fixtures = load_fixtures(args.lane_size)
+    print('{0:<20} {1:>17} {2:>19} {3:>17} {4:>10}'.format(
+        'fixture', 'json bytes', 'pickle bytes', 'pickle rt ms', 'norm. ms'))
+    for name in sorted(fixtures):
+        if not name.endswith('.json'):
+            continue
+        result = measure(fixtures.get(name), args.repeat)
+        print('{0:<20} {1:>7} -> {2:>7} {3:>8} -> {4:>7} {5:>7.3f} -> {6:>6.3f} {7:>10.3f}  ({8:.0%} smaller)'.format(
+            name,
+            result.get('raw_json'), result.get('normalized_json'),
+            result.get('raw_pickle'), result.get('normalized_pickle'),
+            result.get('raw_pickle_ms'), result.get('normalized_pickle_ms'),
+            result.get('normalize_ms'),
+            1 - result.get('normalized_pickle') / float(result.get('raw_pickle'))))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
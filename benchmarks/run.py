@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+# Module: run
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""
+Route level benchmarks for the plugin
+
+Runs `addon.router` for every route against in-process Kodi stubs &
+recorded API fixtures. Reports wall time, network calls, directory items
+& the tracemalloc peak per route, writes them as JSON & optionally
+compares them against a stored baseline.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --compare benchmarks/baseline.json
+    python -m benchmarks.run --base-url http://127.0.0.1:8080
+    python -m benchmarks.run --warm
+    python -m benchmarks.run --json json
+
+By default every iteration starts cold (no window cache, no stored
+documents, no listing snapshots), `--warm` keeps the profile storage
+between iterations & measures replayed listings instead. `--json` picks
+the JSON backend (defaults to the accelerated one if installed).
+"""
+
+from __future__ import print_function, unicode_literals
+import argparse
+import copy
+import json
+import os
+import pickle
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+try:
+    from urllib.parse import urlencode, urlparse
+except ImportError:
+    from urllib import urlencode
+    from urlparse import urlparse
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUBS_PATH = os.path.join(ROOT_PATH, 'benchmarks', 'stubs')
+FIXTURES_PATH = os.path.join(ROOT_PATH, 'benchmarks', 'fixtures')
+
+# per call state Kodi passes to the plugin
+PLUGIN_URL = 'plugin://plugin.video.magenta-sport/'
+PLUGIN_HANDLE = 1
+
+# url path patterns & the fixtures they are answered with
+FIXTURE_ROUTES = (
+    (re.compile(r'/api/v2/navigation$'), 'navigation.json'),
+    (re.compile(r'/api/v2/page/'), 'sport.json'),
+    (re.compile(r'/api/v2/lane/'), 'lane.json'),
+    (re.compile(r'/api/v2/event/'), 'match.json'),
+    (re.compile(r'/api/v2/videolane/'), 'videolane.json'),
+    (re.compile(r'/service/player/streamAccess$'), 'stream_access.json'),
+    (re.compile(r'\.xml$'), 'm3u.xml'),
+)
+
+# metrics where any increase counts as a regression
+STRICT_METRICS = ('network_calls', 'directory_items')
+# metrics compared with the relative tolerance
+RELATIVE_METRICS = ('wall_time_ms', 'peak_memory_kb')
+
+
+def setup_stubs(profile_path):
+    """
+    Puts the Kodi stubs on the module path & points the profile to a temp dir
+
+    :param profile_path: Addon profile directory
+    :type profile_path: string
+    """
+    for path in (STUBS_PATH, ROOT_PATH):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    import xbmc
+    xbmc.PROFILE_PATH = profile_path
+
+
+def load_fixtures(lane_size):
+    """
+    Loads the recorded fixtures & scales the lane fixture up to `lane_size` items
+
+    :param lane_size: Number of items in the lane fixture
+    :type lane_size: int
+    :returns:  dict -- Fixture bodies (bytes) by fixture name
+    """
+    fixtures = {}
+    for name in os.listdir(FIXTURES_PATH):
+        with open(os.path.join(FIXTURES_PATH, name), 'rb') as handle:
+            fixtures[name] = handle.read()
+    lane = json.loads(fixtures.get('lane.json').decode('utf-8'))
+    fixtures['lane.json'] = json.dumps(scale_lane(lane, lane_size)).encode('utf-8')
+    return fixtures
+
+
+def scale_lane(lane, lane_size):
+    """
+    Clones the recorded lane items (with unique targets & shifted schedules)
+    until the lane contains `lane_size` items
+
+    :param lane: Recorded lane
+    :type lane: dict
+    :param lane_size: Number of items
+    :type lane_size: int
+    :returns:  dict -- Scaled lane
+    """
+    templates = lane.get('data').get('data')
+    items = []
+    for index in range(lane_size):
+        item = copy.deepcopy(templates[index % len(templates)])
+        item['target'] = '{0}-{1}'.format(item.get('target'), index)
+        metadata = item.get('metadata')
+        shift = (index // len(templates)) * 3600
+        for key in ('scheduled_start', 'scheduled_end'):
+            if metadata.get(key, {}).get('utc_timestamp'):
+                metadata[key]['utc_timestamp'] += shift
+        items.append(item)
+    lane.get('data')['data'] = items
+    return lane
+
+
+def build_adapter(fixtures):
+    """
+    Builds a requests transport adapter that answers from the fixtures
+
+    :param fixtures: Fixture bodies by fixture name
+    :type fixtures: dict
+    :returns:  requests.adapters.BaseAdapter -- Fixture adapter
+    """
+    from requests.adapters import BaseAdapter
+    from requests.models import Response
+    from requests.structures import CaseInsensitiveDict
+
+    class FixtureAdapter(BaseAdapter):
+        """Answers requests from the recorded fixtures & counts them"""
+
+        def __init__(self):
+            super(FixtureAdapter, self).__init__()
+            self.calls = 0
+
+        def send(self, request, **kwargs):
+            self.calls += 1
+            path = re.sub('/+', '/', urlparse(request.url).path)
+            response = Response()
+            response.status_code = 404
+            response._content = b''
+            for pattern, name in FIXTURE_ROUTES:
+                if pattern.search(path):
+                    response.status_code = 200
+                    response._content = fixtures.get(name)
+                    break
+            response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+            response.encoding = 'utf-8'
+            response.url = request.url
+            response.request = request
+            return response
+
+        def close(self):
+            pass
+
+    return FixtureAdapter()
+
+
+def build_counting_adapter():
+    """
+    Builds a requests transport adapter that uses the network & counts requests,
+    used to benchmark against a stand-in server (see `benchmarks/server.py`)
+
+    :returns:  requests.adapters.HTTPAdapter -- Counting adapter
+    """
+    from requests.adapters import HTTPAdapter
+
+    class CountingAdapter(HTTPAdapter):
+        """Counts requests sent over the network"""
+
+        def __init__(self):
+            super(CountingAdapter, self).__init__()
+            self.calls = 0
+
+        def send(self, request, **kwargs):
+            self.calls += 1
+            return super(CountingAdapter, self).send(request, **kwargs)
+
+    return CountingAdapter()
+
+
+def load_addon(profile_path):
+    """
+    Imports the plugin with a logged in session
+
+    :param profile_path: Addon profile directory
+    :type profile_path: string
+    :returns:  module -- Plugin module
+    """
+    with open(os.path.join(profile_path, 'COOKIE'), 'wb') as handle:
+        pickle.dump({'displayname': 'benchmark'}, handle)
+    import addon
+    return addon
+
+
+def call_plugin(addon, paramstring):
+    """
+    Runs a plugin call, like Kodi does in a reused interpreter
+
+    :param addon: Plugin module
+    :type addon: module
+    :param paramstring: Plugin call parameters
+    :type paramstring: string
+    :returns:  bool -- Matching route found
+    """
+    return addon.router(paramstring, handle=PLUGIN_HANDLE, kodi_base_url=PLUGIN_URL)
+
+
+def build_routes(fixtures):
+    """
+    Builds the param strings of all routes from the fixtures
+
+    :param fixtures: Fixture bodies by fixture name
+    :type fixtures: dict
+    :returns:  list -- Route names & param strings
+    """
+    navigation = json.loads(fixtures.get('navigation.json').decode('utf-8'))
+    sport = navigation.get('data').get('league_filter')[0]
+    page = json.loads(fixtures.get('sport.json').decode('utf-8'))
+    lane = [group for group in page.get('data').get('content') if group.get('group_elements')[0].get('data_url')][0]
+    lane = lane.get('group_elements')[0].get('data_url')
+    item = json.loads(fixtures.get('lane.json').decode('utf-8')).get('data').get('data')[0]
+    match = json.loads(fixtures.get('match.json').decode('utf-8'))
+    video_id = match.get('data').get('content')[0].get('group_elements')[0].get('data')[0].get('videoID')
+    day = datetime.fromtimestamp(item.get('metadata').get('scheduled_start').get('utc_timestamp')).date()
+    return [
+        ('sport_selection', {}),
+        ('categories', {'for': sport}),
+        ('lane', {'for': sport, 'lane': lane}),
+        ('match_details', {'for': sport, 'lane': lane, 'target': item.get('target')}),
+        ('play', {'video_id': video_id}),
+        ('date_list', {'for': sport, 'static': True, 'lane': 'bydate'}),
+        ('matches_list', {'for': sport, 'date': day.isoformat()}),
+        ('search', {'search': True, 'query': 'saarbr'}),
+        ('live_now', {'live': True}),
+    ]
+
+
+def reset_state(addon, warm=False):
+    """
+    Clears window properties (cache), reusable item views, recorded
+    plugin calls & (unless warm) the profile storage
+
+    :param addon: Plugin module
+    :type addon: module
+    :param warm: Keep stored documents & listing snapshots
+    :type warm: bool
+    """
+    import xbmcgui
+    import xbmcplugin
+    xbmcgui.WINDOWS.clear()
+    addon.CACHE.setup_memcache()
+    addon.ITEM_HELPER.views = {}
+    xbmcplugin.reset()
+    if warm is False:
+        shutil.rmtree(addon.STORAGE.storage_path, ignore_errors=True)
+
+
+def run_route(addon, adapter, params, iterations, warm=False):
+    """
+    Benchmarks one route, every iteration starts cold (or warm)
+
+    :param addon: Plugin module
+    :type addon: module
+    :param adapter: Fixture adapter
+    :type adapter: requests.adapters.BaseAdapter
+    :param params: Route params
+    :type params: dict
+    :param iterations: Number of timed runs
+    :type iterations: int
+    :param warm: Keep the profile storage between iterations
+    :type warm: bool
+    :returns:  dict -- Route metrics
+    """
+    import xbmcplugin
+    paramstring = urlencode(params)
+    timings = []
+    if warm is True:
+        reset_state(addon)
+        call_plugin(addon, paramstring)
+    for _ in range(iterations):
+        reset_state(addon, warm)
+        adapter.calls = 0
+        start = time.perf_counter()
+        call_plugin(addon, paramstring)
+        timings.append((time.perf_counter() - start) * 1000)
+    network_calls = adapter.calls
+    duplicate_requests = addon.SESSION.get_duplicate_requests()
+    directory_items = xbmcplugin.CALLS.get('addDirectoryItem')
+    # memory is measured in a separate run, tracing skews the timings
+    reset_state(addon, warm)
+    tracemalloc.start()
+    call_plugin(addon, paramstring)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    timings.sort()
+    return {
+        'wall_time_ms': round(timings[len(timings) // 2], 3),
+        'wall_time_min_ms': round(timings[0], 3),
+        'network_calls': network_calls,
+        'duplicate_requests': duplicate_requests,
+        'directory_items': directory_items,
+        'peak_memory_kb': round(peak / 1024.0, 1),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares results against a baseline
+
+    :param results: Benchmark results
+    :type results: dict
+    :param baseline: Baseline results
+    :type baseline: dict
+    :param tolerance: Allowed relative increase of time & memory (e.g. 0.2)
+    :type tolerance: float
+    :returns:  list -- Regressions (human readable)
+    """
+    regressions = []
+    for route, expected in baseline.get('routes', {}).items():
+        actual = results.get('routes', {}).get(route)
+        if actual is None:
+            continue
+        for metric in STRICT_METRICS:
+            if actual.get(metric, 0) > expected.get(metric, 0):
+                regressions.append('{0}: {1} {2} -> {3}'.format(
+                    route, metric, expected.get(metric), actual.get(metric)))
+        for metric in RELATIVE_METRICS:
+            limit = expected.get(metric, 0) * (1 + tolerance)
+            if actual.get(metric, 0) > limit:
+                regressions.append('{0}: {1} {2} -> {3} (+{4:.0%})'.format(
+                    route, metric, expected.get(metric), actual.get(metric),
+                    actual.get(metric) / max(expected.get(metric), 1e-9) - 1))
+    return regressions
+
+
+def run(iterations, lane_size, routes=None, base_url=None, warm=False, json_backend=None):
+    """
+    Runs the benchmarks
+
+    :param iterations: Number of timed runs per route
+    :type iterations: int
+    :param lane_size: Number of items in the lane fixture
+    :type lane_size: int
+    :param routes: Names of the routes to run (defaults to all)
+    :type routes: list
+    :param base_url: Stand-in server to use instead of the in-process fixtures
+    :type base_url: string
+    :param warm: Keep the profile storage between iterations
+    :type warm: bool
+    :param json_backend: JSON backend to decode with (defaults to the preferred one)
+    :type json_backend: string
+    :returns:  dict -- Benchmark results
+    """
+    profile_path = tempfile.mkdtemp(prefix='magenta-sport-bench-')
+    try:
+        setup_stubs(profile_path)
+        fixtures = load_fixtures(lane_size)
+        addon = load_addon(profile_path)
+        from resources.lib.Codec import Codec
+        if json_backend:
+            Codec.set_backend(json_backend)
+        if base_url:
+            addon.CONSTANTS.set_base_url(base_url)
+            adapter = build_counting_adapter()
+        else:
+            adapter = build_adapter(fixtures)
+        _session = addon.SESSION.get_session()
+        _session.mount('https://', adapter)
+        _session.mount('http://', adapter)
+        all_routes = build_routes(fixtures)
+        # prime the search index
+        call_plugin(addon, urlencode(dict(all_routes)['lane']))
+        results = {
+            'meta': {
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'iterations': iterations,
+                'lane_size': lane_size,
+                'base_url': base_url,
+                'warm': warm,
+                'json': Codec.get_backend(),
+                'created': datetime.now().isoformat(),
+            },
+            'routes': {},
+        }
+        for name, params in all_routes:
+            if routes and name not in routes:
+                continue
+            results['routes'][name] = run_route(addon, adapter, params, iterations, warm)
+        return results
+    finally:
+        shutil.rmtree(profile_path, ignore_errors=True)
+
+
+def main(argv=None):
+    """
+    Command line entry point
+
+    :param argv: Command line arguments
+    :type argv: list
+    :returns:  int -- Exit code (1 if regressions were found)
+    """
+    parser = argparse.ArgumentParser(description='Route level plugin benchmarks')
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--lane-size', type=int, default=300)
+    parser.add_argument('--route', action='append', dest='routes')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--base-url', help='benchmark against a stand-in server (benchmarks/server.py)')
+    parser.add_argument('--warm', action='store_true', help='keep stored documents & listing snapshots between iterations')
+    parser.add_argument('--json', dest='json_backend', help='JSON backend (orjson, ujson or json)')
+    args = parser.parse_args(argv)
+
+    results = run(args.iterations, args.lane_size, args.routes, args.base_url, args.warm, args.json_backend)
+    for name, metrics in results.get('routes').items():
+        print('{0:<16} {1:>10.2f} ms {2:>4} net {3:>5} items {4:>10.1f} KiB'.format(
+            name, metrics.get('wall_time_ms'), metrics.get('network_calls'),
+            metrics.get('directory_items'), metrics.get('peak_memory_kb')))
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(results, json.load(handle), args.tolerance)
+        for regression in regressions:
+            print('REGRESSION {0}'.format(regression))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+# Module: server
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""
+Local stand-in for the Magenta Sport API, serves the recorded fixtures
+
+Serves navigation, sport pages, lanes, match details, stream access,
+the m3u XML & the factorx login form with configurable latency, jitter,
+error rate & ETag/304 behaviour. With `--page-size` lanes are paged
+(`?page=n`, `pagination` object in the lane data). Point the plugin
+at it with::
+
+    python -m benchmarks.server --port 8080 --latency 150 --jitter 50 --error-rate 0.05
+    MAGENTASPORT_BASE_URL=http://127.0.0.1:8080 kodi
+
+Request counters are available at `/__stats`.
+"""
+
+from __future__ import print_function, unicode_literals
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlparse
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs, urlparse
+
+from benchmarks.run import FIXTURE_ROUTES, load_fixtures
+
+# routes only the stand-in serves (login flow)
+LOGIN_ROUTES = (
+    (re.compile(r'/service/auth/web/login$'), 'login.html'),
+    (re.compile(r'/factorx$'), 'login.html'),
+)
+# host the recorded stream access documents point to
+STREAM_HOST = '//streams.magentasport.de'
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    """Threaded HTTP server holding the fixtures, the config & the stats"""
+
+    daemon_threads = True
+
+
+    def __init__(self, address, fixtures, options):
+        """
+        Sets up the server
+
+        :param address: Host & port
+        :type address: tuple
+        :param fixtures: Fixture bodies by fixture name
+        :type fixtures: dict
+        :param options: Parsed command line options
+        :type options: argparse.Namespace
+        """
+        HTTPServer.__init__(self, address, StandInHandler)
+        self.fixtures = fixtures
+        self.options = options
+        self.random = random.Random(options.seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'not_modified': 0, 'routes': {}}
+        host = '//{0}:{1}'.format(self.server_address[0], self.server_address[1])
+        self.fixtures['stream_access.json'] = fixtures.get('stream_access.json').replace(
+            STREAM_HOST.encode('utf-8'), host.encode('utf-8'))
+
+
+    def count(self, key, route=None):
+        """
+        Increments a counter
+
+        :param key: Counter name
+        :type key: string
+        :param route: Fixture name the request was answered with
+        :type route: string
+        """
+        with self.lock:
+            self.stats[key] += 1
+            if route is not None:
+                self.stats['routes'][route] = self.stats['routes'].get(route, 0) + 1
+
+
+    def draw_delay(self):
+        """
+        Returns the delay for a response (latency +- jitter)
+
+        :returns:  float -- Delay in sec
+        """
+        with self.lock:
+            jitter = self.random.uniform(-self.options.jitter, self.options.jitter)
+        return max(0, self.options.latency + jitter) / 1000.0
+
+
+    def draw_error(self):
+        """
+        Decides if a request should fail
+
+        :returns:  bool -- Respond with an error
+        """
+        with self.lock:
+            return self.random.random() < self.options.error_rate
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers requests from the fixtures"""
+
+    protocol_version = 'HTTP/1.1'
+
+
+    def do_GET(self):
+        """Handles GET requests"""
+        self.__respond()
+
+
+    def do_POST(self):
+        """Handles POST requests"""
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self.__respond()
+
+
+    def log_message(self, format, *args):
+        """Logs only if verbose output is enabled"""
+        if self.server.options.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+    def __respond(self):
+        """Looks up the fixture, applies delay, errors & ETags & responds"""
+        server = self.server
+        path = re.sub('/+', '/', urlparse(self.path).path)
+        server.count('requests')
+        if path == '/__stats':
+            with server.lock:
+                body = json.dumps(server.stats).encode('utf-8')
+            return self.__send(200, body, 'application/json')
+        name = self.__match(path)
+        time.sleep(server.draw_delay())
+        if name is None:
+            return self.__send(404, b'', 'text/plain')
+        if server.draw_error():
+            server.count('errors', name)
+            return self.__send(server.options.error_status, b'', 'text/plain')
+        body = server.fixtures.get(name)
+        if name == 'lane.json' and server.options.page_size > 0:
+            body = self.__paginate(body)
+        etag = '"{0}"'.format(hashlib.md5(body).hexdigest())
+        if server.options.etags and self.headers.get('If-None-Match') == etag:
+            server.count('not_modified', name)
+            return self.__send(304, b'', None, {'ETag': etag})
+        with server.lock:
+            server.stats['routes'][name] = server.stats['routes'].get(name, 0) + 1
+        headers = {'ETag': etag} if server.options.etags else {}
+        if path.endswith('/factorx'):
+            headers['Set-Cookie'] = 'displayname=standin; Path=/'
+        content_type = 'text/html' if name.endswith('.html') else 'application/xml' if name.endswith('.xml') else 'application/json'
+        return self.__send(200, body, content_type, headers)
+
+
+    def __paginate(self, body):
+        """
+        Cuts the requested page out of a lane document
+
+        :param body: Lane document
+        :type body: bytes
+        :returns:  bytes -- Lane page
+        """
+        page_size = self.server.options.page_size
+        lane = json.loads(body.decode('utf-8'))
+        items = lane.get('data').get('data')
+        try:
+            page = max(1, int(parse_qs(urlparse(self.path).query).get('page', ['1'])[0]))
+        except ValueError:
+            page = 1
+        lane['data']['data'] = items[(page - 1) * page_size:page * page_size]
+        lane['data']['pagination'] = {
+            'current_page': page,
+            'last_page': max(1, (len(items) + page_size - 1) // page_size),
+            'per_page': page_size,
+            'total': len(items),
+        }
+        return json.dumps(lane).encode('utf-8')
+
+
+    def __match(self, path):
+        """
+        Finds the fixture for a path
+
+        :param path: Normalized request path
+        :type path: string
+        :returns:  string -- Fixture name (or None)
+        """
+        for pattern, name in FIXTURE_ROUTES + LOGIN_ROUTES:
+            if pattern.search(path):
+                return name
+        return None
+
+
+    def __send(self, status, body, content_type, headers=None):
+        """
+        Writes a response
+
+        :param status: HTTP status
+        :type status: int
+        :param body: Response body
+        :type body: bytes
+        :param content_type: Content type (or None)
+        :type content_type: string
+        :param headers: Additional headers
+        :type headers: dict
+        """
+        self.send_response(status)
+        if content_type is not None:
+            self.send_header('Content-Type', '{0}; charset=utf-8'.format(content_type))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+
+def build_parser():
+    """
+    Builds the command line parser
+
+    :returns:  argparse.ArgumentParser -- Parser
+    """
+    parser = argparse.ArgumentParser(description='Local Magenta Sport API stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0, help='response delay in ms')
+    parser.add_argument('--jitter', type=float, default=0, help='+- random delay in ms')
+    parser.add_argument('--error-rate', type=float, default=0, help='share of failing requests (0..1)')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--no-etags', dest='etags', action='store_false', help='disable ETag/304 handling')
+    parser.add_argument('--lane-size', type=int, default=300)
+    parser.add_argument('--page-size', type=int, default=0, help='page lanes (items per page, 0 disables paging)')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--verbose', action='store_true')
+    return parser
+
+
+def serve(options):
+    """
+    Builds the server (port 0 picks a free port)
+
+    :param options: Parsed command line options
+    :type options: argparse.Namespace
+    :returns:  StandInServer -- Server (not yet serving)
+    """
+    return StandInServer((options.host, options.port), load_fixtures(options.lane_size), options)
+
+
+def main(argv=None):
+    """
+    Command line entry point
+
+    :param argv: Command line arguments
+    :type argv: list
+    :returns:  int -- Exit code
+    """
+    options = build_parser().parse_args(argv)
+    server = serve(options)
+    print('Serving fixtures on http://{0}:{1}'.format(*server.server_address))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# Module: stress_cache
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""
+Concurrent writer stress test for the in-memory cache
+
+Starts many writer processes (like widgets & the foreground UI running
+plugin invocations at the same time) that add & read cache items in the
+stubbed home window. The window properties are shared between the
+processes, every single property access is atomic (as in Kodi). Reports
+items lost by concurrent index updates & properties left without an
+index entry, exits with 1 if anything got lost::
+
+    python -m benchmarks.stress_cache --writers 16 --items 50
+    python -m benchmarks.stress_cache --unlocked
+
+`--unlocked` disables the cache lock to show the lost updates it prevents.
+"""
+
+from __future__ import print_function, unicode_literals
+import argparse
+import base64
+import multiprocessing
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+from benchmarks.run import setup_stubs
+
+
+def build_cache(profile_path, properties, unlocked=False):
+    """
+    Builds a cache instance on top of the shared window properties
+
+    :param profile_path: Addon profile directory
+    :type profile_path: string
+    :param properties: Shared properties of the home window
+    :type properties: multiprocessing.managers.DictProxy
+    :param unlocked: Disable the cache lock
+    :type unlocked: bool
+    :returns:  resources.lib.Cache -- Cache instance
+    """
+    setup_stubs(profile_path)
+    import xbmcgui
+    from resources.lib.Cache import Cache
+    from resources.lib.Constants import Constants
+    from resources.lib.Dialogs import Dialogs
+    from resources.lib.Settings import Settings
+    from resources.lib.Utils import Utils
+    constants = Constants()
+    xbmcgui.WINDOWS[constants.get_cache_window_id()] = properties
+    utils = Utils(constants=constants, kodi_base_url='')
+    settings = Settings(utils=utils, dialogs=Dialogs(utils=utils), constants=constants)
+    cache = Cache(constants=constants, utils=utils, settings=settings)
+    if unlocked is True:
+        cache.lock.acquire = lambda blocking=True: True
+    return cache
+
+
+def write(profile_path, properties, start, writer_id, items, unlocked):
+    """
+    Writer process, adds its items & reads the previous one after every write
+
+    :param profile_path: Addon profile directory
+    :type profile_path: string
+    :param properties: Shared properties of the home window
+    :type properties: multiprocessing.managers.DictProxy
+    :param start: Event all writers wait for
+    :type start: multiprocessing.Event
+    :param writer_id: Number of the writer
+    :type writer_id: int
+    :param items: Number of items to add
+    :type items: int
+    :param unlocked: Disable the cache lock
+    :type unlocked: bool
+    """
+    cache = build_cache(profile_path, properties, unlocked)
+    start.wait()
+    for item in range(items):
+        cache.add_cached_item('w{0}-{1}'.format(writer_id, item), {'writer': writer_id, 'item': item})
+        if item > 0:
+            cache.get_cached_item('w{0}-{1}'.format(writer_id, item - 1))
+
+
+def run(writers, items, unlocked=False):
+    """
+    Runs the writers & checks the cache afterwards
+
+    :param writers: Number of writer processes
+    :type writers: int
+    :param items: Number of items added per writer
+    :type items: int
+    :param unlocked: Disable the cache lock
+    :type unlocked: bool
+    :returns:  dict -- Expected, indexed, lost & orphaned items, duration
+    """
+    profile_path = tempfile.mkdtemp(prefix='magenta-sport-stress-')
+    manager = multiprocessing.Manager()
+    try:
+        properties = manager.dict()
+        cache = build_cache(profile_path, properties)
+        start = multiprocessing.Event()
+        processes = [
+            multiprocessing.Process(
+                target=write,
+                args=(profile_path, properties, start, writer_id, items, unlocked))
+            for writer_id in range(writers)]
+        for process in processes:
+            process.start()
+        started = time.time()
+        start.set()
+        for process in processes:
+            process.join()
+        duration = time.time() - started
+        prefix = '{0}.memcache'.format(cache.constants.get_addon_id())
+        index = set([item_id for item_id, _ in pickle.loads(base64.b64decode(properties.get(prefix)))])
+        stored = set([key[len(prefix) + 1:] for key in properties.keys() if key != prefix])
+        expected = set([
+            'w{0}-{1}'.format(writer_id, item)
+            for writer_id in range(writers) for item in range(items)])
+        return {
+            'expected': len(expected),
+            'indexed': len(index & expected),
+            'lost': len(expected - (index & stored)),
+            'orphaned': len(stored - index),
+            'duration_s': round(duration, 2),
+        }
+    finally:
+        manager.shutdown()
+        shutil.rmtree(profile_path, ignore_errors=True)
+
+
+def main(argv=None):
+    """
+    Command line entry point
+
+    :param argv: Command line arguments
+    :type argv: list
+    :returns:  int -- Exit code (1 if items got lost)
+    """
+    parser = argparse.ArgumentParser(description='Concurrent writer stress test for the in-memory cache')
+    parser.add_argument('--writers', type=int, default=16)
+    parser.add_argument('--items', type=int, default=50)
+    parser.add_argument('--unlocked', action='store_true', help='disable the cache lock')
+    args = parser.parse_args(argv)
+
+    result = run(args.writers, args.items, args.unlocked)
+    print('{expected} items written, {indexed} indexed, {lost} lost, {orphaned} orphaned in {duration_s} s'.format(**result))
+    return 1 if result.get('lost') > 0 or result.get('orphaned') > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
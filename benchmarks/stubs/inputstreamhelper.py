@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+# Module: inputstreamhelper
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""In-process stand-in for `inputstreamhelper` (benchmarks only)"""
+
+
+class Helper(object):
+    """Reports inputstream.adaptive as available"""
+
+    def __init__(self, protocol, drm=None):
+        self.protocol = protocol
+
+    def check_inputstream(self):
+        """InputStream Adaptive is always available"""
+        return True
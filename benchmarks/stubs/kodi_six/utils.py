@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+# Module: kodi_six.utils
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""In-process stand-in for `kodi_six.utils` on Python 3 (benchmarks only)"""
+
+
+def py2_encode(value, encoding='utf-8'):
+    """No-op on Python 3"""
+    return value
+
+
+def py2_decode(value, encoding='utf-8'):
+    """No-op on Python 3"""
+    return value
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Module: xbmc
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""In-process stand-in for Kodis `xbmc` module (benchmarks only)"""
+
+import json
+import os
+import time
+
+LOGDEBUG = 0
+LOGINFO = 1
+LOGNOTICE = 2
+LOGWARNING = 3
+LOGERROR = 4
+LOGFATAL = 6
+LOGNONE = 7
+
+# collected log lines, used by the harness to inspect plugin output
+LOG = []
+# absolute path `special://profile/addon_data/...` paths are mapped to
+PROFILE_PATH = os.path.join(os.getcwd(), 'profile')
+# response of `executeJSONRPC`
+JSONRPC_RESULT = {'result': {'version': {'major': 19}, 'name': 'Kodi'}}
+
+
+def log(msg, level=LOGDEBUG):
+    """Collects a log line"""
+    LOG.append((level, msg))
+
+
+def translatePath(path):
+    """Maps special:// paths to the benchmark profile directory"""
+    if path.startswith('special://'):
+        return '{0}{1}'.format(PROFILE_PATH, os.sep)
+    return path
+
+
+# total RAM returned for `System.Memory(total)` (in MB)
+MEMORY_TOTAL = 2048
+# other info labels returned by `getInfoLabel` (e.g. `Container.FolderPath`)
+INFO_LABELS = {}
+
+
+def getInfoLabel(label):
+    """Returns a fixed MAC address, the configured total RAM & info labels"""
+    if label == 'Network.MacAddress':
+        return '00:11:22:33:44:55'
+    if label == 'System.Memory(total)':
+        return '{0}MB'.format(MEMORY_TOTAL)
+    return INFO_LABELS.get(label, '')
+
+
+def getCondVisibility(condition):
+    """No conditions are met"""
+    return False
+
+
+def executeJSONRPC(payload):
+    """Answers every JSON-RPC request with the configured result"""
+    return json.dumps(JSONRPC_RESULT)
+
+
+# builtins executed by the plugin
+BUILTINS = []
+
+
+def executebuiltin(function, wait=False):
+    """Collects the builtin"""
+    BUILTINS.append(function)
+
+
+def sleep(msec):
+    """Sleeps"""
+    time.sleep(msec / 1000.0)
+
+
+def getFreeMem():
+    """Returns free memory in MB"""
+    return 2048
+
+
+class Monitor(object):
+    """Minimal Kodi monitor"""
+
+    def abortRequested(self):
+        """Never aborts"""
+        return False
+
+    def waitForAbort(self, timeout=None):
+        """Sleeps for the timeout, never aborts"""
+        if timeout:
+            time.sleep(timeout)
+        return False
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# Module: xbmcaddon
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""In-process stand-in for Kodis `xbmcaddon` module (benchmarks only)"""
+
+# addon settings, shared by all `Addon` instances
+SETTINGS = {}
+# addon infos, shared by all `Addon` instances
+INFO = {
+    'id': 'plugin.video.magenta-sport',
+    'name': 'Magenta Sport',
+    'version': '0.0.0',
+    'fanart': 'fanart.jpg',
+    'profile': 'special://profile/addon_data/plugin.video.magenta-sport/',
+}
+
+
+class Addon(object):
+    """Dict backed addon instance"""
+
+    def __init__(self, id=None):
+        self.id = id
+
+    def getAddonInfo(self, key):
+        """Returns an addon info"""
+        return INFO.get(key, '')
+
+    def getSetting(self, key):
+        """Returns a setting as string"""
+        return SETTINGS.get(key, '')
+
+    def getSettingBool(self, key):
+        """Returns a setting as bool"""
+        return SETTINGS.get(key, 'false') == 'true'
+
+    def getSettingInt(self, key):
+        """Returns a setting as int"""
+        return int(SETTINGS.get(key) or 0)
+
+    def setSetting(self, key, value):
+        """Stores a setting"""
+        SETTINGS[key] = value
+
+    def getLocalizedString(self, string_id):
+        """Returns the string id"""
+        return '#{0}'.format(string_id)
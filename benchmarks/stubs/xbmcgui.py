@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# Module: xbmcgui
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""In-process stand-in for Kodis `xbmcgui` module (benchmarks only)"""
+
+INPUT_ALPHANUM = 0
+ALPHANUM_HIDE_INPUT = 2
+NOTIFICATION_INFO = 'info'
+NOTIFICATION_WARNING = 'warning'
+NOTIFICATION_ERROR = 'error'
+
+# window properties by window id
+WINDOWS = {}
+# id returned by `getCurrentWindowId`
+CURRENT_WINDOW_ID = 10025
+# text returned by `Dialog.input`
+INPUT = ''
+# shown notifications
+NOTIFICATIONS = []
+
+
+def getCurrentWindowId():
+    """Returns the configured window id"""
+    return CURRENT_WINDOW_ID
+
+
+class Window(object):
+    """Dict backed window (properties only)"""
+
+    def __init__(self, window_id=None):
+        self.properties = WINDOWS.setdefault(window_id, {})
+
+    def getProperty(self, key):
+        """Returns a property (empty string if unset)"""
+        return self.properties.get(key, '')
+
+    def setProperty(self, key, value):
+        """Sets a property (Kodi stores strings only)"""
+        self.properties[key] = str(value)
+
+    def clearProperty(self, key):
+        """Removes a property"""
+        self.properties.pop(key, None)
+
+
+class ListItem(object):
+    """Records everything set on a list item"""
+
+    def __init__(self, label='', label2='', path='', offscreen=False):
+        self.label = label
+        self.label2 = label2
+        self.path = path
+        self.art = {}
+        self.info = {}
+        self.properties = {}
+        self.context_menu = []
+
+    def getLabel(self):
+        """Returns the label"""
+        return self.label
+
+    def setLabel(self, label):
+        """Sets the label"""
+        self.label = label
+
+    def getPath(self):
+        """Returns the path"""
+        return self.path
+
+    def setPath(self, path):
+        """Sets the path"""
+        self.path = path
+
+    def setArt(self, art):
+        """Sets art"""
+        self.art.update(art)
+
+    def setInfo(self, info_type, info):
+        """Sets info labels"""
+        self.info.setdefault(info_type, {}).update(info)
+
+    def setProperty(self, key, value):
+        """Sets a property"""
+        self.properties[key] = value
+
+    def getProperty(self, key):
+        """Returns a property"""
+        return self.properties.get(key, '')
+
+    def setContentLookup(self, enable):
+        """Ignored"""
+
+    def setMimeType(self, mime_type):
+        """Ignored"""
+
+    def addContextMenuItems(self, items, replaceItems=False):
+        """Collects context menu items"""
+        self.context_menu.extend(items)
+
+
+class Dialog(object):
+    """Non interactive dialogs"""
+
+    def input(self, heading, defaultt='', type=INPUT_ALPHANUM, option=0, autoclose=0):
+        """Returns the configured input"""
+        return INPUT
+
+    def ok(self, heading, message=''):
+        """Confirms"""
+        return True
+
+    def yesno(self, heading, message='', *args, **kwargs):
+        """Agrees"""
+        return True
+
+    def notification(self, heading, message, icon=NOTIFICATION_INFO, time=5000, sound=True):
+        """Records the notification"""
+        NOTIFICATIONS.append((heading, message, icon))
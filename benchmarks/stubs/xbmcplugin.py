@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Module: xbmcplugin
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""In-process stand-in for Kodis `xbmcplugin` module (benchmarks only)"""
+
+SORT_METHOD_NONE = 0
+SORT_METHOD_LABEL = 1
+SORT_METHOD_DATE = 3
+
+# calls made by the plugin, reset by the harness between runs
+CALLS = {
+    'addDirectoryItem': 0,
+    'addSortMethod': 0,
+    'endOfDirectory': 0,
+    'setResolvedUrl': 0,
+}
+# directory items (url, list item, is folder) of the last listing
+ITEMS = []
+# (succeeded, list item) of the last `setResolvedUrl` call
+RESOLVED = []
+
+
+def reset():
+    """Clears the recorded calls"""
+    for key in CALLS:
+        CALLS[key] = 0
+    del ITEMS[:]
+    del RESOLVED[:]
+
+
+def addDirectoryItem(handle, url, listitem, isFolder=False, totalItems=0):
+    """Records a directory item"""
+    CALLS['addDirectoryItem'] += 1
+    ITEMS.append((url, listitem, isFolder))
+    return True
+
+
+def addDirectoryItems(handle, items, totalItems=0):
+    """Records a list of directory items"""
+    for url, listitem, is_folder in items:
+        addDirectoryItem(handle, url, listitem, is_folder)
+    return True
+
+
+def addSortMethod(handle, sortMethod, label2Mask=''):
+    """Records a sort method"""
+    CALLS['addSortMethod'] += 1
+
+
+def setContent(handle, content):
+    """Ignored"""
+
+
+def endOfDirectory(handle, succeeded=True, updateListing=False, cacheToDisc=True):
+    """Records the end of a listing"""
+    CALLS['endOfDirectory'] += 1
+
+
+def setResolvedUrl(handle, succeeded, listitem):
+    """Records a resolved url"""
+    CALLS['setResolvedUrl'] += 1
+    RESOLVED.append((succeeded, listitem))
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# Module: xbmcvfs
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""In-process stand-in for Kodis `xbmcvfs` module (benchmarks only)"""
+
+import os
+from xbmc import translatePath
+
+
+class Stat(object):
+    """`os.stat` backed file stats"""
+
+    def __init__(self, path):
+        self._stat = os.stat(path)
+
+    def st_mtime(self):
+        """Returns the modification time"""
+        return self._stat.st_mtime
+
+    def st_size(self):
+        """Returns the file size"""
+        return self._stat.st_size
+
+
+def exists(path):
+    """Checks if a path exists"""
+    return os.path.exists(path)
+
+
+def mkdirs(path):
+    """Creates a directory tree"""
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    return True
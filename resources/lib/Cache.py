@@ -6,7 +6,11 @@
 
 """Caching facade for KODIs window API"""
 from __future__ import unicode_literals
+import base64
+import binascii
+import re
 import xbmcgui, xbmc
+from resources.lib.FileLock import FileLock
 
 try:
     import cPickle as pickle
@@ -18,21 +22,40 @@ class Cache(object):
     """Caching facade for KODIs window API"""
 
 
-    def __init__(self):
-        """Setup in memory cache & stores window instance in memory"""
+    def __init__(self, constants, utils, settings):
+        """
+        Injects instances, setup in memory cache & its lock
+
+        :param constants: Constants instance
+        :type constants: resources.lib.Constants
+        :param utils: Utils instance
+        :type utils: resources.lib.Utils
+        :param settings: Settings instance
+        :type settings: resources.lib.Settings
+        """
+        self.constants = constants
+        self.utils = utils
+        self.settings = settings
+        self.budget = None
+        # guards the index, plugin processes (e.g. widgets) write concurrently
+        self.lock = FileLock(
+            lock_file=self.utils.get_addon_data().get('cache_lock_path'),
+            timeout=self.constants.get_cache_lock_timeout(),
+            stale=self.constants.get_cache_lock_stale())
         self.setup_memcache()
 
 
     def setup_memcache(self):
-        """Setup in memory cache"""
-        window = self.__get_window_instance()
-        try:
-            cached_items = pickle.loads(window.getProperty('memcache'))
-        except (EOFError, TypeError, pickle.UnpicklingError):
-            cached_items = {}
-        if len(cached_items) < 1:
-            window.setProperty('memcache', pickle.dumps(cached_items, 0))
-        return cached_items
+        """
+        Setup in memory cache. Every item is stored (pickled & base64
+        encoded, properties are strings) in a window property of its
+        own, the `<addon id>.memcache` property holds the
+        index: ids & encoded sizes of the items, least recently used first.
+        A missing index is an empty one, it is only written under the lock
+
+        :returns:  list -- Index of cached items
+        """
+        return self.__load_index(window=self.__get_window_instance())
 
 
     def has_cached_item(self, cache_id):
@@ -44,28 +67,46 @@ class Cache(object):
         :returns:  bool -- Matching item found
         """
         window = self.__get_window_instance()
-        cached_items = pickle.loads(window.getProperty('memcache'))
-        return cache_id in cached_items.keys()
+        index = self.__load_index(window=window)
+        return cache_id in [item_id for item_id, _ in index]
 
 
     def get_cached_item(self, cache_id):
         """
-        Returns a cached item
+        Returns a cached item & marks it as recently used
+        (skipped if another process holds the lock)
 
         :param cache_id: ID of the cached item
         :type cache_id: str.
         :returns:  mixed -- Cached item
         """
         window = self.__get_window_instance()
-        cached_items = pickle.loads(window.getProperty('memcache'))
-        if self.has_cached_item(cache_id) is not True:
+        locked = self.lock.acquire(blocking=False)
+        try:
+            index = self.__load_index(window=window)
+            entry = [item for item in index if item[0] == cache_id]
+            if len(entry) == 0:
+                return None
+            if locked is True and index[-1] is not entry[0]:
+                index.remove(entry[0])
+                index.append(entry[0])
+                self.__save_index(window=window, index=index)
+        finally:
+            if locked is True:
+                self.lock.release()
+        try:
+            return self.__decode(window.getProperty(self.__get_property(cache_id)))
+        except (EOFError, TypeError, ValueError, binascii.Error, pickle.UnpicklingError):
             return None
-        return cached_items[cache_id]
 
 
     def add_cached_item(self, cache_id, contents):
         """
-        Adds an item to the cache
+        Adds an item to the cache, least recently used items are
+        evicted until the cache fits into its memory budget.
+        Items exceeding the budget on their own aren´t cached.
+        The index is changed under the lock, so concurrent writers
+        don´t lose each others items
 
         :param cache_id: ID of the item to be cached
         :type cache_id: str.
@@ -73,16 +114,150 @@ class Cache(object):
         :type contents: mixed
         """
         window = self.__get_window_instance()
-        cached_items = pickle.loads(window.getProperty('memcache'))
-        cached_items.update({cache_id: contents})
-        window.setProperty('memcache', pickle.dumps(cached_items, 0))
+        encoded = self.__encode(contents)
+        size = len(encoded)
+        budget = self.get_budget()
+        if self.lock.acquire() is False:
+            self.utils.log('[cache] {0} not cached (lock timeout)'.format(cache_id))
+            return
+        try:
+            index = [item for item in self.__load_index(window=window) if item[0] != cache_id]
+            if size > budget:
+                window.clearProperty(self.__get_property(cache_id))
+                self.__save_index(window=window, index=index)
+                self.utils.log('[cache] {0} not cached ({1} KiB exceed the budget)'.format(cache_id, size // 1024))
+                return
+            while len(index) > 0 and sum([item[1] for item in index]) + size > budget:
+                evicted_id, evicted_size = index.pop(0)
+                window.clearProperty(self.__get_property(evicted_id))
+                self.utils.log('[cache] {0} evicted ({1} KiB)'.format(evicted_id, evicted_size // 1024))
+            window.setProperty(self.__get_property(cache_id), encoded)
+            index.append([cache_id, size])
+            self.__save_index(window=window, index=index)
+        finally:
+            self.lock.release()
+
+
+    def get_footprint(self):
+        """
+        Returns the encoded size of all cached items
+
+        :returns:  int -- Size in bytes
+        """
+        window = self.__get_window_instance()
+        return sum([size for _, size in self.__load_index(window=window)])
+
+
+    def get_budget(self):
+        """
+        Returns the memory budget of the cache, either the configured one
+        or the default of the device class (by total RAM)
+
+        :returns:  int -- Budget in bytes
+        """
+        if self.budget is not None:
+            return self.budget
+        budget = self.settings.get_cache_budget()
+        if budget is not None:
+            self.budget = budget * 1024 * 1024
+            return self.budget
+        memory = self.__get_total_memory()
+        for max_memory, budget in self.constants.get_cache_budgets():
+            if max_memory is None or memory <= max_memory:
+                self.budget = budget
+                break
+        self.utils.log('[cache] Budget {0} KiB ({1} MB RAM)'.format(self.budget // 1024, memory))
+        return self.budget
+
+
+    def __load_index(self, window):
+        """
+        Loads the index of cached items
+
+        :param window: Window instance
+        :type window: xbmcgui.Window
+        :returns:  list -- Ids & sizes of cached items (least recently used first)
+        """
+        try:
+            index = self.__decode(window.getProperty(self.__get_property(None)))
+        except (EOFError, TypeError, ValueError, binascii.Error, pickle.UnpicklingError):
+            return []
+        # drop the index of the former single property layout
+        if not isinstance(index, list):
+            return []
+        return index
+
+
+    def __save_index(self, window, index):
+        """
+        Stores the index of cached items
+
+        :param window: Window instance
+        :type window: xbmcgui.Window
+        :param index: Ids & sizes of cached items (least recently used first)
+        :type index: list
+        """
+        window.setProperty(self.__get_property(None), self.__encode(index))
+
+
+    @classmethod
+    def __encode(cls, value):
+        """
+        Encodes a value as a window property (pickled, base64 text)
+
+        :param value: Value to be encoded
+        :type value: mixed
+        :returns:  string -- Encoded value
+        """
+        return base64.b64encode(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)).decode('ascii')
+
+
+    @classmethod
+    def __decode(cls, encoded):
+        """
+        Decodes a window property, see `__encode`
+
+        :param encoded: Encoded value
+        :type encoded: string
+        :returns:  mixed -- Decoded value
+        :raises: EOFError, TypeError, ValueError, pickle.UnpicklingError
+        """
+        return pickle.loads(base64.b64decode(encoded))
+
+
+    def __get_property(self, cache_id):
+        """
+        Returns the window property of a cached item (or the index),
+        prefixed with the addon id as the window is shared with others
+
+        :param cache_id: ID of the cached item (None for the index)
+        :type cache_id: str.
+        :returns:  string -- Property name
+        """
+        if cache_id is None:
+            return '{0}.memcache'.format(self.constants.get_addon_id())
+        return '{0}.memcache.{1}'.format(self.constants.get_addon_id(), cache_id)
 
 
     @classmethod
-    def __get_window_instance(cls):
+    def __get_total_memory(cls):
+        """
+        Returns the total RAM of the device (the free RAM if Kodi can´t tell)
+
+        :returns:  int -- RAM in MB
+        """
+        match = re.search(r'\d+', xbmc.getInfoLabel('System.Memory(total)') or '')
+        if match is not None:
+            return int(match.group(0))
+        return xbmc.getFreeMem()
+
+
+    def __get_window_instance(self):
         """
-        Returns the current window instance from KODI
+        Returns the window instance from KODI the cache is stored in,
+        always the home window, so all entry points (e.g. widgets &
+        the video window) share one cache
 
         :returns: xmbcguiWindow -- Window instance
         """
-        return xbmcgui.Window(xbmcgui.getCurrentWindowId())
\ No newline at end of file
+        return xbmcgui.Window(self.constants.get_cache_window_id())
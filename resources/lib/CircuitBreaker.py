@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+# Module: CircuitBreaker
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""Per endpoint class circuit breaker, the state is shared between plugin processes"""
+
+from __future__ import unicode_literals
+from os import fdopen, path, remove, rename
+from requests.exceptions import RequestException
+import re
+import tempfile
+import time
+from resources.lib.Codec import Codec
+from resources.lib.FileLock import FileLock
+
+try:
+    from os import replace
+except ImportError:
+    replace = rename
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+
+class CircuitOpenError(RequestException):
+    """Raised instead of sending a request while its circuit is open"""
+
+
+class CircuitBreaker(object):
+    """Per endpoint class circuit breaker, the state is shared between plugin processes"""
+
+
+    def __init__(self, constants, utils):
+        """
+        Injects instances & sets the state file
+
+        :param constants: Constants instance
+        :type constants: resources.lib.Constants
+        :param utils: Utils instance
+        :type utils: resources.lib.Utils
+        """
+        self.constants = constants
+        self.utils = utils
+        self.circuit_file = self.utils.get_addon_data().get('circuit_path')
+        # guards load/modify/save of the states, shared by all processes
+        self.lock = FileLock(
+            lock_file=self.utils.get_addon_data().get('circuit_lock_path'),
+            timeout=self.constants.get_cache_lock_timeout(),
+            stale=self.constants.get_cache_lock_stale())
+
+
+    def allow(self, url):
+        """
+        Checks if a request may be sent. Open circuits reject requests
+        until the open time is over, then a single probe is let through
+        (half-open) while all others keep failing fast. Only the probe
+        needs the lock, the state file is replaced atomically
+
+        :param url: Request url
+        :type url: string
+        :returns:  bool -- Request may be sent
+        """
+        endpoint = self.classify(url=url)
+        probe = self.__may_probe(state=self.__load().get(endpoint))
+        if probe is not True:
+            return probe is None
+        if self.lock.acquire() is False:
+            # the probe is left to the process holding the lock
+            return False
+        try:
+            states = self.__load()
+            state = states.get(endpoint)
+            probe = self.__may_probe(state=state)
+            if probe is not True:
+                return probe is None
+            state['probe'] = time.time()
+            self.__save(states)
+        finally:
+            self.lock.release()
+        self.utils.log('[circuit] {0} half-open, probing'.format(endpoint))
+        return True
+
+
+    def is_open(self, url):
+        """
+        Checks if requests to the endpoint of a url fail fast (without
+        probing). Once the open time is over the circuit counts as closed
+        here, so the next request reaches `allow` & may probe
+
+        :param url: Request url
+        :type url: string
+        :returns:  bool -- Circuit open (or half-open & probed by another request)
+        """
+        return self.__may_probe(state=self.__load().get(self.classify(url=url))) is False
+
+
+    def record_success(self, url):
+        """
+        Closes the circuit of a url
+
+        :param url: Request url
+        :type url: string
+        """
+        endpoint = self.classify(url=url)
+        # closed circuits (the common case) don´t need the lock
+        if endpoint not in self.__load():
+            return
+        if self.lock.acquire() is False:
+            self.utils.log('[circuit] {0} not closed (lock timeout)'.format(endpoint))
+            return
+        try:
+            states = self.__load()
+            if endpoint not in states:
+                return
+            del states[endpoint]
+            self.__save(states)
+        finally:
+            self.lock.release()
+        self.utils.log('[circuit] {0} closed'.format(endpoint))
+
+
+    def record_failure(self, url):
+        """
+        Counts a failure, opens the circuit after the threshold of
+        consecutive failures is reached (or if the probe failed)
+
+        :param url: Request url
+        :type url: string
+        """
+        endpoint = self.classify(url=url)
+        if self.lock.acquire() is False:
+            self.utils.log('[circuit] {0} failure not counted (lock timeout)'.format(endpoint))
+            return
+        try:
+            states = self.__load()
+            state = states.setdefault(endpoint, {'failures': 0, 'opened': None, 'probe': None})
+            state['failures'] = state.get('failures', 0) + 1
+            opening = state.get('opened') is not None or state.get('failures') >= self.constants.get_circuit_threshold()
+            if opening is True:
+                state['opened'] = time.time()
+                state['probe'] = None
+            self.__save(states)
+        finally:
+            self.lock.release()
+        if opening is True:
+            self.utils.log('[circuit] {0} open after {1} failures'.format(endpoint, state.get('failures')))
+
+
+    def classify(self, url):
+        """
+        Returns the endpoint class of a url (the host for unknown endpoints)
+
+        :param url: Request url
+        :type url: string
+        :returns:  string -- Endpoint class
+        """
+        parsed = urlparse(url)
+        # api urls are built with duplicate slashes (`/api/v2//page/...`)
+        url_path = re.sub('/+', '/', parsed.path)
+        for marker, endpoint in self.constants.get_endpoint_classes():
+            if marker in url_path:
+                return endpoint
+        return parsed.netloc
+
+
+    def __may_probe(self, state):
+        """
+        Checks if a request may probe an endpoint
+
+        :param state: Circuit state of the endpoint
+        :type state: dict
+        :returns:  bool -- May probe (False while open or probed, None if closed)
+        """
+        if state is None or state.get('opened') is None:
+            return None
+        now = time.time()
+        if now - state.get('opened') < self.constants.get_circuit_open_time():
+            return False
+        # another request is probing the endpoint
+        return now - (state.get('probe') or 0) >= sum(self.constants.get_request_timeout())
+
+
+    def __load(self):
+        """
+        Loads the circuit states
+
+        :returns:  dict -- States by endpoint class
+        """
+        if not path.isfile(self.circuit_file):
+            return {}
+        try:
+            with open(self.circuit_file, 'rb') as handle:
+                return Codec.loads(handle.read())
+        except (IOError, OSError, ValueError):
+            return {}
+
+
+    def __save(self, states):
+        """
+        Stores the circuit states, the file is replaced atomically
+
+        :param states: States by endpoint class
+        :type states: dict
+        """
+        if len(states) == 0:
+            if path.isfile(self.circuit_file):
+                remove(self.circuit_file)
+            return
+        temp_handle, temp_pathname = tempfile.mkstemp(
+            suffix='.tmp',
+            dir=path.dirname(self.circuit_file))
+        with fdopen(temp_handle, 'w') as handle:
+            handle.write(Codec.dumps(states))
+        replace(temp_pathname, self.circuit_file)
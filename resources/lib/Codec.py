@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Module: Codec
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""JSON codec, uses an accelerated decoder if the Kodi environment provides one"""
+
+from __future__ import unicode_literals
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# available backends (name, decode, encode), preferred first
+BACKENDS = [
+    backend for backend in (
+        ('orjson', orjson and orjson.loads, orjson and (lambda value: orjson.dumps(value).decode('utf-8'))),
+        ('ujson', ujson and ujson.loads, ujson and (lambda value: ujson.dumps(value, escape_forward_slashes=False))),
+        ('json', json.loads, json.dumps))
+    if backend[1] is not None]
+
+# backend in use, see `Codec.set_backend`
+BACKEND = BACKENDS[0]
+
+
+class Codec(object):
+    """JSON codec, uses an accelerated decoder if the Kodi environment provides one"""
+
+
+    @classmethod
+    def loads(cls, data):
+        """
+        Decodes a JSON document
+
+        :param data: JSON document (raw response bodies can be passed as they are)
+        :type data: bytes|string
+        :returns:  mixed -- Decoded document
+        :raises: ValueError
+        """
+        return BACKEND[1](data)
+
+
+    @classmethod
+    def dumps(cls, value):
+        """
+        Encodes a value as JSON
+
+        :param value: Value to be encoded
+        :type value: mixed
+        :returns:  string -- JSON document
+        """
+        return BACKEND[2](value)
+
+
+    @classmethod
+    def get_backend(cls):
+        """
+        Returns the name of the backend in use
+
+        :returns:  string -- Backend name (`orjson`, `ujson` or `json`)
+        """
+        return BACKEND[0]
+
+
+    @classmethod
+    def get_backends(cls):
+        """
+        Returns the names of the available backends, preferred first
+
+        :returns:  list -- Backend names
+        """
+        return [backend[0] for backend in BACKENDS]
+
+
+    @classmethod
+    def set_backend(cls, name):
+        """
+        Switches the backend, e.g. to compare it with the stdlib one
+
+        :param name: Backend name (`orjson`, `ujson` or `json`)
+        :type name: string
+        :raises: ValueError
+        """
+        global BACKEND
+        matches = [backend for backend in BACKENDS if backend[0] == name]
+        if len(matches) == 0:
+            raise ValueError('JSON backend {0} not available'.format(name))
+        BACKEND = matches[0]
@@ -6,14 +6,20 @@
 
 """Static links & list of sports"""
 
+import os
+
 # KODI addon id
 ADDON_ID = 'plugin.video.magenta-sport'
 
 # urls for login & data retrival
+# (point `MAGENTASPORT_BASE_URL` & optionally `MAGENTASPORT_LOGIN_ENDPOINT`
+# to a stand-in server, e.g. `benchmarks/server.py`, to run without the real API)
 PRL = 'https://'
-BASE_URL = '{0}www.magentasport.de'.format(PRL)
+BASE_URL = os.environ.get('MAGENTASPORT_BASE_URL', '{0}www.magentasport.de'.format(PRL)).rstrip('/')
 LOGIN_LINK = '{0}/service/auth/web/login?headto={0}'.format(BASE_URL)
-LOGIN_ENDPOINT = '{0}accounts.login.idm.telekom.com/factorx'.format(PRL)
+LOGIN_ENDPOINT = os.environ.get(
+    'MAGENTASPORT_LOGIN_ENDPOINT',
+    '{0}accounts.login.idm.telekom.com/factorx'.format(PRL) if 'MAGENTASPORT_BASE_URL' not in os.environ else '{0}/factorx'.format(BASE_URL))
 API_URL = '{0}/api/v2/'.format(BASE_URL)
 NAVIGATION_URL = '{0}navigation'.format(API_URL)
 STREAM_ROUTE = '/service/player/streamAccess'
@@ -64,14 +70,11 @@ SPORTS_ADDITIONAL_INFOS = {
     }
 }
 
-# static menu items for various lists
+# static menu items for various lists (keyed by sport id)
 STATICS = {
-    'liga3': {
+    'default': {
         'categories': [
             {
-                'name': 'Alle Spieltage',
-                'id': 'spieltage',
-            }, {
                 'name': 'Suche nach Datum',
                 'id': 'bydate',
             }
@@ -79,11 +82,160 @@ STATICS = {
     }
 }
 
+# max. age of an indexed EPG before it gets refreshed (in sec)
+EPG_TTL = 900
+
+# connect & read timeouts of API requests (in sec)
+REQUEST_TIMEOUT = (3.05, 10)
+
+# id of the Kodi window the in-memory cache is stored in (home window,
+# it exists as long as Kodi runs & is shared by all entry points)
+CACHE_WINDOW_ID = 10000
+
+# max. time to wait for the lock of the in-memory cache & age of a lock
+# left by a crashed plugin process (in sec)
+CACHE_LOCK_TIMEOUT = 1
+CACHE_LOCK_STALE = 10
+
+# memory budget of the in-memory (window property) cache by device class:
+# max. total RAM of the class (in MB, None for all others) & budget (in bytes)
+CACHE_BUDGETS = (
+    (1024, 4 * 1024 * 1024),
+    (2048, 12 * 1024 * 1024),
+    (None, 32 * 1024 * 1024),
+)
+
+# circuit breaker: consecutive failures opening the circuit of an
+# endpoint class & time requests fail fast before a probe (in sec)
+CIRCUIT_THRESHOLD = 3
+CIRCUIT_OPEN_TIME = 60
+
+# url markers & the endpoint classes they belong to (first match wins,
+# other urls are classified by their host)
+ENDPOINT_CLASSES = (
+    ('/service/player/streamAccess', 'stream'),
+    ('/service/auth/', 'login'),
+    ('/factorx', 'login'),
+    ('/api/v2/navigation', 'navigation'),
+    ('/api/v2/page/', 'page'),
+    ('/api/v2/lane/', 'lane'),
+    ('/api/v2/videolane/', 'lane'),
+    ('/api/v2/event/', 'event'),
+)
+
+# max. age of the events kept in the search index (in sec, measured
+# from their start)
+SEARCH_MAX_AGE = 90 * 24 * 3600
+
+# time the rendered listing of a route is replayed without
+# fetching or building anything (in sec, routes not listed aren´t stored)
+SNAPSHOT_TTLS = {
+    'sport_selection': 900,
+    'categories': 900,
+    'date_list': 300,
+    'matches_list': 300,
+    'match_details': 300,
+    'event_lane': 60,
+    'live_now': 60,
+    'search': 300,
+}
+
+# adaptive TTLs of documents listing scheduled events (lanes & matches, in sec):
+# while an event is running, max. TTL before (& at the latest until) the next
+# event starts, after an event ended recently (re-lives & highlights get added)
+# & for archives of finished events only
+ADAPTIVE_TTLS = {
+    'live': 60,
+    'upcoming': 3600,
+    'ended': 900,
+    'archive': 6 * 3600,
+}
+
+# events ended within this time count as recently ended & assumed
+# duration of events without a scheduled end (in sec)
+RECENTLY_ENDED = 3 * 3600
+EVENT_DURATION = 3 * 3600
+
+# max. number of items listed per lane page & query
+# parameter selecting the page of a lane paged by the API
+LANE_PAGE_SIZE = 50
+LANE_PAGE_PARAM = 'page'
+
+# prefetch of the folders just listed: max. number of concurrent
+# requests, max. documents & bytes transferred per listing, TTL of
+# the prefetched documents (in sec) & max. time a prefetch request
+# waits for its turn before it is dropped (in sec)
+PREFETCH_WORKERS = 3
+PREFETCH_MAX_DOCUMENTS = 24
+PREFETCH_BUDGET = 2 * 1024 * 1024
+PREFETCH_TTL = 120
+PREFETCH_MAX_DEFER = 1
+
+# request scheduler: max. concurrent requests per host (all priorities),
+# rate (requests per sec) & burst of background requests (shared by all
+# plugin processes & the service), max. time a background request waits
+# for its turn (in sec), max. time a process is marked as running
+# interactive requests (in sec, markers of crashed processes expire) &
+# idle time after which the marker of a process is removed (in sec)
+SCHEDULER_HOST_CONCURRENCY = 6
+SCHEDULER_BACKGROUND_RATE = 4
+SCHEDULER_BACKGROUND_BURST = 12
+SCHEDULER_MAX_DEFER = 15
+SCHEDULER_MARKER_STALE = 60
+SCHEDULER_MARKER_EXPIRY = 24 * 3600
+
+# max. number of item views kept for reuse (by long running interpreters)
+VIEW_MEMO_SIZE = 1000
+
+# max. number of concurrent API requests of the plugin
+MAX_WORKERS = 6
+
+# lanes with this marker in their url or title list live & upcoming events
+LIVE_LANE_MARKER = 'live'
+
+# warm-up service: default refresh interval of favourite sports (in min),
+# refresh interval of lanes with live or soon starting events (in sec),
+# events starting within this time count as soon starting (in sec)
+# & max. number of concurrent requests
+WARMUP_INTERVAL = 10
+WARMUP_LIVE_INTERVAL = 60
+WARMUP_SOON = 3600
+WARMUP_WORKERS = 3
+
+# stored API documents & snapshots: max. age (in sec, stale documents are
+# served while offline), max. total size (in bytes) & time between the
+# prunings of the warm-up service (in sec)
+STORAGE_MAX_AGE = 30 * 24 * 3600
+STORAGE_MAX_SIZE = 64 * 1024 * 1024
+STORAGE_PRUNE_INTERVAL = 3600
+
+# max. number of cProfile dumps of traced calls kept (the oldest are removed)
+PROFILE_MAX_DUMPS = 10
+
 
 class Constants(object):
     """Access methods for static links & list of sports"""
 
 
+    @classmethod
+    def set_base_url(cls, base_url, login_endpoint=None):
+        """
+        Points all links to another host, e.g. a local API stand-in
+
+        :param base_url: Base HTTP address (e.g. `http://127.0.0.1:8080`)
+        :type base_url: string
+        :param login_endpoint: SSO login endpoint (defaults to `<base_url>/factorx`)
+        :type login_endpoint: string
+        """
+        global BASE_URL, LOGIN_LINK, LOGIN_ENDPOINT, API_URL, NAVIGATION_URL, STREAM_DEFINITON_URL
+        BASE_URL = base_url.rstrip('/')
+        LOGIN_LINK = '{0}/service/auth/web/login?headto={0}'.format(BASE_URL)
+        LOGIN_ENDPOINT = login_endpoint or '{0}/factorx'.format(BASE_URL)
+        API_URL = '{0}/api/v2/'.format(BASE_URL)
+        NAVIGATION_URL = '{0}navigation'.format(API_URL)
+        STREAM_DEFINITON_URL = '{0}{1}?{2}'.format(BASE_URL, STREAM_ROUTE, STREAM_PARAMS)
+
+
     @classmethod
     def get_base_url(cls):
         """
@@ -94,6 +246,17 @@ class Constants(object):
         return BASE_URL
 
 
+    @classmethod
+    def get_protocol(cls):
+        """
+        Returns the protocol of the base address (e.g. `https:`),
+        used for protocol relative links
+
+        :returns:  string -- Protocol
+        """
+        return '{0}:'.format(BASE_URL.split(':', 1)[0])
+
+
     @classmethod
     def get_login_link(cls):
         """
@@ -168,6 +331,371 @@ class Constants(object):
         return STATICS
 
 
+    @classmethod
+    def get_epg_ttl(cls):
+        """
+        Returns the max. age of an indexed EPG
+
+        :returns:  int -- EPG TTL in seconds
+        """
+        return EPG_TTL
+
+
+    @classmethod
+    def get_request_timeout(cls):
+        """
+        Returns the connect & read timeouts of API requests
+
+        :returns:  tuple -- Connect & read timeout in seconds
+        """
+        return REQUEST_TIMEOUT
+
+
+    @classmethod
+    def get_cache_window_id(cls):
+        """
+        Returns the id of the Kodi window the in-memory cache is stored in
+
+        :returns:  int -- Window id
+        """
+        return CACHE_WINDOW_ID
+
+
+    @classmethod
+    def get_cache_lock_timeout(cls):
+        """
+        Returns the max. time to wait for the lock of the in-memory cache
+
+        :returns:  int -- Time in seconds
+        """
+        return CACHE_LOCK_TIMEOUT
+
+
+    @classmethod
+    def get_cache_lock_stale(cls):
+        """
+        Returns the age of a cache lock left by a crashed plugin process
+
+        :returns:  int -- Age in seconds
+        """
+        return CACHE_LOCK_STALE
+
+
+    @classmethod
+    def get_cache_budgets(cls):
+        """
+        Returns the memory budgets of the in-memory cache by device class
+
+        :returns:  tuple -- Max. total RAM (in MB) & budget (in bytes) pairs
+        """
+        return CACHE_BUDGETS
+
+
+    @classmethod
+    def get_circuit_threshold(cls):
+        """
+        Returns the number of consecutive failures opening a circuit
+
+        :returns:  int -- Number of failures
+        """
+        return CIRCUIT_THRESHOLD
+
+
+    @classmethod
+    def get_circuit_open_time(cls):
+        """
+        Returns the time requests fail fast before a circuit is probed
+
+        :returns:  int -- Time in seconds
+        """
+        return CIRCUIT_OPEN_TIME
+
+
+    @classmethod
+    def get_endpoint_classes(cls):
+        """
+        Returns the url markers & the endpoint classes they belong to
+
+        :returns:  tuple -- Marker & endpoint class pairs
+        """
+        return ENDPOINT_CLASSES
+
+
+    @classmethod
+    def get_search_max_age(cls):
+        """
+        Returns the max. age of the events kept in the search index
+
+        :returns:  int -- Time in seconds (measured from the event start)
+        """
+        return SEARCH_MAX_AGE
+
+
+    @classmethod
+    def get_snapshot_ttl(cls, route):
+        """
+        Returns the time the rendered listing of a route is replayed
+
+        :param route: Route name
+        :type route: string
+        :returns:  int -- Snapshot TTL in seconds (0 if not stored)
+        """
+        return SNAPSHOT_TTLS.get(route, 0)
+
+
+    @classmethod
+    def get_adaptive_ttl(cls, state):
+        """
+        Returns the TTL of documents by the state of their events
+
+        :param state: Event state (`live`, `upcoming`, `ended` or `archive`)
+        :type state: string
+        :returns:  int -- TTL in seconds
+        """
+        return ADAPTIVE_TTLS.get(state)
+
+
+    @classmethod
+    def get_recently_ended(cls):
+        """
+        Returns the time events count as recently ended
+
+        :returns:  int -- Time in seconds
+        """
+        return RECENTLY_ENDED
+
+
+    @classmethod
+    def get_event_duration(cls):
+        """
+        Returns the assumed duration of events without a scheduled end
+
+        :returns:  int -- Duration in seconds
+        """
+        return EVENT_DURATION
+
+
+    @classmethod
+    def get_view_memo_size(cls):
+        """
+        Returns the max. number of item views kept for reuse
+
+        :returns:  int -- Number of views
+        """
+        return VIEW_MEMO_SIZE
+
+
+    @classmethod
+    def get_lane_page_size(cls):
+        """
+        Returns the max. number of items listed per lane page
+
+        :returns:  int -- Number of items
+        """
+        return LANE_PAGE_SIZE
+
+
+    @classmethod
+    def get_lane_page_param(cls):
+        """
+        Returns the query parameter selecting the page of a lane
+
+        :returns:  string -- Parameter name
+        """
+        return LANE_PAGE_PARAM
+
+
+    @classmethod
+    def get_prefetch_workers(cls):
+        """
+        Returns the max. number of concurrent prefetch requests
+
+        :returns:  int -- Number of workers
+        """
+        return PREFETCH_WORKERS
+
+
+    @classmethod
+    def get_prefetch_max_documents(cls):
+        """
+        Returns the max. number of documents prefetched per listing
+
+        :returns:  int -- Number of documents
+        """
+        return PREFETCH_MAX_DOCUMENTS
+
+
+    @classmethod
+    def get_prefetch_budget(cls):
+        """
+        Returns the max. number of bytes prefetched per listing
+
+        :returns:  int -- Budget in bytes
+        """
+        return PREFETCH_BUDGET
+
+
+    @classmethod
+    def get_prefetch_ttl(cls):
+        """
+        Returns the time prefetched documents are used without revalidation
+
+        :returns:  int -- TTL in seconds
+        """
+        return PREFETCH_TTL
+
+
+    @classmethod
+    def get_prefetch_max_defer(cls):
+        """
+        Returns the max. time a prefetch request waits for its turn
+
+        :returns:  int -- Time in seconds
+        """
+        return PREFETCH_MAX_DEFER
+
+
+    @classmethod
+    def get_scheduler_host_concurrency(cls):
+        """
+        Returns the max. number of concurrent requests per host
+
+        :returns:  int -- Number of requests
+        """
+        return SCHEDULER_HOST_CONCURRENCY
+
+
+    @classmethod
+    def get_scheduler_background_rate(cls):
+        """
+        Returns the rate & burst of background requests (token bucket)
+
+        :returns:  tuple -- Requests per second & max. burst
+        """
+        return (SCHEDULER_BACKGROUND_RATE, SCHEDULER_BACKGROUND_BURST)
+
+
+    @classmethod
+    def get_scheduler_max_defer(cls):
+        """
+        Returns the max. time a background request waits for its turn
+
+        :returns:  int -- Time in seconds
+        """
+        return SCHEDULER_MAX_DEFER
+
+
+    @classmethod
+    def get_scheduler_marker_stale(cls):
+        """
+        Returns the max. time a process is marked as running interactive
+        requests (the marker of a crashed process expires after it)
+
+        :returns:  int -- Time in seconds
+        """
+        return SCHEDULER_MARKER_STALE
+
+
+    @classmethod
+    def get_scheduler_marker_expiry(cls):
+        """
+        Returns the idle time after which the marker of a process is removed
+
+        :returns:  int -- Time in seconds
+        """
+        return SCHEDULER_MARKER_EXPIRY
+
+
+    @classmethod
+    def get_max_workers(cls):
+        """
+        Returns the max. number of concurrent API requests
+
+        :returns:  int -- Number of workers
+        """
+        return MAX_WORKERS
+
+
+    @classmethod
+    def get_live_lane_marker(cls):
+        """
+        Returns the marker of lanes listing live & upcoming events
+
+        :returns:  string -- Marker
+        """
+        return LIVE_LANE_MARKER
+
+
+    @classmethod
+    def get_warmup_interval(cls):
+        """
+        Returns the default refresh interval of favourite sports
+
+        :returns:  int -- Interval in minutes
+        """
+        return WARMUP_INTERVAL
+
+
+    @classmethod
+    def get_warmup_live_interval(cls):
+        """
+        Returns the refresh interval of lanes with live or soon starting events
+
+        :returns:  int -- Interval in seconds
+        """
+        return WARMUP_LIVE_INTERVAL
+
+
+    @classmethod
+    def get_warmup_soon(cls):
+        """
+        Returns the time before their start events count as soon starting
+
+        :returns:  int -- Time in seconds
+        """
+        return WARMUP_SOON
+
+
+    @classmethod
+    def get_storage_limits(cls):
+        """
+        Returns the max. age & the max. total size of the stored entries
+
+        :returns:  tuple -- Age in seconds & size in bytes
+        """
+        return (STORAGE_MAX_AGE, STORAGE_MAX_SIZE)
+
+
+    @classmethod
+    def get_storage_prune_interval(cls):
+        """
+        Returns the time between the prunings of the stored entries
+
+        :returns:  int -- Time in seconds
+        """
+        return STORAGE_PRUNE_INTERVAL
+
+
+    @classmethod
+    def get_profile_max_dumps(cls):
+        """
+        Returns the max. number of cProfile dumps kept
+
+        :returns:  int -- Number of dumps
+        """
+        return PROFILE_MAX_DUMPS
+
+
+    @classmethod
+    def get_warmup_workers(cls):
+        """
+        Returns the max. number of concurrent warm-up requests
+
+        :returns:  int -- Number of workers
+        """
+        return WARMUP_WORKERS
+
+
     @classmethod
     def get_addon_id(cls):
         """
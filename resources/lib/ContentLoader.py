@@ -9,121 +9,360 @@
 from __future__ import unicode_literals
 from kodi_six.utils import py2_decode
 import re
-import json
+import time
 import xml.etree.ElementTree as ET
-from datetime import date
+from datetime import date, datetime
+from requests.exceptions import HTTPError, RequestException
 import xbmcgui
 import xbmcplugin
+from resources.lib.Codec import Codec
+from resources.lib.Epg import Epg
+from resources.lib.Normalizer import Normalizer
+from resources.lib.Scheduler import BACKGROUND, INTERACTIVE, DeferredError
 
 
 class ContentLoader(object):
     """Fetches and parses content from the Magenta Sport API & website"""
 
 
-    def __init__(self, cache, session, item_helper, handle):
+    def __init__(self, cache, storage, session, scheduler, item_helper, search, tracer, dialogs, directory, handle):
         """
         Injects instances & the plugin handle
 
         :param cache: Cache instance
         :type cache: resources.lib.Cache
+        :param storage: Storage instance
+        :type storage: resources.lib.Storage
         :param session: Session instance
         :type session: resources.lib.Session
+        :param scheduler: Scheduler instance
+        :type scheduler: resources.lib.Scheduler
         :param item_helper: ItemHelper instance
         :type item_helper: resources.lib.ItemHelper
+        :param search: Search instance
+        :type search: resources.lib.Search
+        :param tracer: Tracer instance
+        :type tracer: resources.lib.Tracer
+        :param dialogs: Dialogs instance
+        :type dialogs: resources.lib.Dialogs
+        :param directory: Directory instance
+        :type directory: resources.lib.Directory
         :param handle: Kodis plugin handle
         :type handle: int
         """
         self.constants = session.constants
         self.utils = session.utils
         self.cache = cache
+        self.storage = storage
         self.session = session
+        self.scheduler = scheduler
         self.item_helper = item_helper
+        self.search = search
+        self.tracer = tracer
+        self.dialogs = dialogs
+        self.directory = directory
+        self.prefetch_urls = []
+        self.offline_notified = False
         self.plugin_handle = handle
         addon = self.utils.get_addon()
 
 
+    def start_invocation(self, handle):
+        """
+        Sets the plugin handle of a plugin call & resets the state
+        of the previous one (folders to prefetch, offline notice)
+
+        :param handle: Kodis plugin handle
+        :type handle: int
+        """
+        self.plugin_handle = handle
+        self.prefetch_urls = []
+        self.offline_notified = False
+
+
     def get_epg(self, sport):
         """
-        Loads EPG either from cache or starts fetching it
+        Loads EPG either from cache or starts fetching it,
+        outdated cached EPGs get refreshed incrementally
 
-        :param sport: Cache instance
-        :type sport: resources.lib.Cache
-        :returns:  dict - Parsed EPG
+        :param sport: Chosen sport
+        :type sport: dict
+        :returns:  resources.lib.Epg -- Indexed EPG
         """
-        _session = self.session.get_session()
         # check for cached epg data
-        cached_epg = self.cache.get_cached_item('epg{0}'.format(sport))
-        if cached_epg is not None:
+        cached_epg = self.cache.get_cached_item('epg{0}'.format(sport.get('id')))
+        if cached_epg is not None and time.time() - cached_epg.updated < self.constants.get_epg_ttl():
             return cached_epg
-        return self.load_epg(sport=sport, _session=_session)
+        return self.load_epg(sport=sport, epg=cached_epg)
 
 
-    def load_epg(self, sport, _session):
+    def load_epg(self, sport, epg=None):
         """
-        Fetches EPG & appends it to the cache
+        Fetches EPG pages, replaces the indexed events with them & appends
+        the index to the cache (fetched pages are added to the search
+        index, see `fetch_json`)
 
         :param sport: Chosen sport
-        :type sport: string
-        :param _session: Requests session instance
-        :type _session: requests.session
-        :returns:  dict - EPG
+        :type sport: dict
+        :param epg: Already indexed EPG to be updated
+        :type epg: resources.lib.Epg
+        :returns:  resources.lib.Epg -- Indexed EPG
         """
-        epg = self.fetch_epg(sport=sport, _session=_session)
-        if epg.get('status') == 'success':
-            page_tree = self.parse_epg(epg=epg)
-            self.cache.add_cached_item('epg{0}'.format(sport), page_tree)
-        return page_tree
+        if epg is None:
+            epg = Epg()
+        lanes = {}
+        for lane, page in self.fetch_epg(sport=sport):
+            lanes.setdefault(lane, []).extend(page)
+        # keep the known events if the sport page isn´t available at all
+        if len(lanes) > 0:
+            epg.replace(lanes=lanes, item_helper=self.item_helper, sport=sport)
+        self.cache.add_cached_item('epg{0}'.format(sport.get('id')), epg)
+        return epg
 
 
-    def parse_epg(self, epg):
+    def fetch_epg(self, sport):
         """
-        Parses the raw EPG
+        Fetches the sport page & yields the contents of its event lanes,
+        one EPG page (lane url & items) per lane & API page
 
-        :param epg: Raw epg
-        :type epg: dict
-        :returns:  dict - Parsed EPG
+        :param sport: Chosen sport
+        :type sport: dict
+        :returns:  generator - Raw EPG pages (tuple of lane & list of API items)
         """
-        page_tree = {}
-        data = epg.get('data', {})
-        elements = data.get('elements') or data.get('data')
-        use_slots = self.__use_slots(data=data)
-        # iterate over every match in the epg
-        for element in elements:
-            # get details & metadata for the current event
-            metadata = element.get('metadata', {})
-            details = metadata.get('details', {})
-            # get matchtime
-            match_date, match_time, match_weekday = self.item_helper.datetime_from_utc(
-                metadata=metadata,
-                element=element)
-            # check if we have already matches scheduled for that date
-            if page_tree.get(match_date) is None:
-                page_tree[match_date] = []
+        api_url = self.constants.get_api_url()
+        url = '{0}{1}'.format(api_url, sport.get('target'))
+        for lane in self.get_lanes(self.fetch_json(url)):
+            data_url = lane.get('group_elements')[0].get('data_url')
+            page, pages = 1, 1
+            while page <= pages:
+                data = self.fetch_json(
+                    self.get_lane_url(lane=data_url, page=page),
+                    index={'sport': sport, 'lane': data_url}).get('data') or {}
+                pages = self.get_lane_page_count(data=data)
+                page += 1
+                yield (data_url, data.get('data') or [])
+
+
+    def fetch_json(self, url, index=None):
+        """
+        Fetches & decodes an API document. Stored documents that are still
+        fresh (e.g. refreshed by the warm-up service) are used directly,
+        others get revalidated. If the API is unreachable the stored (stale)
+        document is returned instead. While the circuit of the endpoint is
+        open, the network isn´t tried at all for stored documents (once the
+        open time is over, the request probes the endpoint)
+
+        :param url: API url
+        :type url: string
+        :param index: Search context of lane & match documents (see `__index_document`)
+        :type index: dict
+        :returns:  dict - Decoded document (empty if unreachable & not stored)
+        """
+        stored = self.storage.get(url)
+        if stored is not None:
+            if self.storage.is_fresh(stored):
+                return stored.get('payload')
+            if self.session.is_offline(url=url):
+                return self.__serve_stored(stored)
+        try:
+            return self.refresh_json(url=url, stored=stored, index=index)
+        except (RequestException, ValueError) as error:
+            self.utils.log('Fetching {0} failed: {1}'.format(url, error))
+            return self.__serve_stored(stored)
 
-            matches = self.__parse_epg_element(
-                use_slots=use_slots,
-                element=element,
-                details=details,
-                match_time=match_time)
 
-            for match in matches:
-                page_tree.get(match_date).append(match)
+    def refresh_json(self, url, ttl=0, stored=None, priority=INTERACTIVE, index=None):
+        """
+        Fetches & decodes an API document using a conditional request
+        (ETag/Last-Modified of the stored document) & stores the result
 
-            return page_tree
+        :param url: API url
+        :type url: string
+        :param ttl: Time the stored document can be used without revalidation (in sec)
+        :type ttl: int
+        :param stored: Stored entry of the url (looked up if not given)
+        :type stored: dict
+        :param priority: Priority class of the request (see `Scheduler`)
+        :type priority: string
+        :param index: Search context of lane & match documents (see `__index_document`)
+        :type index: dict
+        :returns:  dict - Decoded document
+        :raises: requests.exceptions.RequestException, ValueError
+        """
+        return self.__request(url=url, ttl=ttl, stored=stored, priority=priority, index=index)[0]
+
+
+    def prefetch(self):
+        """
+        Fetches the documents of the folders just listed (the next level
+        the user is likely to open). Runs after the listing has been
+        handed to Kodi, with a concurrency cap & a byte budget. It stops
+        as soon as a request doesn´t get its turn (see `Scheduler`).
+        Prefetched documents are added to the search index
+        """
+        # the first folders are the most likely to be opened
+        entries = self.prefetch_urls[:self.constants.get_prefetch_max_documents()]
+        self.prefetch_urls = []
+        if len(entries) == 0:
+            return
+        workers = self.constants.get_prefetch_workers()
+        budget = self.constants.get_prefetch_budget()
+        transferred = 0
+        with self.tracer.span('prefetch'):
+            for index in range(0, len(entries), workers):
+                sizes = self.utils.parallel_map(self.__prefetch_json, entries[index:index + workers], workers)
+                transferred += sum([size for size in sizes if size is not None])
+                if transferred >= budget or None in sizes:
+                    break
+        self.utils.log('Prefetched {0} of {1} documents ({2} bytes)'.format(
+            min(index + workers, len(entries)), len(entries), transferred))
+
+
+    def __prefetch_json(self, entry):
+        """
+        Fetches a document (if not stored & fresh) for the prefetch
+
+        :param entry: API url & its search context (see `__index_document`)
+        :type entry: tuple
+        :returns:  int - Bytes transferred (None if the request was deferred for too long)
+        """
+        url, index = entry
+        stored = self.storage.get(url)
+        if stored is not None and self.storage.is_fresh(stored):
+            return 0
+        if self.session.is_offline(url=url):
+            return 0
+        try:
+            return self.__request(
+                url=url,
+                ttl=self.constants.get_prefetch_ttl(),
+                stored=stored,
+                priority=BACKGROUND,
+                max_defer=self.constants.get_prefetch_max_defer(),
+                index=index)[1]
+        except DeferredError:
+            # the user is waiting for another request or the rate limit is hit
+            return None
+        except (RequestException, ValueError) as error:
+            self.utils.log('Prefetching {0} failed: {1}'.format(url, error))
+            return 0
 
 
-    def fetch_epg(self, sport, _session):
+    def __request(self, url, ttl, stored, priority=INTERACTIVE, max_defer=None, index=None):
         """
-        Builds the EPG URL & fetches the EPG
+        Fetches & decodes an API document using a conditional request
+        & stores the result (normalized, see `Normalizer`). Lane & match
+        documents with a search context are added to the search index
 
-        :param sport: Chosen sport
-        :type sport: string
-        :param _session: Requests session instance
-        :type _session: requests.session
-        :returns:  dict - Parsed EPG
-        """
-        _api_url = '{0}{1}'.format(self.constants.get_api_url(), self.constants.get_sports().get(sport, {}).get('epg', ''))
-        return json.loads(_session.get(_api_url).text)
+        :param url: API url
+        :type url: string
+        :param ttl: Time the stored document can be used without revalidation
+                    (in sec, documents listing scheduled events get their own)
+        :type ttl: int
+        :param stored: Stored entry of the url (looked up if not given)
+        :type stored: dict
+        :param priority: Priority class of the request (see `Scheduler`)
+        :type priority: string
+        :param max_defer: Max. time a background request waits for its turn (in sec)
+        :type max_defer: float
+        :param index: Search context of lane & match documents (see `__index_document`)
+        :type index: dict
+        :returns:  tuple - Decoded document & bytes transferred
+        :raises: requests.exceptions.RequestException, ValueError
+        """
+        if stored is None:
+            stored = self.storage.get(url) or {}
+        headers = {}
+        if stored.get('etag'):
+            headers['If-None-Match'] = stored.get('etag')
+        if stored.get('modified'):
+            headers['If-Modified-Since'] = stored.get('modified')
+        with self.scheduler.slot(url=url, priority=priority, max_defer=max_defer), self.tracer.span('network'):
+            response = self.session.get_session().get(
+                url,
+                headers=headers,
+                timeout=self.constants.get_request_timeout())
+            if response.status_code >= 500:
+                raise HTTPError('{0} Server Error'.format(response.status_code), response=response)
+        size = len(response.content)
+        if response.status_code == 304 and 'payload' in stored:
+            document = stored.get('payload')
+        else:
+            with self.tracer.span('parse'):
+                document = Normalizer.normalize(document=Codec.loads(response.content))
+        document_ttl = self.get_document_ttl(document=document)
+        self.storage.set(
+            url,
+            document,
+            ttl=document_ttl if document_ttl is not None else ttl,
+            etag=response.headers.get('ETag', stored.get('etag')),
+            modified=response.headers.get('Last-Modified', stored.get('modified')))
+        if index is not None:
+            self.__index_document(document=document, index=index)
+        return (document, size)
+
+
+    def __index_document(self, document, index):
+        """
+        Adds a fetched document to the search index (persisted by the
+        caller). The search context names the sport & lane of a lane
+        document, for match pages (& their lazily loaded video groups)
+        also the match target
+
+        :param document: Decoded lane or match document
+        :type document: dict
+        :param index: Search context (`sport`, `lane` & optionally `target`)
+        :type index: dict
+        """
+        data = document.get('data') or {}
+        if index.get('target') is None:
+            self.search.add_items(items=data.get('data') or [], sport=index.get('sport'), lane=index.get('lane'))
+            return
+        videos = [
+            video
+            for group in data.get('content') or []
+            for element in group.get('group_elements') or []
+            for video in element.get('data') or []]
+        # lazily loaded groups are shaped like lanes
+        group = data.get('data')
+        if isinstance(group, dict):
+            group = group.get('data')
+        videos.extend(group if isinstance(group, list) else [])
+        if len(videos) > 0:
+            self.search.add_match_details(
+                target=index.get('target'),
+                videos=videos,
+                sport=index.get('sport'),
+                lane=index.get('lane'))
+
+
+    def get_document_ttl(self, document, now=None):
+        """
+        Returns the time a document can be used without revalidation,
+        derived from the schedule of its events: short while an event is
+        running, until the next event starts for upcoming events & long
+        for archives of finished events
+
+        :param document: Raw lane or match document
+        :type document: dict
+        :param now: Current time (UTC timestamp)
+        :type now: float
+        :returns:  int -- TTL in sec (None if no scheduled events are listed)
+        """
+        now = now or time.time()
+        schedules = self.__get_schedules(document=document)
+        if len(schedules) == 0:
+            return None
+        ttl = self.constants.get_adaptive_ttl('archive')
+        live_ttl = self.constants.get_adaptive_ttl('live')
+        for start, end in schedules:
+            if start <= now < end:
+                return live_ttl
+            if start > now:
+                ttl = min(ttl, max(live_ttl, min(start - now, self.constants.get_adaptive_ttl('upcoming'))))
+            elif now - end < self.constants.get_recently_ended():
+                ttl = min(ttl, self.constants.get_adaptive_ttl('ended'))
+        return int(ttl)
 
 
     def get_stream_urls(self, video_id):
@@ -136,13 +375,20 @@ class ContentLoader(object):
         """
         stream_urls = {}
         _session = self.session.get_session()
-        stream_access = json.loads(_session.post(
-            self.constants.get_stream_definition_url().replace(
-                '%VIDEO_ID%',
-                str(video_id))
-            ).text)
+        url = self.constants.get_stream_definition_url().replace('%VIDEO_ID%', str(video_id))
+        try:
+            with self.scheduler.slot(url=url), self.tracer.span('network'):
+                raw_data = _session.post(
+                    url,
+                    timeout=self.constants.get_request_timeout()
+                    ).content
+            with self.tracer.span('parse'):
+                stream_access = Codec.loads(raw_data)
+        except (RequestException, ValueError) as error:
+            self.utils.log('Fetching stream access failed: {0}'.format(error))
+            return stream_urls
         if stream_access.get('status') == 'success':
-            stream_urls['Live'] = 'https:{0}'.format(stream_access.get('data', {}).get('stream-access', [None, None])[1])
+            stream_urls['Live'] = '{0}{1}'.format(self.constants.get_protocol(), stream_access.get('data', {}).get('stream-access', [None, None])[1])
         return stream_urls
 
 
@@ -157,36 +403,192 @@ class ContentLoader(object):
         """
         m3u_url = ''
         _session = self.session.get_session()
-        xml_content = _session.get(stream_url)
-        root = ET.fromstring(xml_content.text)
+        try:
+            with self.scheduler.slot(url=stream_url), self.tracer.span('network'):
+                xml_content = _session.get(
+                    stream_url,
+                    timeout=self.constants.get_request_timeout())
+            with self.tracer.span('parse'):
+                root = ET.fromstring(xml_content.text)
+        except (RequestException, ET.ParseError) as error:
+            self.utils.log('Fetching m3u description failed: {0}'.format(error))
+            return m3u_url
         for child in root:
             m3u_url = '{0}?hdnea={1}'.format(child.attrib.get('url', ''), child.attrib.get('auth', ''))
         return m3u_url
 
 
-    def show_sport_selection(self):
-        """Creates the KODI list items for the sport selection"""
+    def show_sport_selection(self, warmup_sports=None):
+        """
+        Creates the KODI list items for the sport selection
+
+        :param warmup_sports: Ids of the sports kept warm (None if the warm-up is disabled)
+        :type warmup_sports: list
+        """
         self.utils.log('Sport selection')
         _navigation_url = self.constants.get_navigation_url()
-        _session = self.session.get_session()
-        sports = json.loads(_session.get(_navigation_url).text).get('data').get('league_filter')
+        sports = self.fetch_json(_navigation_url).get('data', {}).get('league_filter', [])
 
         for sport in sports:
             url = self.utils.build_url({'for': sport})
             label = py2_decode(self.constants.get_sports_additional_infos().get(sport.get('id'), {}).get('prefix', '{0}')).format(sport.get('title'))
-            list_item = xbmcgui.ListItem(label=label)
-            list_item = self.item_helper.set_art(
-                list_item=list_item,
-                sport=sport)
-            xbmcplugin.addDirectoryItem(
-                handle=self.plugin_handle,
+            context_menu = None
+            if warmup_sports is not None:
+                context_menu = self.__build_warmup_context_menu(
+                    sport_id=str(sport.get('id')),
+                    active=str(sport.get('id')) in warmup_sports)
+            self.directory.add_item(
                 url=url,
-                listitem=list_item,
-                isFolder=True)
-            xbmcplugin.addSortMethod(
-                handle=self.plugin_handle,
-                sortMethod=xbmcplugin.SORT_METHOD_DATE)
-        xbmcplugin.endOfDirectory(self.plugin_handle)
+                label=label,
+                art=self.item_helper.build_art(sport=sport),
+                context_menu=context_menu)
+            self.directory.add_sort_method(xbmcplugin.SORT_METHOD_DATE)
+        # live & upcoming events of all sports
+        self.directory.add_item(
+            url=self.utils.build_url({'live': True}),
+            label=self.utils.get_local_string(string_id=32029))
+        # search in the local index
+        self.directory.add_item(
+            url=self.utils.build_url({'search': True}),
+            label=self.utils.get_local_string(string_id=32016))
+        self.directory.end()
+
+
+    def show_live_now(self):
+        """
+        Creates the KODI list items for the live & upcoming events of all
+        sports. The sports are fetched concurrently, events are indexed by
+        target (see `Epg`): running events (& started livestreams) first,
+        then the upcoming ones, each ordered by their scheduled start
+        """
+        self.utils.log('Live now')
+        sports = self.fetch_json(self.constants.get_navigation_url()).get('data', {}).get('league_filter', [])
+        epg = Epg()
+        lanes = {}
+        for items in self.utils.parallel_map(self.fetch_live_items, sports, self.constants.get_max_workers()):
+            for sport, lane, item in items or []:
+                if item.get('target') is not None and item.get('target') not in lanes:
+                    lanes[item.get('target')] = lane
+                    epg.merge(items=[item], item_helper=self.item_helper, sport=sport)
+        timestamp = time.time()
+        running = epg.get_now(now=timestamp)
+        running_targets = set([event.get('target') for event in running])
+        running.extend([
+            event for event in epg.get_live()
+            if event.get('start') <= timestamp and event.get('target') not in running_targets])
+        running.sort(key=lambda event: (event.get('start'), event.get('target')))
+        events = running + epg.get_next(now=timestamp, count=len(epg))
+        now = datetime.now()
+        with self.tracer.span('render'):
+            for event in events:
+                sport, lane = event.get('sport'), lanes.get(event.get('target'))
+                view = self.item_helper.update_view(view=event.get('view'), now=now)
+                url = self.utils.build_url(
+                    {'for': sport, 'lane': lane, 'target': view.target})
+                self.directory.add_item(
+                    url=url,
+                    label=view.title,
+                    art=view.art,
+                    info={'plot': '{0}\n\n{1}'.format(sport.get('title', ''), view.description)})
+        self.directory.end()
+
+
+    def get_lane_url(self, lane, page=1):
+        """
+        Returns the API url of a lane page
+
+        :param lane: Lane (data url)
+        :type lane: string
+        :param page: API page
+        :type page: int
+        :returns:  string - API url
+        """
+        url = '{0}/{1}'.format(self.constants.get_api_url(), lane)
+        if page < 2:
+            return url
+        return '{0}{1}{2}={3}'.format(
+            url,
+            '&' if '?' in url else '?',
+            self.constants.get_lane_page_param(),
+            page)
+
+
+    @classmethod
+    def get_lane_page_count(cls, data):
+        """
+        Returns the number of API pages of a lane (1 if the lane isn´t paged)
+
+        :param data: Data of a raw lane document
+        :type data: dict
+        :returns:  int - Number of pages
+        """
+        pagination = data.get('pagination') or {}
+        for key in ('last_page', 'total_pages', 'pages'):
+            try:
+                return max(1, int(pagination.get(key)))
+            except (TypeError, ValueError):
+                continue
+        return 1
+
+
+    def fetch_live_items(self, sport):
+        """
+        Fetches the sport page & the lanes listing live & upcoming events
+
+        :param sport: Chosen sport
+        :type sport: dict
+        :returns:  list - Sport, lane & raw API item of every event found
+        """
+        api_url = self.constants.get_api_url()
+        items = []
+        for lane in self.get_lanes(self.fetch_json('{0}{1}'.format(api_url, sport.get('target')))):
+            element = lane.get('group_elements')[0]
+            if self.is_live_lane(element=element) is False:
+                continue
+            data_url = element.get('data_url')
+            data = self.fetch_json(self.get_lane_url(lane=data_url)).get('data') or {}
+            for item in data.get('data') or []:
+                items.append((sport, data_url, item))
+        return items
+
+
+    def is_live_lane(self, element):
+        """
+        Checks if a lane lists live & upcoming events (see `show_live_now`)
+
+        :param element: Group element of the lane
+        :type element: dict
+        :returns:  bool - Lane lists live & upcoming events
+        """
+        marker = self.constants.get_live_lane_marker()
+        data_url = element.get('data_url') or ''
+        return marker in data_url.split('/')[-1].lower() or marker in (element.get('title') or '').lower()
+
+
+    def show_search_results(self, query):
+        """
+        Creates the KODI list items for the matches found in the local
+        search index, no network requests are made
+
+        :param query: Search query
+        :type query: string
+        """
+        self.utils.log('Search: {0}'.format(query))
+        for result in self.search.find(query=query):
+            sport = result.get('sport') or {}
+            url = self.utils.build_url({
+                'for': sport,
+                'lane': result.get('lane') or '',
+                'target': result.get('target')})
+            plot = sport.get('title', '')
+            if result.get('start'):
+                plot = '{0}\n\n{1} Uhr'.format(plot, datetime.fromtimestamp(result.get('start')).strftime('%d.%m.%Y %H:%M'))
+            self.directory.add_item(
+                url=url,
+                label=result.get('title'),
+                art=self.item_helper.build_art(sport=sport),
+                info={'plot': plot})
+        self.directory.end()
 
 
     def show_sport_categories(self, sport):
@@ -198,121 +600,118 @@ class ContentLoader(object):
         :type sport: string
         """
         self.utils.log('({0}) Main Menu'.format(sport))
-        _session = self.session.get_session()
         api_url = self.constants.get_api_url()
 
         # load sport page from Magenta Sport
         url = '{0}{1}'.format(api_url, sport.get('target'))
-        raw_data = _session.get(url).text
-
-        # parse data
-        data = json.loads(raw_data)
-        data = data.get('data', {}).get('content', [])
-
-        lanes = []
-        if len(data) > 0:
-            for lane in data:
-                if len(lane.get('group_elements', [])) > 0 and lane.get('group_elements')[0].get('type').lower().find('lane') > -1:
-                    lanes.append(lane)
+        lanes = self.get_lanes(self.fetch_json(url))
 
         # add directory item for each event
         for lane in lanes:
-            url = self.utils.build_url({'for': sport, 'lane': lane.get('group_elements')[0].get('data_url')})
+            data_url = lane.get('group_elements')[0].get('data_url')
+            self.prefetch_urls.append((self.get_lane_url(lane=data_url), {'sport': sport, 'lane': data_url}))
+            url = self.utils.build_url({'for': sport, 'lane': data_url})
             title = lane.get('title') if lane.get('title') and lane.get('title') != '' else lane.get('group_elements')[0].get('title')
-            list_item = xbmcgui.ListItem(label=title)
-            list_item = self.item_helper.set_art(
-                list_item=list_item,
-                sport=sport)
-            xbmcplugin.addDirectoryItem(
-                handle=self.plugin_handle,
+            self.directory.add_item(
                 url=url,
-                listitem=list_item,
-                isFolder=True)
+                label=title,
+                art=self.item_helper.build_art(sport=sport))
 
         # Add static folder items (if available)
-        # self.__add_static_folders()
-        # xbmcplugin.addSortMethod(
-        #    handle=self.plugin_handle,
-        #    sortMethod=xbmcplugin.SORT_METHOD_LABEL)
-        xbmcplugin.endOfDirectory(self.plugin_handle)
+        self.__add_static_folders(
+            statics=self.constants.get_statics_list(),
+            sport=sport)
+        self.directory.end()
 
 
     def show_date_list(self, _for):
         """
         Creates the KODI list items for a list of dates with contents
-        based on the current date & syndication.
+        based on the indexed EPG of the chosen sport
 
         :param _for: Chosen sport
-        :type _for: string
+        :type _for: dict
         """
-        self.utils.log('Main menu')
-        plugin_handle = self.plugin_handle
-        addon_data = self.utils.get_addon_data()
+        self.utils.log('({0}) Date list'.format(_for))
         epg = self.get_epg(_for)
-        for _date in epg.keys():
+        day_names = self.constants.get_day_names()
+        for _date in epg.get_days():
             title = ''
-            items = epg.get(_date)
-            for item in items:
-                title = '{0}{1}\n\n'.format(title, ' '.join(item.get('title').replace('Uhr', '').split(' ')[:-2]))
-            url = self.utils.build_url({'date': date, 'for': _for})
-            list_item = xbmcgui.ListItem(label=_date)
-            list_item.setProperty('fanart_image', addon_data.get('fanart'))
-            list_item.setInfo('video', {
-                'date': date,
-                'title': title,
-                'plot': title,
-            })
-            xbmcplugin.addDirectoryItem(
-                handle=plugin_handle,
+            for event in epg.get_day(_date):
+                title = '{0}{1}\n\n'.format(title, event.get('view').title)
+            url = self.utils.build_url({'date': _date.isoformat(), 'for': _for})
+            self.directory.add_item(
                 url=url,
-                listitem=list_item,
-                isFolder=True)
-            xbmcplugin.addSortMethod(
-                handle=plugin_handle,
-                sortMethod=xbmcplugin.SORT_METHOD_DATE)
-        xbmcplugin.endOfDirectory(plugin_handle)
+                label='{0}, {1}'.format(
+                    day_names[_date.weekday()],
+                    _date.strftime('%d.%m.%Y')),
+                art=self.item_helper.build_art(sport=_for),
+                info={
+                    'date': _date.strftime('%d.%m.%Y'),
+                    'title': title,
+                    'plot': title,
+                })
+        self.directory.add_sort_method(xbmcplugin.SORT_METHOD_NONE)
+        self.directory.end()
 
 
-    def show_event_lane(self, sport, lane):
+    def show_event_lane(self, sport, lane, page=1, offset=0):
         """
         Creates the KODI list items with the contents of an event-lanes
-        for a selected sport & lane
+        for a selected sport & lane. Lanes are listed in pages: pages
+        of the API are fetched on demand, each of them is listed in
+        slices of `LANE_PAGE_SIZE` items, followed by a "next page" item
 
         :param sport: Chosen sport
         :type sport: string
         :param lane: Chosen event-lane
         :type lane: string
+        :param page: API page of the lane
+        :type page: int
+        :param offset: Offset of the first listed item within the API page
+        :type offset: int
         """
-        self.utils.log('({0}) Lane {1}'.format(sport, lane))
-        _session = self.session.get_session()
+        self.utils.log('({0}) Lane {1} (page {2}, offset {3})'.format(sport, lane, page, offset))
         api_url = self.constants.get_api_url()
-        plugin_handle = self.plugin_handle
-
-        # load sport page from Magenta Sport
-        url = '{0}/{1}'.format(api_url, lane)
-        raw_data = _session.get(url).text
-
-        # parse data
-        data = json.loads(raw_data)
-        data = data.get('data', [])
+        page_size = self.constants.get_lane_page_size()
+
+        # load lane page from Magenta Sport
+        data = self.fetch_json(
+            self.get_lane_url(lane=lane, page=page),
+            index={'sport': sport, 'lane': lane}).get('data') or {}
+        items = data.get('data') or []
+        pages = self.get_lane_page_count(data=data)
+        next_page = None
+        if offset + page_size < len(items):
+            next_page = {'for': sport, 'lane': lane, 'page': page, 'offset': offset + page_size}
+        elif page < pages:
+            next_page = {'for': sport, 'lane': lane, 'page': page + 1, 'offset': 0}
+            # the next API page is prefetched first
+            self.prefetch_urls.append((self.get_lane_url(lane=lane, page=page + 1), {'sport': sport, 'lane': lane}))
+        items = items[offset:offset + page_size]
 
         # generate entries
-        if data and data.get('data'):
-            for item in data.get('data'):
-                info = {}
-                url = self.utils.build_url(
-                    {'for': sport, 'lane': lane, 'target': item.get('target')})
-                list_item = xbmcgui.ListItem(
-                    label=self.item_helper.build_title(item))
-                list_item = self.item_helper.set_art(list_item, sport, item)
-                info['plot'] = self.item_helper.build_description(item)
-                list_item.setInfo('video', info)
-                xbmcplugin.addDirectoryItem(
-                    handle=plugin_handle,
-                    url=url,
-                    listitem=list_item,
-                    isFolder=True)
-        xbmcplugin.endOfDirectory(plugin_handle)
+        if items:
+            now = datetime.now()
+            with self.tracer.span('render'):
+                for item in items:
+                    view = self.item_helper.get_view(item=item, sport=sport, now=now)
+                    self.prefetch_urls.append((
+                        '{0}/{1}'.format(api_url, view.target),
+                        {'sport': sport, 'lane': lane, 'target': view.target}))
+                    url = self.utils.build_url(
+                        {'for': sport, 'lane': lane, 'target': view.target})
+                    self.directory.add_item(
+                        url=url,
+                        label=view.title,
+                        art=view.art,
+                        info={'plot': view.description})
+        if next_page is not None:
+            self.directory.add_item(
+                url=self.utils.build_url(next_page),
+                label=self.utils.get_local_string(string_id=32031),
+                art=self.item_helper.build_art(sport=sport))
+        self.directory.end()
 
 
     def show_matches_list(self, game_date, _for):
@@ -320,30 +719,30 @@ class ContentLoader(object):
         Creates the KODI list items with the contents of available matches
         for a given date
 
-        :param game_date: Chosen event-lane
+        :param game_date: Chosen date (ISO format)
         :type game_date: string
         :param _for: Chosen sport
-        :type _for: string
+        :type _for: dict
         """
         self.utils.log('Matches list: {0}'.format(_for))
-        addon_data = self.utils.get_addon_data()
-        plugin_handle = self.plugin_handle
         epg = self.get_epg(_for)
-        items = epg.get(game_date)
-        for item in items:
-            url = self.utils.build_url(
-                {'hash': item.get('hash'), 'date': game_date, 'for': _for})
-            list_item = xbmcgui.ListItem(label=item.get('title'))
-            list_item.setProperty('fanart_image', addon_data.get('fanart'))
-            xbmcplugin.addDirectoryItem(
-                handle=plugin_handle,
-                url=url,
-                listitem=list_item,
-                isFolder=True)
-            xbmcplugin.addSortMethod(
-                handle=plugin_handle,
-                sortMethod=xbmcplugin.SORT_METHOD_NONE)
-        xbmcplugin.endOfDirectory(plugin_handle)
+        _date = datetime.strptime(game_date, '%Y-%m-%d').date()
+        # local midnight to midnight, like the day buckets of the EPG
+        start = time.mktime(_date.timetuple())
+        end = time.mktime(date.fromordinal(_date.toordinal() + 1).timetuple())
+        now = datetime.now()
+        with self.tracer.span('render'):
+            for event in epg.get_range(start=start, end=end):
+                view = self.item_helper.update_view(view=event.get('view'), now=now)
+                url = self.utils.build_url(
+                    {'for': _for, 'lane': '', 'target': view.target})
+                self.directory.add_item(
+                    url=url,
+                    label='{0} Uhr - {1}'.format(view.time, view.title),
+                    art=view.art,
+                    info={'plot': view.description})
+        self.directory.add_sort_method(xbmcplugin.SORT_METHOD_NONE)
+        self.directory.end()
 
 
     def show_match_details(self, target, lane, _for):
@@ -359,36 +758,21 @@ class ContentLoader(object):
         :type _for: string
         """
         self.utils.log('Matches details')
-        _session = self.session.get_session()
         api_url = self.constants.get_api_url()
 
         # load sport page from Magenta Sport
         url = '{0}/{1}'.format(api_url, target)
-        raw_data = _session.get(url).text
-
-        # parse data
-        data = json.loads(raw_data)
-        data = data.get('data', [])
+        index = {'sport': _for, 'lane': lane, 'target': target}
+        data = self.fetch_json(url, index=index).get('data', {})
 
         # check if content is available
         if data.get('content') is None:
-            xbmcplugin.endOfDirectory(self.plugin_handle)
+            self.directory.end()
             return None
 
-        for videos in data.get('content', []):
-            vids = videos.get('group_elements', [{}])[0].get('data')
+        for vids in self.__load_match_groups(content=data.get('content', []), index=index):
             for video in vids:
                 if self.__is_playable_video_item(video=video):
-                    title = video.get('title', '')
-                    list_item = xbmcgui.ListItem(
-                        label=title)
-                    list_item = self.item_helper.set_art(
-                        list_item=list_item,
-                        sport=_for,
-                        item=video)
-                    list_item = self.__set_item_playable(
-                        list_item=list_item,
-                        title=title)
                     url = self.utils.build_url({
                         'for': _for,
                         'lane': lane,
@@ -396,9 +780,9 @@ class ContentLoader(object):
                         'video_id': str(video.get('videoID'))})
                     self.__add_video_item(
                         video=video,
-                        list_item=list_item,
+                        sport=_for,
                         url=url)
-        xbmcplugin.endOfDirectory(handle=self.plugin_handle)
+        self.directory.end()
 
 
     def play(self, video_id):
@@ -434,56 +818,38 @@ class ContentLoader(object):
                 xbmcgui.ListItem(path=''))
 
 
-    def __parse_regular_event(self, target_url, details, match_time):
-        """
-        Parses a regular event (one that´s not part of a slot)
-
-        :param target_url: Events target url
-        :type target_url: string
-        :param details: Events details
-        :type details: dict
-        :param match_time: Events match time
-        :type match_time: string
-        :returns:  dict - Parsed event
+    def __load_match_groups(self, content, index):
         """
-        return self.item_helper.build_page_leave(
-            target_url=target_url,
-            details=details,
-            match_time=match_time)
-
+        Returns the videos of all group elements of a match page in page
+        order. Group elements referencing their videos by `data_url`
+        (interviews, highlights, re-live) are fetched concurrently
 
-    def __parse_slot_events(self, element, details, match_time):
+        :param content: Content groups of a raw match page
+        :type content: list
+        :param index: Search context of the match (see `__index_document`)
+        :type index: dict
+        :returns:  list - Raw videos per group element
         """
-        Parses an event
-
-        :param element: Raw element info
-        :type element: dict
-        :param details: Events details
-        :type details: dict
-        :param match_time: Events match time
-        :type match_time: string
-        :returns:  dict - Parsed event
-        """
-        events = []
-        slots = element.get('slots')
-        # get data for home and away teams
-        home = details.get('home', {})
-        away = details.get('away', {})
-        for slot in slots:
-            events = slot.get('events')
-            for event in events:
-                target_url = event.get('target_url', '')
-                if details.get('home') is not None:
-                    shorts = (
-                        home.get('name_mini'),
-                        away.get('name_mini'))
-                    events.append(
-                        self.item_helper.build_page_leave(
-                            target_url=target_url,
-                            details=details,
-                            match_time=match_time,
-                            shorts=shorts))
-        return events
+        api_url = self.constants.get_api_url()
+        elements = [element for group in content for element in group.get('group_elements') or []]
+        data_urls = []
+        for element in elements:
+            if not element.get('data') and element.get('data_url') and element.get('data_url') not in data_urls:
+                data_urls.append(element.get('data_url'))
+        documents = dict(zip(data_urls, self.utils.parallel_map(
+            lambda data_url: self.fetch_json('{0}/{1}'.format(api_url, data_url), index=index),
+            data_urls,
+            self.constants.get_max_workers())))
+        groups = []
+        for element in elements:
+            videos = element.get('data')
+            if not videos and element.get('data_url') in documents:
+                videos = (documents.get(element.get('data_url')) or {}).get('data')
+                # lazily loaded groups are shaped like lanes
+                if isinstance(videos, dict):
+                    videos = videos.get('data')
+            groups.append(videos or [])
+        return groups
 
 
     def __add_static_folders(self, statics, sport):
@@ -493,76 +859,106 @@ class ContentLoader(object):
         :param statics: All static entries
         :type statics: dict
         :param sport: Chosen sport
-        :type sport: string
+        :type sport: dict
+        """
+        static_lanes = statics.get(sport.get('id'), statics.get('default'))
+        if static_lanes and static_lanes.get('categories'):
+            lanes = static_lanes.get('categories')
+            for lane in lanes:
+                url = self.utils.build_url({
+                    'for': sport,
+                    'static': True,
+                    'lane': lane.get('id')})
+                self.directory.add_item(
+                    url=url,
+                    label=lane.get('name'),
+                    art=self.item_helper.build_art(sport=sport))
+
+
+    def __build_warmup_context_menu(self, sport_id, active):
         """
-        if statics.get(sport):
-            static_lanes = statics.get(sport)
-            if static_lanes.get('categories'):
-                lanes = static_lanes.get('categories')
-                for lane in lanes:
-                    url = self.utils.build_url({
-                        'for': sport,
-                        'static': True,
-                        'lane': lane.get('id')})
-                    list_item = xbmcgui.ListItem(label=lane.get('name'))
-                    xbmcplugin.addDirectoryItem(
-                        handle=self.plugin_handle,
-                        url=url,
-                        listitem=list_item,
-                        isFolder=True)
+        Builds the context menu entry to toggle the warm-up of a sport
 
+        :param sport_id: Sport id
+        :type sport_id: string
+        :param active: Sport is kept warm
+        :type active: bool
+        :returns:  tuple - Context menu entries
+        """
+        return ((
+            self.utils.get_local_string(string_id=32028 if active else 32027),
+            'RunPlugin({0})'.format(self.utils.build_url({'warmup': sport_id}))),)
 
-    def __add_video_item(self, video, list_item, url):
+
+    def __add_video_item(self, video, sport, url):
         """
         Adds a playable video item to Kodi
 
         :param video: Video details
         :type video: dict
-        :param list_item: Kodi list item
-        :type list_item: xbmcgui.ListItem
+        :param sport: Chosen sport
+        :type sport: dict
         :param url: Video url
         :type url: string
         """
         if video.get('islivestream', True) is True:
-            xbmcplugin.addDirectoryItem(
-                handle=self.plugin_handle,
+            title = video.get('title', '')
+            self.directory.add_item(
                 url=url,
-                listitem=list_item,
-                isFolder=False)
+                label=title,
+                art=self.item_helper.build_art(sport=sport, item=video),
+                info={'title': title, 'genre': 'Sports'},
+                properties={'IsPlayable': 'true'},
+                is_folder=False)
+
+
+    def __get_schedules(self, document):
+        """
+        Returns the scheduled start & end of all events of a lane document
+        (its items) or a match document (the match & its videos)
+
+        :param document: Raw lane or match document
+        :type document: dict
+        :returns:  list -- Start & end timestamps
+        """
+        data = document.get('data') if isinstance(document, dict) else None
+        if not isinstance(data, dict):
+            return []
+        items = [data] + [item for item in data.get('data') or [] if isinstance(item, dict)]
+        for group in data.get('content') or []:
+            for element in group.get('group_elements') or []:
+                items += [item for item in element.get('data') or [] if isinstance(item, dict)]
+        schedules = []
+        for item in items:
+            metadata = item.get('metadata') or {}
+            start = (metadata.get('scheduled_start') or {}).get('utc_timestamp')
+            if start is None:
+                continue
+            end = (metadata.get('scheduled_end') or {}).get('utc_timestamp')
+            start = float(start)
+            end = float(end) if end is not None else start + self.constants.get_event_duration()
+            schedules.append((start, max(start, end)))
+        return schedules
 
 
-    def __parse_epg_element(self, use_slots, element, details, match_time):
+    def __serve_stored(self, stored):
         """
-        Parses an EPG element & returns a list of parsed elements
+        Returns a stored document & notifies the user (once) that
+        stale content is shown
 
-        :param use_slots: Slot item
-        :type use_slots: bool
-        :param element: Raw EPG element
-        :type element: dict
-        :param details: EPG element details
-        :type details: dict
-        :param match_time: Events match time
-        :type match_time: string
-        :returns:  list - EPG element list
-        """
-        elements = []
-
-        # determine event type & parse
-        if use_slots is True:
-            slot_events = self.__parse_slot_events(
-                element=element,
-                details=details,
-                match_time=match_time)
-            for slot_event in slot_events:
-                elements.append(slot_event)
-        else:
-            target_url = element.get('target_url', '')
-            slot = self.__parse_regular_event(
-                target_url=target_url,
-                details=details,
-                match_time=match_time)
-            elements.append(slot)
-        return elements
+        :param stored: Stored entry (or None)
+        :type stored: dict
+        :returns:  dict - Stored document (empty if nothing is stored)
+        """
+        # listings rendered from stale content must not be replayed
+        self.directory.discard()
+        if self.offline_notified is False:
+            self.offline_notified = True
+            self.dialogs.show_offline_notification(
+                stored=datetime.fromtimestamp(stored.get('stored')) if stored else None)
+        if stored is None:
+            return {}
+        return stored.get('payload')
 
 
     @classmethod
@@ -583,35 +979,19 @@ class ContentLoader(object):
 
 
     @classmethod
-    def __set_item_playable(cls, list_item, title):
-        """
-        Sets an Kodi item playable
-
-        :param list_item: Kodi list item
-        :type list_item: xbmcgui.ListItem
-        :param title: Title of the video
-        :type title: string
-        :returns:  bool - EPG has slot type elements
-        """
-        list_item.setProperty('IsPlayable', 'true')
-        list_item.setInfo('video', {
-            'title': title,
-            'genre': 'Sports'})
-        return list_item
-
-
-    @classmethod
-    def __use_slots(cls, data):
+    def get_lanes(cls, page):
         """
-        Determines if the EPG uses slot type events
+        Returns the event lanes of a raw sport page
 
-        :param data: Raw EPG data
-        :type data: dict
-        :returns:  bool - EPG has slot type elements
+        :param page: Raw sport page
+        :type page: dict
+        :returns:  list - Event lanes
         """
-        if data.get('elements') is None:
-            return False
-        return True
+        lanes = []
+        for lane in page.get('data', {}).get('content', []):
+            if len(lane.get('group_elements', [])) > 0 and lane.get('group_elements')[0].get('type').lower().find('lane') > -1:
+                lanes.append(lane)
+        return lanes
 
 
     @classmethod
@@ -48,6 +48,37 @@ class Dialogs(object):
             type=xbmcgui.INPUT_ALPHANUM)
 
 
+    def show_search_dialog(self):
+        """
+        Shows search term input
+
+        :returns:  string - Search term
+        """
+        dlg = xbmcgui.Dialog()
+        return dlg.input(
+            self.utils.get_local_string(string_id=32017),
+            type=xbmcgui.INPUT_ALPHANUM)
+
+
+    def show_offline_notification(self, stored):
+        """
+        Shows "API unreachable, showing stored content" notification for 5 sec
+
+        :param stored: Time the shown content was stored (or None if nothing is stored)
+        :type stored: datetime.datetime
+        """
+        dialog = xbmcgui.Dialog()
+        if stored is None:
+            message = self.utils.get_local_string(string_id=32023)
+        else:
+            message = self.utils.get_local_string(string_id=32022).format(
+                stored.strftime('%d.%m.%Y %H:%M'))
+        dialog.notification(
+            self.utils.get_local_string(string_id=32021),
+            message,
+            xbmcgui.NOTIFICATION_WARNING, 5000)
+
+
     def show_not_available_dialog(self):
         """
         Shows "video not playable/available" modal
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+# Module: Directory
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""Adds Kodi list items & records them as replayable listing snapshots"""
+
+from __future__ import unicode_literals
+import xbmcgui
+import xbmcplugin
+
+
+class Directory(object):
+    """Adds Kodi list items & records them as replayable listing snapshots"""
+
+
+    def __init__(self, utils, storage, tracer, handle):
+        """
+        Injects instances & the plugin handle
+
+        :param utils: Utils instance
+        :type utils: resources.lib.Utils
+        :param storage: Storage instance
+        :type storage: resources.lib.Storage
+        :param tracer: Tracer instance
+        :type tracer: resources.lib.Tracer
+        :param handle: Kodi plugin handle
+        :type handle: int
+        """
+        self.utils = utils
+        self.storage = storage
+        self.tracer = tracer
+        self.plugin_handle = handle
+        self.route = None
+        self.ttl = 0
+        self.items = []
+        self.sort_methods = []
+
+
+    def start_invocation(self, handle):
+        """
+        Sets the plugin handle of a plugin call & drops
+        the listing recorded by the previous one
+
+        :param handle: Kodi plugin handle
+        :type handle: int
+        """
+        self.plugin_handle = handle
+        self.route = None
+        self.ttl = 0
+        self.items = []
+        self.sort_methods = []
+
+
+    def start(self, route, ttl):
+        """
+        Starts recording the listing of a route
+
+        :param route: Route (plugin paramstring)
+        :type route: string
+        :param ttl: Time the snapshot can be replayed (in sec, 0 disables it)
+        :type ttl: int
+        """
+        self.route = route
+        self.ttl = ttl
+        self.items = []
+        self.sort_methods = []
+
+
+    def replay(self, route):
+        """
+        Replays the snapshot of a route into Kodi (if there is a fresh one)
+
+        :param route: Route (plugin paramstring)
+        :type route: string
+        :returns:  bool -- Snapshot replayed
+        """
+        entry = self.storage.get(self.__get_key(route))
+        if entry is None or not self.storage.is_fresh(entry):
+            return False
+        items, sort_methods = entry.get('payload')
+        with self.tracer.span('replay'):
+            for item in items:
+                self.__add(*item)
+            for sort_method in sort_methods:
+                xbmcplugin.addSortMethod(handle=self.plugin_handle, sortMethod=sort_method)
+        xbmcplugin.endOfDirectory(self.plugin_handle)
+        return True
+
+
+    def invalidate(self, route):
+        """
+        Removes the snapshot of a route
+
+        :param route: Route (plugin paramstring)
+        :type route: string
+        """
+        self.storage.delete(self.__get_key(route))
+
+
+    def discard(self):
+        """Disables the snapshot of the current listing (e.g. rendered from stale content)"""
+        self.ttl = 0
+
+
+    def add_item(self, url, label, art=None, info=None, properties=None, is_folder=True, context_menu=None):
+        """
+        Adds a list item to Kodi & records it
+
+        :param url: Plugin url of the item
+        :type url: string
+        :param label: Label
+        :type label: string
+        :param art: Kodi art
+        :type art: dict
+        :param info: Video info labels
+        :type info: dict
+        :param properties: List item properties
+        :type properties: dict
+        :param is_folder: Item is a folder
+        :type is_folder: bool
+        :param context_menu: Context menu entries (label & action)
+        :type context_menu: tuple
+        """
+        item = (url, label, art, info, properties, is_folder, context_menu)
+        self.__add(*item)
+        self.items.append(item)
+
+
+    def add_sort_method(self, sort_method):
+        """
+        Adds a sort method to Kodi (once) & records it
+
+        :param sort_method: Kodi sort method
+        :type sort_method: int
+        """
+        if sort_method in self.sort_methods:
+            return
+        self.sort_methods.append(sort_method)
+        xbmcplugin.addSortMethod(handle=self.plugin_handle, sortMethod=sort_method)
+
+
+    def end(self, succeeded=True):
+        """
+        Ends the listing & stores its snapshot
+
+        :param succeeded: Listing succeeded
+        :type succeeded: bool
+        """
+        xbmcplugin.endOfDirectory(self.plugin_handle, succeeded=succeeded)
+        if succeeded is True and self.route is not None and self.ttl > 0 and len(self.items) > 0:
+            self.storage.set(
+                self.__get_key(self.route),
+                (tuple(self.items), tuple(self.sort_methods)),
+                ttl=self.ttl)
+        self.route = None
+
+
+    def __add(self, url, label, art, info, properties, is_folder, context_menu):
+        """
+        Builds a list item & adds it to Kodi
+
+        :param url: Plugin url of the item
+        :type url: string
+        :param label: Label
+        :type label: string
+        :param art: Kodi art
+        :type art: dict
+        :param info: Video info labels
+        :type info: dict
+        :param properties: List item properties
+        :type properties: dict
+        :param is_folder: Item is a folder
+        :type is_folder: bool
+        :param context_menu: Context menu entries (label & action)
+        :type context_menu: tuple
+        """
+        list_item = xbmcgui.ListItem(label=label)
+        if art:
+            try:
+                list_item.setArt(art)
+            except RuntimeError:
+                self.utils.log('`setArt` not available')
+        if info:
+            list_item.setInfo('video', info)
+        for key, value in (properties or {}).items():
+            list_item.setProperty(key, value)
+        if context_menu:
+            list_item.addContextMenuItems(list(context_menu))
+        xbmcplugin.addDirectoryItem(
+            handle=self.plugin_handle,
+            url=url,
+            listitem=list_item,
+            isFolder=is_folder)
+
+
+    @classmethod
+    def __get_key(cls, route):
+        """
+        Returns the storage key of a routes snapshot
+
+        :param route: Route (plugin paramstring)
+        :type route: string
+        :returns:  string -- Storage key
+        """
+        return 'snapshot:{0}'.format(route)
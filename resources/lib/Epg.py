@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+# Module: Epg
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""Indexed EPG, buckets events by day & answers time based queries"""
+
+from __future__ import unicode_literals
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+import time
+
+
+class Timeline(object):
+    """Start time ordered list of event targets"""
+
+
+    def __init__(self):
+        """Sets up the parallel start time & target lists"""
+        self.starts = []
+        self.targets = []
+
+
+    def __len__(self):
+        """
+        Returns the number of events on the timeline
+
+        :returns:  int -- Number of events
+        """
+        return len(self.targets)
+
+
+    def insert(self, start, target):
+        """
+        Inserts an event, keeps the timeline ordered by start time
+
+        :param start: Events start (UTC timestamp)
+        :type start: float
+        :param target: Events target
+        :type target: string
+        """
+        position = bisect_right(self.starts, start)
+        self.starts.insert(position, start)
+        self.targets.insert(position, target)
+
+
+    def remove(self, start, target):
+        """
+        Removes an event from the timeline
+
+        :param start: Events start (UTC timestamp)
+        :type start: float
+        :param target: Events target
+        :type target: string
+        """
+        position = bisect_left(self.starts, start)
+        while position < len(self.starts) and self.starts[position] == start:
+            if self.targets[position] == target:
+                del self.starts[position]
+                del self.targets[position]
+                return
+            position += 1
+
+
+    def between(self, start, end):
+        """
+        Returns the targets of all events starting in [start, end)
+
+        :param start: Range start (UTC timestamp)
+        :type start: float
+        :param end: Range end (UTC timestamp)
+        :type end: float
+        :returns:  list -- Event targets
+        """
+        return self.targets[bisect_left(self.starts, start):bisect_left(self.starts, end)]
+
+
+    def until(self, timestamp):
+        """
+        Returns the position behind the last event starting at or before timestamp
+
+        :param timestamp: UTC timestamp
+        :type timestamp: float
+        :returns:  int -- Timeline position
+        """
+        return bisect_right(self.starts, timestamp)
+
+
+class Epg(object):
+    """Indexed EPG, buckets events by day & answers time based queries"""
+
+
+    def __init__(self):
+        """Sets up the empty indices"""
+        self.events = {}
+        self.timeline = Timeline()
+        self.days = {}
+        self.day_keys = []
+        self.teams = {}
+        self.sports = {}
+        self.live = set()
+        self.max_duration = 0
+        self.updated = 0
+
+
+    def __len__(self):
+        """
+        Returns the number of indexed events
+
+        :returns:  int -- Number of events
+        """
+        return len(self.events)
+
+
+    def merge(self, items, item_helper, sport=None):
+        """
+        Merges a page of API items into the index, replaces events that
+        are already known by their target. Events keep the view of their
+        item only (see `ItemHelper.build_view`), not the raw item
+
+        :param items: Raw API items (lane contents)
+        :type items: list
+        :param item_helper: ItemHelper instance (builds the views)
+        :type item_helper: resources.lib.ItemHelper
+        :param sport: Sport the items belong to
+        :type sport: dict
+        :returns:  int -- Number of added or changed events
+        """
+        changed = 0
+        for item in items or []:
+            known = self.events.get(item.get('target'))
+            if known is not None and known.get('view').digest == item_helper.get_item_digest(item=item):
+                continue
+            event = self.build_event(item=item, sport=sport, view=item_helper.get_view(item=item, sport=sport))
+            if event is None:
+                continue
+            if known is not None:
+                self.__remove(known)
+            self.__add(event)
+            changed += 1
+        self.updated = time.time()
+        return changed
+
+
+    def replace(self, lanes, item_helper, sport=None):
+        """
+        Replaces the indexed events with the current contents of the lanes
+        of a sport: known events are merged, events no lane lists anymore
+        (e.g. cancelled matches) are removed
+
+        :param lanes: Raw API items by lane
+        :type lanes: dict
+        :param item_helper: ItemHelper instance (builds the views)
+        :type item_helper: resources.lib.ItemHelper
+        :param sport: Sport the items belong to
+        :type sport: dict
+        :returns:  int -- Number of added, changed or removed events
+        """
+        listed = set()
+        changed = 0
+        for items in lanes.values():
+            changed += self.merge(items=items, item_helper=item_helper, sport=sport)
+            listed.update([item.get('target') for item in items or []])
+        for target in [target for target in self.events if target not in listed]:
+            self.__remove(self.events.get(target))
+            changed += 1
+        return changed
+
+
+    def get(self, target):
+        """
+        Returns an event by its target
+
+        :param target: Events target
+        :type target: string
+        :returns:  dict -- Event (or None)
+        """
+        return self.events.get(target)
+
+
+    def get_days(self, start_day=None, end_day=None):
+        """
+        Returns the (local) days with scheduled events, ordered ascending
+
+        :param start_day: First day to include
+        :type start_day: datetime.date
+        :param end_day: Last day to include
+        :type end_day: datetime.date
+        :returns:  list -- Days (datetime.date)
+        """
+        lower = 0 if start_day is None else bisect_left(self.day_keys, start_day.toordinal())
+        upper = len(self.day_keys) if end_day is None else bisect_right(self.day_keys, end_day.toordinal())
+        return [date.fromordinal(day) for day in self.day_keys[lower:upper]]
+
+
+    def get_day(self, day):
+        """
+        Returns the events of a (local) day, ordered by start time
+
+        :param day: Day
+        :type day: datetime.date
+        :returns:  list -- Events
+        """
+        timeline = self.days.get(day.toordinal())
+        if timeline is None:
+            return []
+        return self.__resolve(timeline.targets)
+
+
+    def get_range(self, start, end):
+        """
+        Returns the events starting in [start, end), ordered by start time
+
+        :param start: Range start (UTC timestamp)
+        :type start: float
+        :param end: Range end (UTC timestamp)
+        :type end: float
+        :returns:  list -- Events
+        """
+        return self.__resolve(self.timeline.between(start, end))
+
+
+    def get_now(self, now=None):
+        """
+        Returns the events running at the given time
+
+        :param now: UTC timestamp (defaults to the current time)
+        :type now: float
+        :returns:  list -- Events
+        """
+        now = time.time() if now is None else now
+        upper = self.timeline.until(now)
+        lower = bisect_left(self.timeline.starts, now - self.max_duration)
+        events = self.__resolve(self.timeline.targets[lower:upper])
+        return [event for event in events if event.get('end') > now]
+
+
+    def get_next(self, now=None, count=1):
+        """
+        Returns the next events starting after the given time
+
+        :param now: UTC timestamp (defaults to the current time)
+        :type now: float
+        :param count: Max. number of events
+        :type count: int
+        :returns:  list -- Events
+        """
+        now = time.time() if now is None else now
+        position = self.timeline.until(now)
+        return self.__resolve(self.timeline.targets[position:position + count])
+
+
+    def get_by_team(self, name):
+        """
+        Returns the events of a team, ordered by start time
+
+        :param name: Team name (full, short or mini)
+        :type name: string
+        :returns:  list -- Events
+        """
+        return self.__resolve_unordered(self.teams.get(self.__team_key(name), ()))
+
+
+    def get_by_sport(self, sport_id):
+        """
+        Returns the events of a sport, ordered by start time
+
+        :param sport_id: Sport id
+        :type sport_id: int
+        :returns:  list -- Events
+        """
+        return self.__resolve_unordered(self.sports.get(sport_id, ()))
+
+
+    def get_live(self):
+        """
+        Returns the events flagged as livestreams, ordered by start time
+
+        :returns:  list -- Events
+        """
+        return self.__resolve_unordered(self.live)
+
+
+    @classmethod
+    def build_event(cls, item, sport=None, view=None):
+        """
+        Builds an index event from a raw API item
+
+        :param item: Raw API item
+        :type item: dict
+        :param sport: Sport the item belongs to
+        :type sport: dict
+        :param view: View of the item (kept instead of the item)
+        :type view: resources.lib.ItemHelper.ItemView
+        :returns:  dict -- Event (or None if the item isn´t scheduled)
+        """
+        metadata = item.get('metadata', {})
+        target = item.get('target')
+        start = metadata.get('scheduled_start', {}).get('utc_timestamp')
+        if target is None or start is None:
+            return None
+        start = float(start)
+        end = metadata.get('scheduled_end', {}).get('utc_timestamp')
+        end = float(end) if end is not None else start
+        details = metadata.get('details') or {}
+        teams = []
+        for side in ('home', 'away'):
+            team = details.get(side) or {}
+            for key in ('name_full', 'name_short', 'name_mini'):
+                if team.get(key):
+                    teams.append(team.get(key))
+        return {
+            'target': target,
+            'start': start,
+            'end': max(start, end),
+            'day': datetime.fromtimestamp(start).date().toordinal(),
+            'teams': teams,
+            'live': bool(item.get('islivestream')),
+            'sport': sport,
+            'view': view,
+        }
+
+
+    def __add(self, event):
+        """
+        Adds an event to all indices
+
+        :param event: Event
+        :type event: dict
+        """
+        target = event.get('target')
+        start = event.get('start')
+        self.events[target] = event
+        self.timeline.insert(start, target)
+        day = event.get('day')
+        if day not in self.days:
+            self.days[day] = Timeline()
+            self.day_keys.insert(bisect_left(self.day_keys, day), day)
+        self.days.get(day).insert(start, target)
+        for team in event.get('teams'):
+            self.teams.setdefault(self.__team_key(team), set()).add(target)
+        sport_id = self.__sport_id(event)
+        if sport_id is not None:
+            self.sports.setdefault(sport_id, set()).add(target)
+        if event.get('live') is True:
+            self.live.add(target)
+        self.max_duration = max(self.max_duration, event.get('end') - start)
+
+
+    def __remove(self, event):
+        """
+        Removes an event from all indices
+
+        :param event: Event
+        :type event: dict
+        """
+        target = event.get('target')
+        start = event.get('start')
+        del self.events[target]
+        self.timeline.remove(start, target)
+        day = event.get('day')
+        self.days.get(day).remove(start, target)
+        if len(self.days.get(day)) == 0:
+            del self.days[day]
+            del self.day_keys[bisect_left(self.day_keys, day)]
+        for team in event.get('teams'):
+            self.teams.get(self.__team_key(team), set()).discard(target)
+        sport_id = self.__sport_id(event)
+        if sport_id is not None:
+            self.sports.get(sport_id, set()).discard(target)
+        self.live.discard(target)
+
+
+    def __resolve(self, targets):
+        """
+        Maps (ordered) targets to their events
+
+        :param targets: Event targets
+        :type targets: list
+        :returns:  list -- Events
+        """
+        return [self.events.get(target) for target in targets]
+
+
+    def __resolve_unordered(self, targets):
+        """
+        Maps targets to their events & orders them by start time
+
+        :param targets: Event targets
+        :type targets: set
+        :returns:  list -- Events
+        """
+        events = self.__resolve(targets)
+        events.sort(key=lambda event: (event.get('start'), event.get('target')))
+        return events
+
+
+    @classmethod
+    def __sport_id(cls, event):
+        """
+        Returns the sport id of an event
+
+        :param event: Event
+        :type event: dict
+        :returns:  int -- Sport id (or None)
+        """
+        sport = event.get('sport')
+        if isinstance(sport, dict):
+            return sport.get('id')
+        return None
+
+
+    @classmethod
+    def __team_key(cls, name):
+        """
+        Normalizes a team name for lookups
+
+        :param name: Team name
+        :type name: string
+        :returns:  string -- Lookup key
+        """
+        return ' '.join((name or '').lower().split())
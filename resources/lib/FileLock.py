@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# Module: FileLock
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""Lock file based mutex, shared by all plugin processes & interpreters"""
+
+from __future__ import unicode_literals
+from os import O_CREAT, O_EXCL, O_WRONLY, close, getpid, makedirs, path, remove, rename, write
+from os import open as os_open
+import errno
+import time
+import uuid
+
+
+class LockTimeoutError(OSError):
+    """Raised when entering a lock that couldn´t be acquired in time"""
+
+
+class FileLock(object):
+    """Lock file based mutex, shared by all plugin processes & interpreters"""
+
+
+    def __init__(self, lock_file, timeout, stale):
+        """
+        Sets the lock file & timings
+
+        :param lock_file: Pathname of the lock file
+        :type lock_file: string
+        :param timeout: Max. time to wait for the lock (in sec)
+        :type timeout: float
+        :param stale: Age of a lock file left by a crashed holder (in sec)
+        :type stale: float
+        """
+        self.lock_file = lock_file
+        self.timeout = timeout
+        self.stale = stale
+
+
+    def acquire(self, blocking=True):
+        """
+        Acquires the lock, creating the lock file is atomic
+
+        :param blocking: Wait for the lock (up to the timeout)
+        :type blocking: bool
+        :returns:  bool -- Lock acquired
+        """
+        deadline = time.time() + self.timeout
+        while True:
+            try:
+                handle = os_open(self.lock_file, O_CREAT | O_EXCL | O_WRONLY)
+            except OSError as error:
+                if error.errno == errno.ENOENT and self.__create_directory() is True:
+                    continue
+                if error.errno != errno.EEXIST:
+                    raise
+            else:
+                write(handle, str(getpid()).encode('ascii'))
+                close(handle)
+                return True
+            if self.__break_stale() is True:
+                continue
+            if blocking is False or time.time() >= deadline:
+                return False
+            time.sleep(0.005)
+
+
+    def release(self):
+        """Releases the lock"""
+        try:
+            remove(self.lock_file)
+        except OSError:
+            pass
+
+
+    def __enter__(self):
+        """
+        Acquires the lock (blocking). A timeout raises, the block must
+        not run (& `__exit__` must not release the lock of another holder)
+
+        :returns:  resources.lib.FileLock -- Lock
+        :raises: resources.lib.FileLock.LockTimeoutError
+        """
+        if self.acquire() is False:
+            raise LockTimeoutError('Lock {0} not acquired within {1} sec'.format(self.lock_file, self.timeout))
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Releases the lock (only entered if it was acquired)"""
+        self.release()
+        return False
+
+
+    def __break_stale(self):
+        """
+        Removes the lock file of a crashed holder. It is renamed first,
+        so only one of the waiting processes removes it
+
+        :returns:  bool -- Stale lock removed
+        """
+        try:
+            if time.time() - path.getmtime(self.lock_file) < self.stale:
+                return False
+            stale_file = '{0}.{1}'.format(self.lock_file, uuid.uuid4().hex)
+            rename(self.lock_file, stale_file)
+            remove(stale_file)
+        except OSError:
+            # released or broken by another process meanwhile
+            return False
+        return True
+
+
+    def __create_directory(self):
+        """
+        Creates the directory of the lock file
+
+        :returns:  bool -- Directory exists
+        """
+        try:
+            makedirs(path.dirname(self.lock_file))
+        except OSError:
+            # created by a concurrent process (or not creatable at all)
+            pass
+        return path.isdir(path.dirname(self.lock_file))
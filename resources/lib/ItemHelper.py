@@ -8,13 +8,24 @@
 
 from __future__ import unicode_literals
 from datetime import datetime
+import hashlib
+from resources.lib.Codec import Codec
+
+# view values that aren´t pickled (rebuilt, see `ItemHelper.update_view`)
+UNPICKLED_SLOTS = ('description', 'state')
+
+# state of a view whose description has to be rebuilt
+UNKNOWN_STATE = ('unknown',)
+
+# kinds of Kodi art of an item
+ART_KINDS = ('poster', 'landscape', 'thumb', 'fanart')
 
 
 class ItemHelper(object):
     """Interface for matching API data with the Kodi item interface"""
 
 
-    def __init__(self, constants, utils):
+    def __init__(self, constants, utils, tracer):
         """
         Injects instances
 
@@ -22,106 +33,202 @@ class ItemHelper(object):
         :type constants: resources.lib.Constants
         :param utils: Utils instance
         :type utils: resources.lib.Utils
+        :param tracer: Tracer instance
+        :type tracer: resources.lib.Tracer
         """
         self.constants = constants
         self.utils = utils
+        self.tracer = tracer
+        self.sports_art = {}
+        # views of already rendered items by sport & item key (the
+        # items themselves aren´t kept, views are matched by digest)
+        self.views = {}
 
 
-    def build_description(self, item):
+    def build_view(self, item, sport=None, now=None):
         """
-        Generates an item description
+        Builds the render ready view of an item, all values
+        that are needed to display it are computed at once. Views are
+        compact enough to be cached instead of the raw item (see `Epg`)
 
-        :param item: Item to be described
+        :param item: Item to be displayed
         :type item: dict
-        :returns:  string -- Item description
+        :param sport: Chosen sport
+        :type sport: dict
+        :param now: Reference time for the description (defaults to now)
+        :type now: datetime.datetime
+        :returns:  ItemView -- Item view
         """
-        desc = ''
-        if item.get('metadata', {}).get('description_bold'):
-            desc = '{0} '.format(item.get('metadata', {}).get('description_bold'))
-        if item.get('metadata', {}).get('description_regular'):
-            if desc != '':
-                desc = '{0}- '.format(desc)
-            desc = '{0}{1}'.format(desc, item.get('metadata', {}).get('description_regular'))
-        if desc != '':
-            desc = '{0}:\n'.format(desc)
-        desc = '{0}{1} '.format(desc, self.build_title(item))
-        if item.get('metadata', {}).get('scheduled_start', {}).get('utc_timestamp') and item.get('metadata', {}).get('scheduled_end', {}).get('utc_timestamp'):
-            now = datetime.now()
-            sdt = datetime.fromtimestamp(float(item.get('metadata', {}).get('scheduled_start', {}).get('utc_timestamp')))
-            edt = datetime.fromtimestamp(float(item.get('metadata', {}).get('scheduled_end', {}).get('utc_timestamp')))
-            match_date, match_time, match_weekday = self.datetime_from_utc(item.get('metadata'), item)
-            if now > sdt and now < edt:
-                desc = '{0}\n\nSeit {1} Uhr'.format(desc, match_time)
-            elif now < sdt:
-                delta = (sdt.date() - now.date()).days
-                if delta == 0:
-                    match_date = 'Heute'
-                elif delta == 1:
-                    match_date = 'Morgen'
-                elif delta == 2:
-                    match_date = 'Übermorgen'
-                else:
-                    match_date = sdt.strftime('{0}, {1}').format(match_weekday, match_date)
-                desc = '{0}\n\n{1} {2} Uhr'.format(desc, match_date, match_time)
+        with self.tracer.span('format'):
+            now = datetime.now() if now is None else now
+            metadata = item.get('metadata', {})
+            start, end = self.__get_schedule(metadata=metadata)
+            title = self.build_title(item)
+            match_date, match_time, match_weekday = (None, None, None)
+            if start is not None:
+                match_date, match_time, match_weekday = self.__format_datetime(
+                    datetime.fromtimestamp(start))
+            headline = self.__build_headline(metadata=metadata)
+            return ItemView(
+                target=item.get('target'),
+                video_id=item.get('videoID'),
+                digest=self.get_item_digest(item=item),
+                title=title,
+                headline=headline,
+                description=self.__describe(
+                    headline=headline,
+                    title=title,
+                    schedule=(start, end, match_date, match_time, match_weekday),
+                    now=now),
+                state=self.__get_state(start=start, end=end, now=now),
+                start=start,
+                end=end,
+                date=match_date,
+                time=match_time,
+                weekday=match_weekday,
+                art=self.build_art(sport=sport, item=item))
+
+
+    def update_view(self, view, now=None):
+        """
+        Brings the time dependent description of a (cached) view up to
+        date, e.g. once an upcoming event is running
+
+        :param view: Item view
+        :type view: ItemView
+        :param now: Reference time for the description (defaults to now)
+        :type now: datetime.datetime
+        :returns:  ItemView -- Item view
+        """
+        now = datetime.now() if now is None else now
+        state = self.__get_state(start=view.start, end=view.end, now=now)
+        if state != view.state:
+            view.description = self.__describe(
+                headline=view.headline,
+                title=view.title,
+                schedule=(view.start, view.end, view.date, view.time, view.weekday),
+                now=now)
+            view.state = state
+        return view
+
+
+    def get_view(self, item, sport=None, now=None):
+        """
+        Returns the view of an item, the view built for an identical item
+        (same digest) is reused & brought up to date, so refreshed lanes
+        only rebuild the views of new & changed items
 
-        return desc
+        :param item: Item to be displayed
+        :type item: dict
+        :param sport: Chosen sport
+        :type sport: dict
+        :param now: Reference time for the description (defaults to now)
+        :type now: datetime.datetime
+        :returns:  ItemView -- Item view
+        """
+        item_key = self.get_item_key(item=item)
+        if item_key is None:
+            return self.build_view(item=item, sport=sport, now=now)
+        memo_key = ((sport or {}).get('id'), item_key)
+        view = self.views.get(memo_key)
+        if view is not None and view.digest == self.get_item_digest(item=item):
+            return self.update_view(view=view, now=now)
+        if view is None and len(self.views) >= self.constants.get_view_memo_size():
+            # forget the oldest view
+            self.views.pop(next(iter(self.views)))
+        view = self.build_view(item=item, sport=sport, now=now)
+        self.views[memo_key] = view
+        return view
+
+
+    def diff_items(self, previous, current, previous_now, now):
+        """
+        Compares two versions of a lanes items by `target`/`videoID`,
+        items count as changed if their data or their displayed state
+        (running, starts today, tomorrow...) differs
+
+        :param previous: Items of the previous version
+        :type previous: list
+        :param current: Items of the current version
+        :type current: list
+        :param previous_now: Time of the previous version
+        :type previous_now: datetime.datetime
+        :param now: Time of the current version
+        :type now: datetime.datetime
+        :returns:  tuple -- Keys of new or changed items & keys of removed items
+        """
+        previous_items = dict([(self.get_item_key(item=item), item) for item in previous])
+        changed = []
+        for item in current:
+            item_key = self.get_item_key(item=item)
+            previous_item = previous_items.pop(item_key, None)
+            if previous_item != item or self.get_view_state(item=previous_item, now=previous_now) != self.get_view_state(item=item, now=now):
+                changed.append(item_key)
+        return (changed, list(previous_items.keys()))
 
 
-    def set_art(self, list_item, sport, item=None):
+    def get_view_state(self, item, now):
         """
-        Sets art for the given item
+        Returns the time dependent part of an items description
+
+        :param item: Raw API item
+        :type item: dict
+        :param now: Reference time
+        :type now: datetime.datetime
+        :returns:  tuple -- State (`running`, days until the start or None)
+        """
+        start, end = self.__get_schedule(metadata=item.get('metadata', {}))
+        return self.__get_state(start=start, end=end, now=now)
+
+
+    @classmethod
+    def get_item_digest(cls, item):
+        """
+        Returns a digest of an items data, stable across processes
+
+        :param item: Raw API item
+        :type item: dict
+        :returns:  string -- Digest
+        """
+        return hashlib.sha1(Codec.dumps(item).encode('utf-8')).hexdigest()[:16]
+
+
+    @classmethod
+    def get_item_key(cls, item):
+        """
+        Returns the key identifying an item across versions of a lane
+
+        :param item: Raw API item
+        :type item: dict
+        :returns:  string -- Item key (None if the item has no target or video id)
+        """
+        if item.get('target') is not None:
+            return item.get('target')
+        if item.get('videoID') is not None:
+            return 'video:{0}'.format(item.get('videoID'))
+        return None
+
+
+    def build_art(self, sport, item=None):
+        """
+        Builds the art dict for the given item, editorial art of the items
+        metadata wins over the items images, which win over the sports art.
+        The sports art is memoized per sport, the returned dict
+        must not be modified
 
-        :param list_item: Kodi list item
-        :type list_item: xbmcgui.ListItem
         :param sport: Chosen sport
-        :type sport: string
-        :param item: Item to set art for
+        :type sport: dict
+        :param item: Item to build art for
         :type item: dict
-        :returns:  xbmcgui.ListItem -- Kodi list item
+        :returns:  dict -- Kodi art
         """
-        base_url = self.constants.get_base_url()
-        list_item = self.__get_sports_art(
-            list_item=list_item,
-            sport=sport)
         if item is not None:
-            metatdata = item.get('metadata', {})
-            if item.get('images'):
-                images = item.get('images', {})
-                list_item = self.__get_editorial_art(
-                    list_item=list_item,
-                    base_url=base_url,
-                    images=images)
-            if metatdata.get('images'):
-                images = metatdata.get('images')
-                list_item = self.__get_editorial_art(
-                    list_item=list_item,
-                    base_url=base_url,
-                    images=images)
-        return list_item
-
-
-    def build_page_leave(self, target_url, details, match_time, shorts=None):
-        """
-        Builds the data for an Kodi folder item
-
-        :param target_url: Plugin target url
-        :type target_url: string
-        :param details: EPG element details
-        :type details: dict
-        :param match_time: Events match time
-        :type match_time: string
-        :param shorts: Add shorts desc
-        :type shorts: dict
-        :returns:  dict -- List item info properties
-        """
-        return {
-            'hash': self.utils.generate_hash(target_url),
-            'url': '{0}{1}'.format(self.constants.get_base_url(), target_url),
-            'title': self.build_epg_title(
-                details=details,
-                match_time=match_time),
-            'shorts': shorts,
-        }
+            for images in (item.get('metadata', {}).get('images'), item.get('images')):
+                if images:
+                    art = self.__build_editorial_art(images=images)
+                    if art is not None:
+                        return art
+        return self.__get_sports_art(sport=sport)
 
 
     def build_title(self, item):
@@ -145,58 +252,174 @@ class ItemHelper(object):
         return self.__build_fallback_title(title=title, metadata=metadata)
 
 
-    def __get_editorial_art(self, list_item, base_url, images):
+    @classmethod
+    def __build_headline(cls, metadata):
+        """
+        Generates the headline of an item description (competition & round)
+
+        :param metadata: Item metadata
+        :type metadata: dict
+        :returns:  string -- Headline (empty if the item has none)
+        """
+        desc = ''
+        if metadata.get('description_bold'):
+            desc = '{0} '.format(metadata.get('description_bold'))
+        if metadata.get('description_regular'):
+            if desc != '':
+                desc = '{0}- '.format(desc)
+            desc = '{0}{1}'.format(desc, metadata.get('description_regular'))
+        if desc != '':
+            desc = '{0}:\n'.format(desc)
+        return desc
+
+
+    @classmethod
+    def __describe(cls, headline, title, schedule, now=None):
+        """
+        Generates an item description from already parsed values
+
+        :param headline: Item headline (see `__build_headline`)
+        :type headline: string
+        :param title: Item title
+        :type title: string
+        :param schedule: Start, end, match date, match time & weekday
+        :type schedule: tuple
+        :param now: Reference time (defaults to now)
+        :type now: datetime.datetime
+        :returns:  string -- Item description
+        """
+        desc = '{0}{1} '.format(headline, title)
+        start, end, match_date, match_time, match_weekday = schedule
+        if start is not None and end is not None:
+            now = datetime.now() if now is None else now
+            sdt = datetime.fromtimestamp(start)
+            edt = datetime.fromtimestamp(end)
+            if now > sdt and now < edt:
+                desc = '{0}\n\nSeit {1} Uhr'.format(desc, match_time)
+            elif now < sdt:
+                delta = (sdt.date() - now.date()).days
+                if delta == 0:
+                    match_date = 'Heute'
+                elif delta == 1:
+                    match_date = 'Morgen'
+                elif delta == 2:
+                    match_date = 'Übermorgen'
+                else:
+                    match_date = '{0}, {1}'.format(match_weekday, match_date)
+                desc = '{0}\n\n{1} {2} Uhr'.format(desc, match_date, match_time)
+        return desc
+
+
+    def __build_editorial_art(self, images):
         """
-        Sets editorial art for the given item
+        Builds editorial art from an items images
 
-        :param list_item: Kodi list item
-        :type list_item: xbmcgui.ListItem
-        :param base_url: Image base url
-        :type base_url: string
         :param images: Map of usable images
         :type images: dict
-        :returns:  xbmcgui.ListItem -- Kodi list item
+        :returns:  dict -- Kodi art (or None if no image is usable)
         """
         image = ''
         if images.get('fallback'):
             image = images.get('fallback')
         if images.get('editorial'):
             image = images.get('editorial')
-        if image != '':
-            image = '{0}{1}'.format(base_url, image.replace(' ', '%20'))
-            try:
-                list_item.setArt({
-                    'poster': image,
-                    'landscape': image,
-                    'thumb': image,
-                    'fanart': image
-                })
-            except RuntimeError:
-                self.utils.log('`setArt` not available')
-        return list_item
-
-
-    def __get_sports_art(self, list_item, sport):
-        """
-        Sets editorial art for static sport item
-
-        :param list_item: Kodi list item
-        :type list_item: xbmcgui.ListItem
+        if image == '':
+            return None
+        image = '{0}{1}'.format(self.constants.get_base_url(), image.replace(' ', '%20'))
+        return {
+            'poster': image,
+            'landscape': image,
+            'thumb': image,
+            'fanart': image
+        }
+
+
+    def __get_sports_art(self, sport):
+        """
+        Returns the (memoized) art for a static sport item
+
+        :param sport: Chosen sport
+        :type sport: dict
+        :returns:  dict -- Kodi art
+        """
+        sport = sport or {}
+        key = (sport.get('id'), sport.get('poster'), sport.get('fanart'), sport.get('logo_dark'))
+        art = self.sports_art.get(key)
+        if art is None:
+            art = self.__build_sports_art(sport=sport)
+            self.sports_art[key] = art
+        return art
+
+
+    def __build_sports_art(self, sport):
+        """
+        Builds art for a static sport item
+
         :param sport: Chosen sport
-        :type sport: string
-        :returns:  xbmcgui.ListItem -- Kodi list item
-        """
-        try:
-            base_url = self.constants.get_base_url()
-            list_item.setArt({
-                'poster': '{0}{1}'.format(base_url, sport.get('poster')) if sport.get('poster') else None,
-                'landscape': '{0}{1}'.format(base_url, sport.get('fanart')) if sport.get('fanart') else None,
-                'thumb': '{0}{1}'.format(base_url, sport.get('logo_dark')) if sport.get('logo_dark') else None,
-                'fanart': '{0}{1}'.format(base_url, sport.get('fanart')) if sport.get('fanart') else None
-            })
-        except RuntimeError:
-            self.utils.log('`setArt` not available')
-        return list_item
+        :type sport: dict
+        :returns:  dict -- Kodi art
+        """
+        base_url = self.constants.get_base_url()
+        return {
+            'poster': '{0}{1}'.format(base_url, sport.get('poster')) if sport.get('poster') else None,
+            'landscape': '{0}{1}'.format(base_url, sport.get('fanart')) if sport.get('fanart') else None,
+            'thumb': '{0}{1}'.format(base_url, sport.get('logo_dark')) if sport.get('logo_dark') else None,
+            'fanart': '{0}{1}'.format(base_url, sport.get('fanart')) if sport.get('fanart') else None
+        }
+
+
+    @classmethod
+    def __get_state(cls, start, end, now):
+        """
+        Returns the time dependent part of a description, see `get_view_state`
+
+        :param start: Scheduled start (UTC timestamp)
+        :type start: float
+        :param end: Scheduled end (UTC timestamp)
+        :type end: float
+        :param now: Reference time
+        :type now: datetime.datetime
+        :returns:  tuple -- State (`running`, days until the start or None)
+        """
+        if start is None or end is None:
+            return None
+        sdt = datetime.fromtimestamp(start)
+        if now > sdt and now < datetime.fromtimestamp(end):
+            return ('running',)
+        if now < sdt:
+            # today, tomorrow, the day after tomorrow or any later date
+            return ('upcoming', min((sdt.date() - now.date()).days, 3))
+        return None
+
+
+    @classmethod
+    def __get_schedule(cls, metadata):
+        """
+        Parses the scheduled start & end UTC timestamps of an item
+
+        :param metadata: Item metadata
+        :type metadata: dict
+        :returns:  tuple -- Start & end timestamps (or None)
+        """
+        start = metadata.get('scheduled_start', {}).get('utc_timestamp')
+        end = metadata.get('scheduled_end', {}).get('utc_timestamp')
+        return (
+            float(start) if start else None,
+            float(end) if end else None)
+
+
+    def __format_datetime(self, match_datetime):
+        """
+        Formats a match datetime
+
+        :param match_datetime: Match datetime
+        :type match_datetime: datetime.datetime
+        :returns:  tuple -- Match date, match time & weekday
+        """
+        match_date = match_datetime.strftime('%d.%m.%Y')
+        match_time = match_datetime.strftime('%H:%M')
+        match_weekday = self.constants.get_day_names()[match_datetime.weekday()]
+        return (match_date, match_time, match_weekday)
 
 
     @classmethod
@@ -245,43 +468,67 @@ class ItemHelper(object):
         return '{0} - {1}'.format(details.get('home', {}).get('name_full'), details.get('away', {}).get('name_full'))
 
 
-    @classmethod
-    def build_epg_title(cls, details, match_time):
+class ItemView(object):
+    """Precomputed, render ready view of an API item"""
+
+    __slots__ = (
+        'target',
+        'video_id',
+        'digest',
+        'title',
+        'headline',
+        'description',
+        'state',
+        'start',
+        'end',
+        'date',
+        'time',
+        'weekday',
+        'art',
+    )
+
+
+    def __init__(self, **kwargs):
         """
-        Generates a epg title
+        Sets the views values, missing values default to None
 
-        :param details: Item details
-        :type details: dict
-        :param match_time: Events match time
-        :type match_time: string
-        :returns:  string -- EPG item title
+        :param kwargs: View values (see `__slots__`)
+        :type kwargs: dict
         """
-        return '{0} - {1} ({2} Uhr)'.format(details.get('home', {}).get('name_full'), details.get('away', {}).get('name_full'), match_time)
+        for slot in self.__slots__:
+            setattr(self, slot, kwargs.get(slot))
 
 
-    def datetime_from_utc(self, metadata, element=None):
+    def __getstate__(self):
         """
-        Generates a homan readable time from an items UTC timestamp
+        Returns the views values for pickling (views are cached in the
+        EPG), the time dependent description isn´t stored
 
-        :param metadata: Item metadata
-        :type metadata: dict
-        :param details: Item details
-        :type details: dict
-        :returns:  tuple -- Match date & match time
-        """
-        date_container = None
-        if metadata.get('scheduled_start'):
-            date_container = metadata.get('scheduled_start', {})
-        elif element is not None:
-            date_container = element.get('scheduled_start', {})
-        if date_container is None:
-            return (None, None)
-        stimestamp = date_container.get('date')
-        if stimestamp is None:
-            stimestamp = date_container.get('utc_timestamp')
-        timestamp = float(stimestamp)
-        match_datetime = datetime.fromtimestamp(timestamp)
-        match_date = match_datetime.strftime('%d.%m.%Y')
-        match_time = match_datetime.strftime('%H:%M')
-        match_weekday = self.constants.get_day_names()[match_datetime.weekday()]
-        return (match_date, match_time, match_weekday)
\ No newline at end of file
+        :returns:  tuple -- View values
+        """
+        state = [getattr(self, slot) for slot in self.__slots__ if slot not in UNPICKLED_SLOTS]
+        # editorial art uses one image for all kinds
+        images = set((self.art or {}).values())
+        if len(images) == 1 and None not in images:
+            state[PICKLED_SLOTS.index('art')] = images.pop()
+        return tuple(state)
+
+
+    def __setstate__(self, state):
+        """
+        Restores the views values after unpickling, the description is
+        rebuilt by the next `ItemHelper.update_view`
+
+        :param state: View values
+        :type state: tuple
+        """
+        for slot, value in zip(PICKLED_SLOTS, state):
+            setattr(self, slot, value)
+        if self.art is not None and not isinstance(self.art, dict):
+            self.art = dict([(kind, self.art) for kind in ART_KINDS])
+        self.description = None
+        self.state = UNKNOWN_STATE
+
+
+# view values that are pickled, in pickling order
+PICKLED_SLOTS = tuple([slot for slot in ItemView.__slots__ if slot not in UNPICKLED_SLOTS])
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Module: Normalizer
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""Strips API documents down to the fields the plugin reads before they get stored"""
+
+from __future__ import unicode_literals
+
+# type of decoded JSON strings
+TEXT = type('')
+
+# fields of images & teams
+IMAGES_SCHEMA = {'fallback': True, 'editorial': True}
+TEAM_SCHEMA = {'name_full': True, 'name_short': True, 'name_mini': True}
+
+# fields of events & videos (lane items, match videos & the match itself)
+ITEM_SCHEMA = {
+    'target': True,
+    'videoID': True,
+    'islivestream': True,
+    'title': True,
+    'images': IMAGES_SCHEMA,
+    'metadata': {
+        'title': True,
+        'description_bold': True,
+        'description_regular': True,
+        'scheduled_start': {'utc_timestamp': True},
+        'scheduled_end': {'utc_timestamp': True},
+        'details': {'home': TEAM_SCHEMA, 'away': TEAM_SCHEMA},
+        'images': IMAGES_SCHEMA,
+    },
+}
+
+# lane documents (event lanes & video lanes of matches)
+LANE_SCHEMA = {
+    'status': True,
+    'data': {
+        'title': True,
+        'pagination': True,
+        'data': [ITEM_SCHEMA],
+    },
+}
+
+# match documents & sport pages (content groups of lanes & videos)
+PAGE_SCHEMA = {
+    'status': True,
+    'data': dict(ITEM_SCHEMA, content=[{
+        'title': True,
+        'group_elements': [{
+            'type': True,
+            'title': True,
+            'data_url': True,
+            'data': [ITEM_SCHEMA],
+        }],
+    }]),
+}
+
+
+def _compile(schema):
+    """
+    Compiles a schema into a function applying it, values not shaped like
+    the schema expects are kept as they are. Strings are looked up in the
+    strings seen so far, so equal strings share one object
+
+    :param schema: Dict of allowed keys, list with the schema of the items or True (keep)
+    :type schema: mixed
+    :returns:  function -- Function of value & already seen strings (dict)
+    """
+    if schema is True:
+        return _keep
+    if isinstance(schema, list):
+        apply_item = _compile(schema[0])
+        return lambda value, strings: [apply_item(item, strings) for item in value] if isinstance(value, list) else value
+    fields = dict([(key, _compile(sub_schema)) for key, sub_schema in schema.items()])
+
+    def apply_fields(value, strings):
+        if type(value) is not dict:
+            return value
+        result = {}
+        for key, item in value.items():
+            apply_field = fields.get(key)
+            if apply_field is None:
+                continue
+            # kept fields are handled inline, they are the vast majority
+            if apply_field is _keep:
+                result[key] = strings.setdefault(item, item) if type(item) is TEXT else item
+            else:
+                result[key] = apply_field(item, strings)
+        return result
+    return apply_fields
+
+
+def _keep(value, strings):
+    """
+    Keeps a value, strings are shared
+
+    :param value: Decoded value
+    :type value: mixed
+    :param strings: Already seen strings
+    :type strings: dict
+    :returns:  mixed -- Value
+    """
+    if type(value) is TEXT:
+        return strings.setdefault(value, value)
+    return value
+
+
+# schemas compiled once
+NORMALIZE_LANE = _compile(LANE_SCHEMA)
+NORMALIZE_PAGE = _compile(PAGE_SCHEMA)
+
+
+class Normalizer(object):
+    """Strips API documents down to the fields the plugin reads before they get stored"""
+
+
+    @classmethod
+    def normalize(cls, document):
+        """
+        Normalizes lane, match & sport page documents: fields no renderer
+        reads are dropped & equal strings (team names, leagues, image
+        paths...) share one object, so they are kept & pickled once.
+        Other documents (e.g. navigation) are returned unchanged
+
+        :param document: Decoded API document
+        :type document: dict
+        :returns:  dict -- Normalized document
+        """
+        data = document.get('data') if isinstance(document, dict) else None
+        if not isinstance(data, dict):
+            return document
+        if isinstance(data.get('data'), list):
+            return NORMALIZE_LANE(document, {})
+        if isinstance(data.get('content'), list):
+            return NORMALIZE_PAGE(document, {})
+        return document
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Module: Plugin
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""Object structure of the plugin, built once per interpreter"""
+
+from __future__ import unicode_literals
+from resources.lib.Cache import Cache
+from resources.lib.CircuitBreaker import CircuitBreaker
+from resources.lib.Constants import Constants
+from resources.lib.ContentLoader import ContentLoader
+from resources.lib.Dialogs import Dialogs
+from resources.lib.Directory import Directory
+from resources.lib.ItemHelper import ItemHelper
+from resources.lib.Scheduler import Scheduler
+from resources.lib.Search import Search
+from resources.lib.Session import Session
+from resources.lib.Settings import Settings
+from resources.lib.Storage import Storage
+from resources.lib.Tracer import Tracer
+from resources.lib.Utils import Utils
+
+# plugin of this interpreter, see `get_plugin`
+PLUGIN = None
+
+
+class Plugin(object):
+    """Object structure of the plugin, built once per interpreter"""
+
+
+    def __init__(self):
+        """
+        Builds the object structure. With `reuselanguageinvoker` it
+        outlives the plugin call, so the session (with its pooled
+        connections), the addon data & the in-memory caches are reused
+        """
+        self.constants = Constants()
+        self.utils = Utils(constants=self.constants, kodi_base_url='')
+        self.storage = Storage(utils=self.utils)
+        self.dialogs = Dialogs(utils=self.utils)
+        self.tracer = Tracer(constants=self.constants, utils=self.utils)
+        self.item_helper = ItemHelper(constants=self.constants, utils=self.utils, tracer=self.tracer)
+        self.settings = Settings(utils=self.utils, dialogs=self.dialogs, constants=self.constants)
+        self.cache = Cache(constants=self.constants, utils=self.utils, settings=self.settings)
+        self.breaker = CircuitBreaker(constants=self.constants, utils=self.utils)
+        self.session = Session(
+            constants=self.constants,
+            util=self.utils,
+            settings=self.settings,
+            tracer=self.tracer,
+            breaker=self.breaker)
+        self.scheduler = Scheduler(constants=self.constants, utils=self.utils)
+        self.search = Search(constants=self.constants, utils=self.utils, item_helper=self.item_helper)
+        self.directory = Directory(utils=self.utils, storage=self.storage, tracer=self.tracer, handle=-1)
+        self.content_loader = ContentLoader(
+            session=self.session,
+            scheduler=self.scheduler,
+            item_helper=self.item_helper,
+            cache=self.cache,
+            storage=self.storage,
+            search=self.search,
+            tracer=self.tracer,
+            dialogs=self.dialogs,
+            directory=self.directory,
+            handle=-1)
+
+
+    def start_invocation(self, handle, kodi_base_url):
+        """
+        Prepares a plugin call: sets its handle & base url and resets
+        the state of the previous call (memoized responses, recorded
+        listing, folders to prefetch). State other plugin processes may
+        have changed meanwhile (cookies, search index) is reloaded
+
+        :param handle: Kodi plugin handle (-1 for the service)
+        :type handle: int
+        :param kodi_base_url: Plugin base url
+        :type kodi_base_url: string
+        """
+        self.utils.start_invocation(kodi_base_url=kodi_base_url)
+        self.directory.start_invocation(handle=handle)
+        self.content_loader.start_invocation(handle=handle)
+        self.session.start_invocation()
+        self.search.start_invocation()
+
+
+def get_plugin():
+    """
+    Returns the plugin of this interpreter (built on the first call)
+
+    :returns:  resources.lib.Plugin -- Plugin instance
+    """
+    global PLUGIN
+    if PLUGIN is None:
+        PLUGIN = Plugin()
+    return PLUGIN
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+# Module: Scheduler
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""Schedules API requests by priority, shared by all plugin processes & the service"""
+
+from __future__ import unicode_literals
+from os import getpid, listdir, makedirs, path, remove, utime
+from requests.exceptions import RequestException
+import threading
+import time
+from resources.lib.Codec import Codec
+from resources.lib.FileLock import FileLock
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+# priority classes: requests the user waits for & requests fetching ahead
+# (prefetch, warm-up)
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+
+# time between the checks of a deferred background request (in sec)
+POLL_INTERVAL = 0.05
+
+
+class DeferredError(RequestException):
+    """Raised instead of sending a background request that didn´t get its turn in time"""
+
+
+class Slot(object):
+    """Slot of a host, held while a request is in flight"""
+
+
+    def __init__(self, scheduler, host, priority, max_defer):
+        """
+        Injects the scheduler & sets the request properties
+
+        :param scheduler: Scheduler instance
+        :type scheduler: resources.lib.Scheduler
+        :param host: Host of the request
+        :type host: string
+        :param priority: Priority class (`INTERACTIVE` or `BACKGROUND`)
+        :type priority: string
+        :param max_defer: Max. time a background request waits for its turn (in sec)
+        :type max_defer: float
+        """
+        self.scheduler = scheduler
+        self.host = host
+        self.priority = priority
+        self.max_defer = max_defer
+
+
+    def __enter__(self):
+        """Waits for the turn of the request & takes the slot"""
+        self.scheduler.acquire(host=self.host, priority=self.priority, max_defer=self.max_defer)
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Frees the slot"""
+        self.scheduler.release(host=self.host, priority=self.priority)
+        return False
+
+
+class Scheduler(object):
+    """Schedules API requests by priority, shared by all plugin processes & the service"""
+
+
+    def __init__(self, constants, utils):
+        """
+        Injects instances & sets the shared state files
+
+        :param constants: Constants instance
+        :type constants: resources.lib.Constants
+        :param utils: Utils instance
+        :type utils: resources.lib.Utils
+        """
+        self.constants = constants
+        self.utils = utils
+        addon_data = self.utils.get_addon_data()
+        self.bucket_file = addon_data.get('scheduler_path')
+        self.marker_path = addon_data.get('interactive_path')
+        # marker of this process, kept for its lifetime
+        self.marker = path.join(self.marker_path, str(getpid()))
+        # guards the rate limit, shared by the plugin processes & the service
+        self.lock = FileLock(
+            lock_file=addon_data.get('scheduler_lock_path'),
+            timeout=POLL_INTERVAL,
+            stale=self.constants.get_cache_lock_stale())
+        self.condition = threading.Condition()
+        self.running = {}
+        self.waiting = 0
+        # interactive requests of this process in flight & time the
+        # process was last marked as running them
+        self.interactive = 0
+        self.marked = 0
+
+
+    def slot(self, url, priority=INTERACTIVE, max_defer=None):
+        """
+        Returns the slot of a request, to be held while it is in flight
+
+        :param url: Request url
+        :type url: string
+        :param priority: Priority class (`INTERACTIVE` or `BACKGROUND`)
+        :type priority: string
+        :param max_defer: Max. time a background request waits for its turn
+                          (in sec, defaults to the schedulers)
+        :type max_defer: float
+        :returns:  Slot -- Slot context manager
+        """
+        if max_defer is None:
+            max_defer = self.constants.get_scheduler_max_defer()
+        return Slot(scheduler=self, host=urlparse(url).netloc, priority=priority, max_defer=max_defer)
+
+
+    def acquire(self, host, priority, max_defer):
+        """
+        Waits for the turn of a request & takes a slot of its host.
+        Interactive requests only wait for a free slot, go first & mark
+        the process as running interactive requests for all processes.
+        Background requests are deferred while an interactive one is in
+        flight (in any process) & until they get a token of the shared
+        rate limit
+
+        :param host: Host of the request
+        :type host: string
+        :param priority: Priority class (`INTERACTIVE` or `BACKGROUND`)
+        :type priority: string
+        :param max_defer: Max. time a background request waits for its turn (in sec)
+        :type max_defer: float
+        :raises: resources.lib.Scheduler.DeferredError
+        """
+        interactive = priority == INTERACTIVE
+        if interactive is False:
+            self.__wait_for_turn(max_defer=max_defer)
+        concurrency = self.constants.get_scheduler_host_concurrency()
+        with self.condition:
+            if interactive is True:
+                self.interactive += 1
+                # only the first of concurrent requests touches the marker
+                # (& one renewing it, if they keep the process busy)
+                if self.interactive == 1 or time.time() - self.marked > self.constants.get_scheduler_marker_stale() / 2.0:
+                    self.__mark(busy=True)
+                self.waiting += 1
+            try:
+                while self.running.get(host, 0) >= concurrency or (interactive is False and self.waiting > 0):
+                    self.condition.wait()
+            finally:
+                if interactive is True:
+                    self.waiting -= 1
+                    self.condition.notify_all()
+            self.running[host] = self.running.get(host, 0) + 1
+
+
+    def release(self, host, priority):
+        """
+        Frees the slot of a request
+
+        :param host: Host of the request
+        :type host: string
+        :param priority: Priority class (`INTERACTIVE` or `BACKGROUND`)
+        :type priority: string
+        """
+        with self.condition:
+            self.running[host] = self.running.get(host, 1) - 1
+            if priority == INTERACTIVE:
+                self.interactive -= 1
+                if self.interactive == 0:
+                    self.__mark(busy=False)
+            self.condition.notify_all()
+
+
+    def is_interactive_busy(self):
+        """
+        Checks if an interactive request of any plugin process is in flight,
+        i.e. the marker of a process is dated into the future (see `__mark`)
+
+        :returns:  bool -- Interactive request in flight
+        """
+        try:
+            markers = listdir(self.marker_path)
+        except (OSError, TypeError):
+            return False
+        now = time.time()
+        for marker in markers:
+            pathname = path.join(self.marker_path, marker)
+            try:
+                modified = path.getmtime(pathname)
+                if modified > now:
+                    return True
+                if now - modified > self.constants.get_scheduler_marker_expiry():
+                    # left by a process that ended
+                    remove(pathname)
+            except OSError:
+                # removed meanwhile
+                pass
+        return False
+
+
+    def __wait_for_turn(self, max_defer):
+        """
+        Defers a background request until no interactive request is in
+        flight & it got a token of the rate limit
+
+        :param max_defer: Max. time to wait (in sec)
+        :type max_defer: float
+        :raises: resources.lib.Scheduler.DeferredError
+        """
+        deadline = time.time() + max_defer
+        while True:
+            wait = POLL_INTERVAL if self.is_interactive_busy() else self.__take_token()
+            if wait == 0:
+                return
+            if time.time() + wait > deadline:
+                raise DeferredError('Background request deferred for more than {0} sec'.format(max_defer))
+            time.sleep(min(wait, POLL_INTERVAL))
+
+
+    def __take_token(self):
+        """
+        Takes a token of the background rate limit (token bucket, the
+        state is shared by all processes)
+
+        :returns:  float -- 0 if a token was taken, else the time until the next one (in sec)
+        """
+        rate, burst = self.constants.get_scheduler_background_rate()
+        if self.lock.acquire() is False:
+            return POLL_INTERVAL
+        try:
+            bucket = self.__load_bucket()
+            now = time.time()
+            tokens = min(burst, bucket.get('tokens', burst) + max(0, now - bucket.get('updated', now)) * rate)
+            if tokens < 1:
+                return (1 - tokens) / float(rate)
+            self.__save_bucket(bucket={'tokens': tokens - 1, 'updated': now})
+            return 0
+        finally:
+            self.lock.release()
+
+
+    def __load_bucket(self):
+        """
+        Loads the state of the rate limit
+
+        :returns:  dict -- Tokens left & time of the last update
+        """
+        if not path.isfile(self.bucket_file):
+            return {}
+        try:
+            with open(self.bucket_file, 'rb') as handle:
+                return Codec.loads(handle.read())
+        except (IOError, OSError, ValueError):
+            return {}
+
+
+    def __save_bucket(self, bucket):
+        """
+        Stores the state of the rate limit (only written under the lock)
+
+        :param bucket: Tokens left & time of the last update
+        :type bucket: dict
+        """
+        with open(self.bucket_file, 'w') as handle:
+            handle.write(Codec.dumps(bucket))
+
+
+    def __mark(self, busy):
+        """
+        Marks the process as running interactive requests (or as idle) for
+        all processes. The marker is kept for the lifetime of the process,
+        only its time changes: while busy it is dated ahead by the max.
+        marking time (so the marker of a crashed process expires), idle
+        markers are dated to now. It is created on the first use only
+
+        :param busy: Interactive requests in flight
+        :type busy: bool
+        """
+        now = time.time()
+        self.marked = now if busy is True else 0
+        marked = now + self.constants.get_scheduler_marker_stale() if busy is True else now
+        try:
+            utime(self.marker, (marked, marked))
+            return
+        except OSError:
+            # first interactive request of the process (or removed as expired)
+            pass
+        if not path.isdir(self.marker_path):
+            try:
+                makedirs(self.marker_path)
+            except OSError:
+                # created by a concurrent process
+                pass
+        try:
+            open(self.marker, 'w').close()
+            utime(self.marker, (marked, marked))
+        except (IOError, OSError):
+            self.utils.log('[scheduler] Interactive marker not written')
@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+# Module: Search
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""Local inverted search index over team names & event titles"""
+
+from __future__ import unicode_literals
+from bisect import bisect_left, insort
+from os import fdopen, path, remove, rename
+import re
+import tempfile
+import threading
+import time
+import unicodedata
+from resources.lib.FileLock import FileLock
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+try:
+    from os import replace
+except ImportError:
+    replace = rename
+
+# splits normalized text into search tokens
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+class Search(object):
+    """Local inverted search index over team names & event titles"""
+
+
+    def __init__(self, constants, utils, item_helper):
+        """
+        Injects instances & sets the index file, the index itself is loaded lazily
+
+        :param constants: Constants instance
+        :type constants: resources.lib.Constants
+        :param utils: Utils instance
+        :type utils: resources.lib.Utils
+        :param item_helper: ItemHelper instance
+        :type item_helper: resources.lib.ItemHelper
+        """
+        self.constants = constants
+        self.utils = utils
+        self.item_helper = item_helper
+        self.index_file = self.utils.get_addon_data().get('search_index_path')
+        # guards the index file, plugin processes & the service save concurrently
+        self.lock = FileLock(
+            lock_file=self.utils.get_addon_data().get('search_lock_path'),
+            timeout=self.constants.get_cache_lock_timeout(),
+            stale=self.constants.get_cache_lock_stale())
+        # guards the index, documents are added by concurrent requests
+        self.mutex = threading.RLock()
+        self.documents = None
+        self.postings = None
+        self.tokens = None
+        self.changed = set()
+        self.dirty = False
+        self.index_time = None
+
+
+    def add_items(self, items, sport, lane):
+        """
+        Adds (or updates) lane items to the index
+
+        :param items: Raw API items (lane contents)
+        :type items: list
+        :param sport: Sport the items belong to
+        :type sport: dict
+        :param lane: Lane the items belong to
+        :type lane: string
+        """
+        with self.mutex:
+            self.__load()
+            cutoff = time.time() - self.constants.get_search_max_age()
+            for item in items or []:
+                target = item.get('target')
+                if target is None:
+                    continue
+                metadata = item.get('metadata', {})
+                document = self.documents.get(target, {})
+                start = metadata.get('scheduled_start', {}).get('utc_timestamp')
+                # archived events beyond the max. age would be pruned on save
+                if start is not None and float(start) < cutoff:
+                    continue
+                tokens = self.tokenize(' '.join(self.__get_item_texts(item=item)))
+                updated = {
+                    'title': self.item_helper.build_title(item),
+                    'sport': sport,
+                    'lane': lane,
+                    'start': float(start) if start is not None else 0,
+                    'tokens': tokens,
+                    'detail_tokens': document.get('detail_tokens', set()),
+                }
+                self.__update(target=target, document=document, updated=updated)
+
+
+    def add_match_details(self, target, videos, sport, lane):
+        """
+        Adds the video titles of a match details page to the matches document
+        (titles already indexed are kept, the videos may come in portions)
+
+        :param target: Match target
+        :type target: string
+        :param videos: Raw video items of the match page
+        :type videos: list
+        :param sport: Sport the match belongs to
+        :type sport: dict
+        :param lane: Lane the match belongs to
+        :type lane: string
+        """
+        with self.mutex:
+            self.__load()
+            titles = [video.get('title', '') for video in videos if isinstance(video, dict)]
+            document = self.documents.get(target, {})
+            updated = dict(document)
+            updated.update({
+                'title': document.get('title') or next((title for title in titles if title), ''),
+                'sport': document.get('sport') or sport,
+                'lane': document.get('lane') or lane,
+                'start': document.get('start', 0),
+                'tokens': document.get('tokens', set()),
+                'detail_tokens': document.get('detail_tokens', set()) | self.tokenize(' '.join(titles)),
+            })
+            self.__update(target=target, document=document, updated=updated)
+
+
+    def find(self, query, limit=100):
+        """
+        Searches the index, every query token must prefix match
+        at least one token of a document
+
+        :param query: Search query
+        :type query: string
+        :param limit: Max. number of results
+        :type limit: int
+        :returns:  list -- Matching documents (newest first)
+        """
+        with self.mutex:
+            self.__load()
+            targets = None
+            for token in self.tokenize(query):
+                matches = set()
+                position = bisect_left(self.tokens, token)
+                while position < len(self.tokens) and self.tokens[position].startswith(token):
+                    matches.update(self.postings.get(self.tokens[position]))
+                    position += 1
+                targets = matches if targets is None else targets & matches
+                if not targets:
+                    return []
+            results = []
+            for target in targets or []:
+                document = self.documents.get(target)
+                results.append(dict(document, target=target))
+            results.sort(key=lambda document: document.get('start'), reverse=True)
+            return results[:limit]
+
+
+    def start_invocation(self):
+        """
+        Keeps the loaded index for the next plugin call,
+        unless another plugin process stored a newer one
+        """
+        with self.mutex:
+            if self.documents is not None and self.dirty is False and self.__get_index_time() != self.index_time:
+                self.documents = None
+
+
+    def save(self):
+        """
+        Persists the index in the addon profile (if it changed). Under the
+        lock, documents another process stored meanwhile are merged with
+        the changed ones & documents of events older than the max. age
+        are dropped. The file is replaced atomically
+        """
+        with self.mutex:
+            if self.dirty is False:
+                return
+            if self.lock.acquire() is False:
+                self.utils.log('[search] Index not saved (lock timeout)')
+                return
+            try:
+                documents = dict(self.documents)
+                if self.__get_index_time() != self.index_time:
+                    documents = self.__read()
+                    documents.update([(target, self.documents.get(target)) for target in self.changed])
+                cutoff = time.time() - self.constants.get_search_max_age()
+                for target in [target for target, document in documents.items() if self.__get_age_key(document) < cutoff]:
+                    del documents[target]
+                self.__write(documents=documents)
+                if documents != self.documents:
+                    self.documents = documents
+                    self.__index()
+                self.changed = set()
+                self.dirty = False
+                self.index_time = self.__get_index_time()
+            except (IOError, OSError) as error:
+                self.utils.log('[search] Index not saved: {0}'.format(error))
+            finally:
+                self.lock.release()
+
+
+    @classmethod
+    def normalize(cls, text):
+        """
+        Lowercases a text & strips accents (e.g. `Köln` -> `koln`)
+
+        :param text: Text to be normalized
+        :type text: string
+        :returns:  string -- Normalized text
+        """
+        text = (text or '').lower().replace('ß', 'ss')
+        decomposed = unicodedata.normalize('NFKD', text)
+        return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+    @classmethod
+    def tokenize(cls, text):
+        """
+        Splits a text into normalized search tokens
+
+        :param text: Text to be tokenized
+        :type text: string
+        :returns:  set -- Search tokens
+        """
+        return set(TOKEN_PATTERN.findall(cls.normalize(text)))
+
+
+    def __update(self, target, document, updated):
+        """
+        Replaces a document & its postings
+
+        :param target: Document target
+        :type target: string
+        :param document: Currently indexed document (or empty dict)
+        :type document: dict
+        :param updated: Updated document
+        :type updated: dict
+        """
+        updated['seen'] = document.get('seen')
+        if document == updated:
+            return
+        updated['seen'] = time.time()
+        old_tokens = document.get('tokens', set()) | document.get('detail_tokens', set())
+        new_tokens = updated.get('tokens') | updated.get('detail_tokens')
+        for token in old_tokens - new_tokens:
+            self.postings.get(token).discard(target)
+            if len(self.postings.get(token)) == 0:
+                del self.postings[token]
+                del self.tokens[bisect_left(self.tokens, token)]
+        for token in new_tokens - old_tokens:
+            if token not in self.postings:
+                self.postings[token] = set()
+                insort(self.tokens, token)
+            self.postings.get(token).add(target)
+        self.documents[target] = updated
+        self.changed.add(target)
+        self.dirty = True
+
+
+    def __load(self):
+        """Loads the persisted documents & rebuilds the postings (once)"""
+        if self.documents is not None:
+            return
+        self.index_time = self.__get_index_time()
+        self.documents = self.__read()
+        self.changed = set()
+        self.__index()
+
+
+    def __read(self):
+        """
+        Reads the persisted documents
+
+        :returns:  dict -- Documents by target (empty if there is no index)
+        """
+        if not self.index_file or not path.isfile(self.index_file):
+            return {}
+        try:
+            with open(self.index_file, 'rb') as handle:
+                return pickle.load(handle)
+        except (IOError, OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return {}
+
+
+    def __write(self, documents):
+        """
+        Writes the documents, the file is replaced atomically
+
+        :param documents: Documents by target
+        :type documents: dict
+        """
+        temp_handle, temp_pathname = tempfile.mkstemp(suffix='.tmp', dir=path.dirname(self.index_file))
+        try:
+            with fdopen(temp_handle, 'wb') as handle:
+                pickle.dump(documents, handle, pickle.HIGHEST_PROTOCOL)
+            replace(temp_pathname, self.index_file)
+        except (IOError, OSError):
+            if path.isfile(temp_pathname):
+                remove(temp_pathname)
+            raise
+
+
+    def __index(self):
+        """Rebuilds the postings & the sorted tokens of the documents"""
+        self.postings = {}
+        for target, document in self.documents.items():
+            for token in document.get('tokens') | document.get('detail_tokens'):
+                self.postings.setdefault(token, set()).add(target)
+        self.tokens = sorted(self.postings.keys())
+
+
+    @classmethod
+    def __get_item_texts(cls, item):
+        """
+        Returns the searchable texts of an item (team names & titles)
+
+        :param item: Raw API item
+        :type item: dict
+        :returns:  list -- Searchable texts
+        """
+        metadata = item.get('metadata', {})
+        texts = [
+            metadata.get('title') or '',
+            metadata.get('description_bold') or '',
+            metadata.get('description_regular') or '']
+        details = metadata.get('details') or {}
+        for side in ('home', 'away'):
+            team = details.get(side) or {}
+            for key in ('name_full', 'name_short', 'name_mini'):
+                texts.append(team.get(key) or '')
+        return texts
+
+
+    @classmethod
+    def __get_age_key(cls, document):
+        """
+        Returns the time the age of a document is measured from, the start
+        of its event (or when it was indexed if the start is unknown)
+
+        :param document: Indexed document
+        :type document: dict
+        :returns:  float -- UTC timestamp
+        """
+        return document.get('start') or document.get('seen') or 0
+
+
+    def __get_index_time(self):
+        """
+        Returns the modification time of the persisted index
+
+        :returns:  float -- Modification time (None if there is no index)
+        """
+        try:
+            return path.getmtime(self.index_file)
+        except (OSError, TypeError):
+            return None
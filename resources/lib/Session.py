@@ -9,9 +9,11 @@
 from __future__ import unicode_literals
 from os import path, remove
 from requests import session, utils
+from requests.exceptions import RequestException
 from bs4 import BeautifulSoup
 import xbmcvfs
 import time
+from resources.lib.SingleFlight import SingleFlight
 
 try:
     import cPickle as pickle
@@ -23,7 +25,7 @@ class Session(object):
     """Stores, loads & builds up a request session object. Provides login"""
 
 
-    def __init__(self, constants, util, settings):
+    def __init__(self, constants, util, settings, tracer, breaker):
         """
         Injects instances, sets session file & loads initial session
 
@@ -33,23 +35,65 @@ class Session(object):
         :type util: resources.lib.Utils
         :param settings: Settings instance
         :type settings: resources.lib.Settings
+        :param tracer: Tracer instance
+        :type tracer: resources.lib.Tracer
+        :param breaker: CircuitBreaker instance
+        :type breaker: resources.lib.CircuitBreaker
         """
         self.constants = constants
         self.utils = util
         self.settings = settings
+        self.tracer = tracer
+        self.breaker = breaker
         addon = self.utils.get_addon()
         self.session_file = self.utils.get_addon_data().get('cookie_path')
+        self.session_file_time = None
         self._session = self.load_session()
+        self.flight = SingleFlight(session=self._session, breaker=self.breaker)
         self.load_session_cookies()
 
 
     def get_session(self):
         """
-        Returns the build up session object
+        Returns the build up session object, identical GET requests are
+        coalesced & memoized for the invocation
 
-        :returns:  requests.session -- Session object
+        :returns:  resources.lib.SingleFlight -- Session object
+        """
+        return self.flight
+
+
+    def start_invocation(self):
+        """
+        Forgets the memoized responses of the previous invocation.
+        The session (& its pooled connections) is kept, its cookies are
+        reloaded if another plugin process changed them (e.g. logged in)
+        """
+        self.flight.reset()
+        if self.__get_session_file_time() != self.session_file_time:
+            self._session.cookies.clear()
+            self.load_session_cookies()
+
+
+    def get_duplicate_requests(self):
+        """
+        Returns the number of GET requests served by a shared or
+        memoized response within the invocation
+
+        :returns:  int -- Avoided requests
         """
-        return self._session
+        return self.flight.duplicates
+
+
+    def is_offline(self, url):
+        """
+        Checks if requests to the endpoint of a url currently fail fast
+
+        :param url: Request url
+        :type url: string
+        :returns:  bool -- Circuit of the endpoint is open
+        """
+        return self.breaker.is_open(url=url)
 
 
     def clear_session(self):
@@ -57,6 +101,7 @@ class Session(object):
         if path.isfile(self.session_file):
             remove(self.session_file)
             self.get_session().cookies.clear_session_cookies()
+        self.session_file_time = None
 
 
     def save_session(self):
@@ -65,6 +110,7 @@ class Session(object):
             pickle.dump(
                 utils.dict_from_cookiejar(self._session.cookies),
                 handle)
+        self.session_file_time = self.__get_session_file_time()
 
 
     def load_session(self):
@@ -87,6 +133,7 @@ class Session(object):
         """
         loads & deserializes Cookie file if exists
         """
+        self.session_file_time = self.__get_session_file_time()
         if path.isfile(self.session_file):
             _cookies = None
             try:
@@ -109,6 +156,26 @@ class Session(object):
         Logs in to the platform, fetches cookie headers and checks
         if the login succeeded
 
+        :param user: Username/E-Mail
+        :type user: string
+        :param password: Password
+        :type password: string
+        :returns:  bool -- Login succeeded (or the stored session is valid while the API is unreachable)
+        """
+        with self.tracer.span('login'):
+            try:
+                return self.__login(user=user, password=password, forceLogin=forceLogin)
+            except RequestException as error:
+                # stay usable with the stored payloads while the API is down,
+                # as long as the stored session is still valid
+                self.utils.log('Login not possible, API unreachable: {0}'.format(error))
+                return self.is_logged_in()
+
+
+    def __login(self, user, password, forceLogin=False):
+        """
+        Does the actual login, see `login`
+
         :param user: Username/E-Mail
         :type user: string
         :param password: Password
@@ -117,14 +184,14 @@ class Session(object):
         """
         # check if the suer is already logged in
         if forceLogin is False and path.isfile(self.session_file):
-            file_time = xbmcvfs.Stat(self.session_file).st_mtime()
-            if (time.time() - file_time) / 3600 < 24 and self.get_session().cookies.get('displayname'):
+            if self.is_logged_in() is True:
                 return True
             else:
                 self.clear_session()
 
         # get contents of login page
-        res = self.get_session().get(self.constants.get_login_link())
+        timeout = self.constants.get_request_timeout()
+        res = self.get_session().get(self.constants.get_login_link(), timeout=timeout)
 
         for i in [0, 1]:
             soup = BeautifulSoup(res.text, 'html.parser')
@@ -149,7 +216,8 @@ class Session(object):
             # attribute to determine of the login was successfull
             res = self.get_session().post(
                 self.constants.get_login_endpoint(),
-                data=payload)
+                data=payload,
+                timeout=timeout)
 
         success = self._session.cookies.get_dict().get('displayname')
         if success:
@@ -158,6 +226,19 @@ class Session(object):
         return False
 
 
+    def is_logged_in(self):
+        """
+        Checks if there is a valid session (without any request), i.e. a
+        Cookie file younger than a day with the users display name
+
+        :returns:  bool -- User is logged in
+        """
+        if not path.isfile(self.session_file):
+            return False
+        file_time = xbmcvfs.Stat(self.session_file).st_mtime()
+        return (time.time() - file_time) / 3600 < 24 and bool(self.get_session().cookies.get('displayname'))
+
+
     def logout(self):
         """Clears the session"""
         self.clear_session()
@@ -168,3 +249,15 @@ class Session(object):
         """Clears the session & opens up credentials dialogs"""
         self.clear_session()
         return self.settings.set_credentials()
+
+
+    def __get_session_file_time(self):
+        """
+        Returns the modification time of the Cookie file
+
+        :returns:  float -- Modification time (None if there is no file)
+        """
+        try:
+            return path.getmtime(self.session_file)
+        except OSError:
+            return None
@@ -125,6 +125,75 @@ class Settings(object):
         return (self.decode(user), self.decode(password))
 
 
+    def is_warmup_enabled(self):
+        """
+        Checks if the warm-up service is enabled
+
+        :returns:  bool -- Warm-up enabled
+        """
+        return self.utils.get_addon().getSetting('warmup') == 'true'
+
+
+    def is_prefetch_enabled(self):
+        """
+        Checks if the folders of a listing should be prefetched
+
+        :returns:  bool -- Prefetch enabled
+        """
+        return self.utils.get_addon().getSetting('prefetch') == 'true'
+
+
+    def get_warmup_interval(self):
+        """
+        Returns the refresh interval of favourite sports
+
+        :returns:  int -- Interval in minutes
+        """
+        try:
+            return int(self.utils.get_addon().getSetting('warmup_interval'))
+        except ValueError:
+            return self.constants.get_warmup_interval()
+
+
+    def get_cache_budget(self):
+        """
+        Returns the configured memory budget of the in-memory cache
+
+        :returns:  int -- Budget in MB (None picks the device class default)
+        """
+        try:
+            return int(self.utils.get_addon().getSetting('cache_budget'))
+        except ValueError:
+            return None
+
+
+    def get_warmup_sports(self):
+        """
+        Returns the ids of the sports kept warm
+
+        :returns:  list -- Sport ids
+        """
+        value = self.utils.get_addon().getSetting('warmup_sports')
+        return [sport_id for sport_id in value.split(',') if sport_id != '']
+
+
+    def toggle_warmup_sport(self, sport_id):
+        """
+        Adds a sport to (or removes it from) the sports kept warm
+
+        :param sport_id: Sport id
+        :type sport_id: string
+        :returns:  bool -- Sport is kept warm
+        """
+        sports = self.get_warmup_sports()
+        if sport_id in sports:
+            sports.remove(sport_id)
+        else:
+            sports.append(sport_id)
+        self.utils.get_addon().setSetting('warmup_sports', ','.join(sports))
+        return sport_id in sports
+
+
     def clear_credentials(self):
         """
         Clears credentials
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# Module: SingleFlight
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""Coalesces identical GET requests & memoizes their responses per invocation"""
+
+from __future__ import unicode_literals
+from requests.exceptions import RequestException
+import threading
+from resources.lib.CircuitBreaker import CircuitOpenError
+
+
+class Flight(object):
+    """A GET request in flight, followers wait for the leaders result"""
+
+    __slots__ = ('event', 'response', 'error')
+
+
+    def __init__(self):
+        """Sets up the (not yet finished) flight"""
+        self.event = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Coalesces identical GET requests & memoizes their responses per invocation"""
+
+
+    def __init__(self, session, breaker):
+        """
+        Wraps a requests session, everything but GET & POST is passed through
+
+        :param session: Session object
+        :type session: requests.session
+        :param breaker: CircuitBreaker instance
+        :type breaker: resources.lib.CircuitBreaker
+        """
+        self.session = session
+        self.breaker = breaker
+        self.lock = threading.Lock()
+        self.flights = {}
+        self.responses = {}
+        self.duplicates = 0
+
+
+    def __getattr__(self, name):
+        """
+        Passes attribute lookups through to the wrapped session
+
+        :param name: Attribute name
+        :type name: string
+        :returns:  mixed -- Attribute of the session
+        """
+        if name == 'session':
+            raise AttributeError(name)
+        return getattr(self.session, name)
+
+
+    def get(self, url, **kwargs):
+        """
+        Sends a GET request. Identical requests in flight share one
+        network call, completed responses are reused until `reset`
+
+        :param url: Url
+        :type url: string
+        :param kwargs: Arguments of `requests.Session.get`
+        :type kwargs: dict
+        :returns:  requests.Response -- Response
+        """
+        key = self.__get_key(url=url, kwargs=kwargs)
+        with self.lock:
+            if key in self.responses:
+                self.duplicates += 1
+                return self.responses.get(key)
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader is True:
+                flight = Flight()
+                self.flights[key] = flight
+            else:
+                self.duplicates += 1
+        if leader is False:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.response
+        try:
+            response = self.__send(method='get', url=url, kwargs=kwargs)
+            # read the body before the response is shared between threads
+            response.content
+            flight.response = response
+        except Exception as error:
+            flight.error = error
+            raise
+        finally:
+            with self.lock:
+                self.flights.pop(key, None)
+                if flight.response is not None and flight.response.status_code < 500:
+                    self.responses[key] = flight.response
+            flight.event.set()
+        return response
+
+
+    def post(self, url, **kwargs):
+        """
+        Sends a POST request, memoized responses are dropped
+        as the request might change the (login) state
+
+        :param url: Url
+        :type url: string
+        :param kwargs: Arguments of `requests.Session.post`
+        :type kwargs: dict
+        :returns:  requests.Response -- Response
+        """
+        with self.lock:
+            self.responses = {}
+        return self.__send(method='post', url=url, kwargs=kwargs)
+
+
+    def reset(self):
+        """Drops memoized responses & the counter, e.g. for a new invocation"""
+        with self.lock:
+            self.responses = {}
+            self.duplicates = 0
+
+
+    def __send(self, method, url, kwargs):
+        """
+        Sends a request through the circuit breaker of its endpoint,
+        fails fast while the circuit is open
+
+        :param method: Session method (`get` or `post`)
+        :type method: string
+        :param url: Url
+        :type url: string
+        :param kwargs: Arguments of the session method
+        :type kwargs: dict
+        :returns:  requests.Response -- Response
+        :raises: resources.lib.CircuitBreaker.CircuitOpenError
+        """
+        if self.breaker.allow(url=url) is False:
+            raise CircuitOpenError('Circuit of {0} is open'.format(url))
+        try:
+            response = getattr(self.session, method)(url, **kwargs)
+        except RequestException:
+            self.breaker.record_failure(url=url)
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure(url=url)
+        else:
+            self.breaker.record_success(url=url)
+        return response
+
+
+    @classmethod
+    def __get_key(cls, url, kwargs):
+        """
+        Returns the key identifying a GET request
+
+        :param url: Url
+        :type url: string
+        :param kwargs: Arguments of `requests.Session.get`
+        :type kwargs: dict
+        :returns:  tuple -- Request key
+        """
+        return (
+            url,
+            repr(sorted((kwargs.get('params') or {}).items())),
+            tuple(sorted((kwargs.get('headers') or {}).items())))
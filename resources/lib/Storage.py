@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+# Module: Storage
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""Persists the last known API payloads in the addon profile"""
+
+from __future__ import unicode_literals
+from os import fdopen, listdir, makedirs, path, remove, rename, stat
+import hashlib
+import tempfile
+import time
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+try:
+    from os import replace
+except ImportError:
+    replace = rename
+
+
+class Storage(object):
+    """Persists the last known API payloads in the addon profile"""
+
+
+    def __init__(self, utils):
+        """
+        Injects instances & sets the storage directory
+
+        :param utils: Utils instance
+        :type utils: resources.lib.Utils
+        """
+        self.utils = utils
+        self.storage_path = self.utils.get_addon_data().get('storage_path')
+
+
+    def get(self, key):
+        """
+        Returns a stored entry
+
+        :param key: Key of the entry (e.g. the API url)
+        :type key: string
+        :returns:  dict -- Entry with `payload` & `stored` timestamp (or None)
+        """
+        pathname = self.__get_pathname(key)
+        if not path.isfile(pathname):
+            return None
+        try:
+            with open(pathname, 'rb') as handle:
+                return pickle.load(handle)
+        except (EOFError, ValueError, pickle.UnpicklingError):
+            return None
+
+
+    def set(self, key, payload, **meta):
+        """
+        Stores an entry, the file is replaced atomically. Storing is best
+        effort, a full disk or a read only profile is logged only
+
+        :param key: Key of the entry (e.g. the API url)
+        :type key: string
+        :param payload: Payload to be stored
+        :type payload: mixed
+        :param meta: Additional values stored with the entry
+        :type meta: dict
+        :returns:  mixed -- Payload
+        """
+        if not path.isdir(self.storage_path):
+            try:
+                makedirs(self.storage_path)
+            except OSError:
+                # created by a concurrent writer
+                pass
+        entry = dict(meta, payload=payload, stored=time.time())
+        temp_pathname = None
+        try:
+            # unique temp file, concurrent writers (plugin & warm-up service) must not collide
+            temp_handle, temp_pathname = tempfile.mkstemp(suffix='.tmp', dir=self.storage_path)
+            with fdopen(temp_handle, 'wb') as handle:
+                pickle.dump(entry, handle, pickle.HIGHEST_PROTOCOL)
+            replace(temp_pathname, self.__get_pathname(key))
+        except (IOError, OSError) as error:
+            self.utils.log('[storage] Storing {0} failed: {1}'.format(key, error))
+            if temp_pathname is not None and path.isfile(temp_pathname):
+                self.__remove_file(pathname=temp_pathname)
+        return payload
+
+
+    @classmethod
+    def is_fresh(cls, entry):
+        """
+        Checks if an entry is younger than the TTL it has been stored with
+
+        :param entry: Stored entry
+        :type entry: dict
+        :returns:  bool -- Entry can be used without revalidation
+        """
+        return time.time() - entry.get('stored', 0) < entry.get('ttl', 0)
+
+
+    def delete(self, key):
+        """
+        Removes a stored entry
+
+        :param key: Key of the entry (e.g. the API url)
+        :type key: string
+        """
+        self.__remove_file(pathname=self.__get_pathname(key))
+
+
+    def prune(self, max_age, max_size):
+        """
+        Removes entries older than the max. age, then the oldest ones
+        until the stored entries fit into the max. total size
+
+        :param max_age: Max. age of an entry (in sec)
+        :type max_age: int
+        :param max_size: Max. total size of the entries (in bytes)
+        :type max_size: int
+        :returns:  int -- Number of removed entries
+        """
+        try:
+            names = listdir(self.storage_path)
+        except OSError:
+            return 0
+        entries = []
+        for name in names:
+            pathname = path.join(self.storage_path, name)
+            try:
+                info = stat(pathname)
+            except OSError:
+                # replaced or removed meanwhile
+                continue
+            entries.append((info.st_mtime, info.st_size, pathname))
+        # oldest first
+        entries.sort()
+        cutoff = time.time() - max_age
+        total = sum([size for _, size, _ in entries])
+        removed = 0
+        for modified, size, pathname in entries:
+            if modified >= cutoff and total <= max_size:
+                break
+            self.__remove_file(pathname=pathname)
+            total -= size
+            removed += 1
+        return removed
+
+
+    @classmethod
+    def __remove_file(cls, pathname):
+        """
+        Removes a file, files removed by a concurrent process are ignored
+
+        :param pathname: Pathname of the file
+        :type pathname: string
+        """
+        try:
+            remove(pathname)
+        except OSError:
+            pass
+
+
+    def __get_pathname(self, key):
+        """
+        Returns the file an entry is stored in
+
+        :param key: Key of the entry
+        :type key: string
+        :returns:  string -- Pathname
+        """
+        return path.join(
+            self.storage_path,
+            hashlib.sha1(key.encode('utf-8')).hexdigest())
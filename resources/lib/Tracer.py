@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+# Module: Tracer
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""Lightweight per route timing spans, optional cProfile dumps"""
+
+from __future__ import unicode_literals
+from os import listdir, path, remove
+import threading
+import time
+
+
+class NoopSpan(object):
+    """Span used while tracing is disabled, does nothing"""
+
+
+    def __enter__(self):
+        """Enters the span"""
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Leaves the span"""
+        return False
+
+
+# shared instance, handed out for every span while tracing is disabled
+NOOP_SPAN = NoopSpan()
+
+
+class Span(object):
+    """Measures the time spent in a (nested) block"""
+
+
+    def __init__(self, tracer, name):
+        """
+        Injects the tracer & sets the spans name
+
+        :param tracer: Tracer instance
+        :type tracer: resources.lib.Tracer
+        :param name: Span name (e.g. `network`)
+        :type name: string
+        """
+        self.tracer = tracer
+        self.name = name
+        self.path = None
+        self.start = None
+
+
+    def __enter__(self):
+        """Starts the span & pushes it on the threads span stack"""
+        stack = self.tracer.get_stack()
+        self.path = '{0}/{1}'.format(stack[-1].path, self.name) if stack else self.name
+        stack.append(self)
+        self.start = time.time()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stops the span & records its duration"""
+        duration = time.time() - self.start
+        self.tracer.get_stack().pop()
+        self.tracer.record(self.path, duration)
+        return False
+
+
+class Tracer(object):
+    """Lightweight per route timing spans, optional cProfile dumps"""
+
+
+    def __init__(self, constants, utils):
+        """
+        Injects instances, tracing starts disabled
+
+        :param constants: Constants instance
+        :type constants: resources.lib.Constants
+        :param utils: Utils instance
+        :type utils: resources.lib.Utils
+        """
+        self.constants = constants
+        self.utils = utils
+        self.enabled = False
+        self.profiler = None
+        self.started = None
+        self.timings = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+
+    def start(self):
+        """Starts tracing a route invocation (if enabled in the settings)"""
+        addon = self.utils.get_addon()
+        self.enabled = addon.getSetting('trace') == 'true'
+        self.timings = {}
+        self.started = time.time()
+        if self.enabled is True and addon.getSetting('trace_profile') == 'true':
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+
+    def span(self, name):
+        """
+        Returns a span context manager for the given name
+
+        :param name: Span name (e.g. `network`)
+        :type name: string
+        :returns:  Span -- Span (a shared no-op span if disabled)
+        """
+        if self.enabled is False:
+            return NOOP_SPAN
+        return Span(tracer=self, name=name)
+
+
+    def record(self, path, duration):
+        """
+        Adds a duration to the spans totals
+
+        :param path: Span path (e.g. `render/format`)
+        :type path: string
+        :param duration: Duration in sec
+        :type duration: float
+        """
+        with self.lock:
+            total, count = self.timings.get(path, (0.0, 0))
+            self.timings[path] = (total + duration, count + 1)
+
+
+    def get_stack(self):
+        """
+        Returns the span stack of the current thread
+
+        :returns:  list -- Open spans
+        """
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = []
+            self.local.stack = stack
+        return stack
+
+
+    def finish(self, route, counters=None):
+        """
+        Logs the summary line of the route & writes the cProfile dump,
+        only the newest dumps are kept
+
+        :param route: Route name
+        :type route: string
+        :param counters: Additional values logged with the summary
+        :type counters: dict
+        """
+        if self.enabled is False:
+            return
+        total = (time.time() - self.started) * 1000
+        spans = ' '.join([
+            '{0}={1:.1f}ms/{2}'.format(path, duration * 1000, count)
+            for path, (duration, count) in sorted(self.timings.items())] + [
+            '{0}={1}'.format(name, value)
+            for name, value in sorted((counters or {}).items())])
+        self.utils.log('[trace] {0} total={1:.1f}ms {2}'.format(route, total, spans))
+        if self.profiler is not None:
+            self.profiler.disable()
+            data_path = self.utils.get_addon_data().get('base_data_path')
+            dump_file = '{0}profile_{1}_{2}.prof'.format(data_path, route, int(self.started))
+            self.profiler.dump_stats(dump_file)
+            self.utils.log('[trace] cProfile dump written to {0}'.format(dump_file))
+            self.profiler = None
+            self.__prune_dumps(data_path=data_path)
+        self.enabled = False
+
+
+    def __prune_dumps(self, data_path):
+        """
+        Removes the oldest cProfile dumps exceeding `PROFILE_MAX_DUMPS`,
+        dumps removed by a concurrent call are ignored
+
+        :param data_path: Addon data path the dumps are written to
+        :type data_path: string
+        """
+        dumps = []
+        for filename in listdir(data_path):
+            if filename.startswith('profile_') and filename.endswith('.prof'):
+                pathname = path.join(data_path, filename)
+                try:
+                    dumps.append((path.getmtime(pathname), pathname))
+                except OSError:
+                    continue
+        dumps.sort(reverse=True)
+        for _, pathname in dumps[self.constants.get_profile_max_dumps():]:
+            try:
+                remove(pathname)
+            except OSError:
+                pass
@@ -7,12 +7,12 @@
 """General plugin utils"""
 
 from __future__ import unicode_literals
+from concurrent.futures import ThreadPoolExecutor
 import platform
-import hashlib
 import urllib
-import json
 import xbmc
 import xbmcaddon
+from resources.lib.Codec import Codec
 
 try:
     import urllib.parse as urllib
@@ -35,23 +35,48 @@ class Utils(object):
         """
         self.constants = constants
         self.kodi_base_url = kodi_base_url
+        self.addon_data = None
+
+
+    def start_invocation(self, kodi_base_url):
+        """
+        Sets the base url of a plugin call (the interpreter
+        is reused for many calls, see `reuselanguageinvoker`)
+
+        :param kodi_base_url: Plugin base url
+        :type kodi_base_url: string
+        """
+        self.kodi_base_url = kodi_base_url
 
 
     def get_addon_data(self):
         """
         Returns the relevant addon data for the plugin,
-        e.g. name, version, default fanart, base data path & cookie pathname
+        e.g. name, version, default fanart, base data path & cookie pathname.
+        It doesn´t change while Kodi runs, so it is read once per interpreter
 
         :returns:  dict - Addon data
         """
+        if self.addon_data is not None:
+            return self.addon_data
         addon = self.get_addon()
         base_data_path = xbmc.translatePath(addon.getAddonInfo('profile'))
-        return dict(
+        self.addon_data = dict(
             plugin=addon.getAddonInfo('name'),
             version=addon.getAddonInfo('version'),
             fanart=addon.getAddonInfo('fanart'),
             base_data_path=base_data_path,
-            cookie_path='{0}COOKIE'.format(base_data_path))
+            cookie_path='{0}COOKIE'.format(base_data_path),
+            search_index_path='{0}SEARCH'.format(base_data_path),
+            search_lock_path='{0}SEARCH.lock'.format(base_data_path),
+            storage_path='{0}storage'.format(base_data_path),
+            circuit_path='{0}CIRCUITS'.format(base_data_path),
+            circuit_lock_path='{0}CIRCUITS.lock'.format(base_data_path),
+            cache_lock_path='{0}CACHE.lock'.format(base_data_path),
+            scheduler_path='{0}SCHEDULER'.format(base_data_path),
+            scheduler_lock_path='{0}SCHEDULER.lock'.format(base_data_path),
+            interactive_path='{0}interactive'.format(base_data_path))
+        return self.addon_data
 
 
     def log(self, msg, level=xbmc.LOGNOTICE):
@@ -99,16 +124,41 @@ class Utils(object):
         return xbmcaddon.Addon(self.constants.get_addon_id())
 
 
-    @classmethod
-    def generate_hash(cls, text):
+    def parallel_map(self, func, items, workers):
+        """
+        Applies a function to all items using a bounded number of threads.
+        A failing item is logged & skipped (its result is None), the
+        others are still processed
+
+        :param func: Function to apply
+        :type func: function
+        :param items: Items
+        :type items: list
+        :param workers: Max. number of threads
+        :type workers: int
+        :returns:  list -- Results (in order of the items, None for failed ones)
+        """
+        if len(items) < 2 or workers < 2:
+            return [self.__apply(func, item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(len(items), workers)) as executor:
+            return list(executor.map(lambda item: self.__apply(func, item), items))
+
+
+    def __apply(self, func, item):
         """
-        Returns an hash for a given text
+        Applies a function to an item of `parallel_map`, errors are logged only
 
-        :param text: String to be hashed
-        :type text: string
-        :returns:  string - Hash
+        :param func: Function to apply
+        :type func: function
+        :param item: Item
+        :type item: mixed
+        :returns:  mixed -- Result (None if the function failed)
         """
-        return hashlib.sha224(text).hexdigest()
+        try:
+            return func(item)
+        except Exception as error:
+            self.log('Skipped an item: {0!r}'.format(error))
+            return None
 
 
     @classmethod
@@ -147,8 +197,8 @@ class Utils(object):
             },
             'id': 1
         }
-        response = xbmc.executeJSONRPC(json.dumps(payload))
-        response_serialized = json.loads(response)
+        response = xbmc.executeJSONRPC(Codec.dumps(payload))
+        response_serialized = Codec.loads(response)
         if 'error' not in response_serialized.keys():
             result = response_serialized.get('result', {})
             version_raw = result.get('version', {})
@@ -173,8 +223,8 @@ class Utils(object):
             }
         }
         # execute the request
-        response = xbmc.executeJSONRPC(json.dumps(payload))
-        response_serialized = json.loads(response)
+        response = xbmc.executeJSONRPC(Codec.dumps(payload))
+        response_serialized = Codec.loads(response)
         if 'error' not in response_serialized.keys():
             result = response_serialized.get('result', {})
             addon = result.get('addon', {})
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+# Module: Warmup
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""Keeps the API documents of the favourite sports warm in the storage"""
+
+from __future__ import unicode_literals
+from datetime import datetime
+from requests.exceptions import RequestException
+import time
+import xbmc
+from resources.lib.Epg import Epg
+from resources.lib.Scheduler import BACKGROUND
+
+try:
+    from urllib.parse import parse_qsl, urlparse
+except ImportError:
+    from urlparse import parse_qsl, urlparse
+
+
+class Warmup(object):
+    """Keeps the API documents of the favourite sports warm in the storage"""
+
+
+    def __init__(self, constants, utils, settings, storage, content_loader, directory):
+        """
+        Injects instances
+
+        :param constants: Constants instance
+        :type constants: resources.lib.Constants
+        :param utils: Utils instance
+        :type utils: resources.lib.Utils
+        :param settings: Settings instance
+        :type settings: resources.lib.Settings
+        :param storage: Storage instance
+        :type storage: resources.lib.Storage
+        :param content_loader: ContentLoader instance
+        :type content_loader: resources.lib.ContentLoader
+        :param directory: Directory instance
+        :type directory: resources.lib.Directory
+        """
+        self.constants = constants
+        self.utils = utils
+        self.settings = settings
+        self.storage = storage
+        self.content_loader = content_loader
+        self.directory = directory
+        self.hot_lanes = set()
+        # search context (sport & lane) of the lane urls
+        self.lane_index = {}
+        # urls of the lanes listed by the live view
+        self.live_lanes = set()
+        self.last_full = 0
+
+
+    def run_once(self, now=None):
+        """
+        Runs a warm-up round. Once per interval navigation, sport pages &
+        all their lanes are refreshed, in between only lanes with live or
+        soon starting events (hot lanes). Refreshed lanes are added to the
+        search index. If the listing Kodi shows changed visibly, it gets
+        refreshed
+
+        :param now: Current time (UTC timestamp)
+        :type now: float
+        :returns:  int -- Number of refreshed lanes
+        """
+        now = now or time.time()
+        interval = self.settings.get_warmup_interval() * 60
+        full = now - self.last_full >= interval
+        if full is True:
+            self.last_full = now
+            lanes = self.__collect_lanes(ttl=interval)
+        else:
+            lanes = list(self.hot_lanes)
+        # hot lanes first, they are the most likely to be opened next
+        lanes.sort(key=lambda url: url not in self.hot_lanes)
+        results = [result for result in self.utils.parallel_map(
+            lambda url: (url,) + self.__refresh_lane(url=url, ttl=self.__get_ttl(url, interval)),
+            lanes,
+            self.constants.get_warmup_workers()) if result is not None]
+        self.content_loader.search.save()
+        horizon = self.constants.get_warmup_soon() + interval
+        hot_lanes = set() if full is True else set(self.hot_lanes)
+        changed_lanes = dict([
+            (url, (previous, self.__get_items(document=document), changed))
+            for url, document, previous, changed in results if len(changed) > 0])
+        for url, document, _, _ in results:
+            if document is None:
+                # keep the last known state of failed lanes
+                if url in self.hot_lanes:
+                    hot_lanes.add(url)
+            elif self.is_hot(document=document, now=now, horizon=horizon):
+                hot_lanes.add(url)
+            else:
+                hot_lanes.discard(url)
+        self.hot_lanes = hot_lanes
+        self.utils.log('[warmup] {0} lanes refreshed ({1} hot, {2} changed)'.format(
+            len(lanes), len(self.hot_lanes), len(changed_lanes)))
+        if len(changed_lanes) > 0:
+            self.__refresh_container(changes=changed_lanes, now=now)
+        return len(lanes)
+
+
+    @classmethod
+    def is_hot(cls, document, now, horizon):
+        """
+        Checks if a lane contains live, running or soon starting events
+
+        :param document: Raw lane document
+        :type document: dict
+        :param now: Current time (UTC timestamp)
+        :type now: float
+        :param horizon: Events starting within this time count (in sec)
+        :type horizon: int
+        :returns:  bool -- Lane is hot
+        """
+        data = document.get('data') or {}
+        for item in data.get('data') or []:
+            if item.get('islivestream'):
+                return True
+            event = Epg.build_event(item=item)
+            if event is not None and event.get('start') - horizon <= now <= event.get('end'):
+                return True
+        return False
+
+
+    def __collect_lanes(self, ttl):
+        """
+        Refreshes navigation & the pages of the favourite sports,
+        returns the lane urls found on these pages (& remembers
+        their search context)
+
+        :param ttl: TTL of the refreshed documents (in sec)
+        :type ttl: int
+        :returns:  list -- Lane urls
+        """
+        api_url = self.constants.get_api_url()
+        favourites = self.settings.get_warmup_sports()
+        navigation = self.__refresh(url=self.constants.get_navigation_url(), ttl=ttl) or {}
+        sports = [
+            sport for sport in (navigation.get('data') or {}).get('league_filter', [])
+            if str(sport.get('id')) in favourites]
+        pages = self.utils.parallel_map(
+            lambda sport: self.__refresh(url='{0}{1}'.format(api_url, sport.get('target')), ttl=ttl),
+            sports,
+            self.constants.get_warmup_workers())
+        lanes = []
+        lane_index = {}
+        live_lanes = set()
+        for sport, page in zip(sports, pages):
+            for lane in self.content_loader.get_lanes(page or {}):
+                element = lane.get('group_elements')[0]
+                data_url = element.get('data_url')
+                url = self.content_loader.get_lane_url(lane=data_url)
+                lane_index[url] = {'sport': sport, 'lane': data_url}
+                if self.content_loader.is_live_lane(element=element) is True:
+                    live_lanes.add(url)
+                lanes.append(url)
+        self.lane_index = lane_index
+        self.live_lanes = live_lanes
+        return lanes
+
+
+    def __get_ttl(self, url, interval):
+        """
+        Returns the TTL a lane document is stored with, hot lanes are
+        refreshed (& therefore valid) for a shorter time
+
+        :param url: Lane url
+        :type url: string
+        :param interval: Refresh interval (in sec)
+        :type interval: int
+        :returns:  int -- TTL in sec
+        """
+        if url in self.hot_lanes:
+            return self.constants.get_warmup_live_interval()
+        return interval
+
+
+    def __refresh_lane(self, url, ttl):
+        """
+        Refreshes a lane document & compares its items with the stored version
+
+        :param url: Lane url
+        :type url: string
+        :param ttl: TTL of the refreshed document (in sec)
+        :type ttl: int
+        :returns:  tuple -- Decoded document (or None), items of the stored version & keys of new, changed or removed items
+        """
+        stored = self.storage.get(url) or {}
+        document = self.__refresh(url=url, ttl=ttl, index=self.lane_index.get(url))
+        if document is None or 'payload' not in stored:
+            return (document, [], set())
+        previous = self.__get_items(document=stored.get('payload'))
+        changed, removed = self.content_loader.item_helper.diff_items(
+            previous=previous,
+            current=self.__get_items(document=document),
+            previous_now=datetime.fromtimestamp(stored.get('stored')),
+            now=datetime.now())
+        return (document, previous, set(changed + removed))
+
+
+    @classmethod
+    def __get_items(cls, document):
+        """
+        Returns the items of a lane document
+
+        :param document: Decoded lane document
+        :type document: dict
+        :returns:  list -- Raw API items
+        """
+        return ((document or {}).get('data') or {}).get('data') or []
+
+
+    def __refresh_container(self, changes, now):
+        """
+        Refreshes the listing Kodi shows if items it lists changed: the
+        shown page of a lane or the live & upcoming events of the live
+        view. Its snapshot is dropped first
+
+        :param changes: Items of the stored & current version & keys of the changed items by lane url
+        :type changes: dict
+        :param now: Current time (UTC timestamp)
+        :type now: float
+        """
+        folder_path = xbmc.getInfoLabel('Container.FolderPath')
+        if not folder_path.startswith('plugin://{0}'.format(self.constants.get_addon_id())):
+            return
+        route = urlparse(folder_path).query
+        params = dict(parse_qsl(route))
+        if params.get('live') is not None:
+            shown = self.__is_live_view_changed(changes=changes, now=now)
+        elif params.get('lane') is not None and params.get('target') is None:
+            shown = self.__is_lane_page_changed(changes=changes, params=params)
+        else:
+            shown = False
+        if shown is False:
+            return
+        self.directory.invalidate(route=route)
+        xbmc.executebuiltin('Container.Refresh')
+        self.utils.log('[warmup] Refreshed the shown listing')
+
+
+    def __is_lane_page_changed(self, changes, params):
+        """
+        Checks if the lane page Kodi shows lists other or changed items,
+        the slice of the API page shown (see `ContentLoader.show_event_lane`)
+        is compared only
+
+        :param changes: Items of the stored & current version & keys of the changed items by lane url
+        :type changes: dict
+        :param params: Params of the shown listing
+        :type params: dict
+        :returns:  bool -- Shown page changed
+        """
+        shown_url = self.content_loader.get_lane_url(lane=params.get('lane'), page=int(params.get('page', 1)))
+        if shown_url not in changes:
+            return False
+        previous, current, changed = changes.get(shown_url)
+        offset = int(params.get('offset', 0))
+        page_size = self.constants.get_lane_page_size()
+        get_item_key = self.content_loader.item_helper.get_item_key
+        previous_keys = [get_item_key(item=item) for item in previous[offset:offset + page_size]]
+        current_keys = [get_item_key(item=item) for item in current[offset:offset + page_size]]
+        return previous_keys != current_keys or len(changed.intersection(current_keys)) > 0
+
+
+    def __is_live_view_changed(self, changes, now):
+        """
+        Checks if a live or upcoming event of a live lane changed, these
+        are the events the live view lists (see `ContentLoader.show_live_now`)
+
+        :param changes: Items of the stored & current version & keys of the changed items by lane url
+        :type changes: dict
+        :param now: Current time (UTC timestamp)
+        :type now: float
+        :returns:  bool -- Live view changed
+        """
+        get_item_key = self.content_loader.item_helper.get_item_key
+        for url, (previous, current, changed) in changes.items():
+            if url not in self.live_lanes:
+                continue
+            for item in previous + current:
+                if get_item_key(item=item) not in changed:
+                    continue
+                event = Epg.build_event(item=item)
+                if event is not None and (event.get('live') is True or now <= event.get('end')):
+                    return True
+        return False
+
+
+    def __refresh(self, url, ttl, index=None):
+        """
+        Refreshes a document, failures are logged only
+
+        :param url: API url
+        :type url: string
+        :param ttl: TTL of the refreshed document (in sec)
+        :type ttl: int
+        :param index: Search context of a lane document (see `ContentLoader.fetch_json`)
+        :type index: dict
+        :returns:  dict -- Decoded document (or None if the request failed)
+        """
+        try:
+            return self.content_loader.refresh_json(url=url, ttl=ttl, priority=BACKGROUND, index=index)
+        except (RequestException, ValueError) as error:
+            self.utils.log('[warmup] Refreshing {0} failed: {1}'.format(url, error))
+            return None
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Module: service
+# Author: asciidisco
+# Created on: 19.10.2026
+# License: MIT https://goo.gl/WA1kby
+
+"""Background service, keeps the favourite sports warm"""
+
+from __future__ import unicode_literals
+import time
+import xbmc
+from resources.lib.Plugin import get_plugin
+from resources.lib.Warmup import Warmup
+
+# init plugin object structure (no plugin handle, nothing is listed)
+PLUGIN = get_plugin()
+CONSTANTS = PLUGIN.constants
+UTILS = PLUGIN.utils
+SETTINGS = PLUGIN.settings
+WARMUP = Warmup(
+    constants=CONSTANTS,
+    utils=UTILS,
+    settings=SETTINGS,
+    storage=PLUGIN.storage,
+    content_loader=PLUGIN.content_loader,
+    directory=PLUGIN.directory)
+
+
+def run():
+    """
+    Runs a warm-up round every tick (hot lanes only, all lanes once per
+    interval) until Kodi shuts down. The stored entries are pruned
+    once per prune interval
+    """
+    monitor = xbmc.Monitor()
+    last_prune = 0
+    while not monitor.abortRequested():
+        if time.time() - last_prune >= CONSTANTS.get_storage_prune_interval():
+            last_prune = time.time()
+            max_age, max_size = CONSTANTS.get_storage_limits()
+            UTILS.log('[storage] {0} entries pruned'.format(
+                PLUGIN.storage.prune(max_age=max_age, max_size=max_size)))
+        if SETTINGS.is_warmup_enabled() and len(SETTINGS.get_warmup_sports()) > 0:
+            # every round must see the current API responses
+            PLUGIN.start_invocation(handle=-1, kodi_base_url='')
+            WARMUP.run_once()
+        if monitor.waitForAbort(CONSTANTS.get_warmup_live_interval()):
+            break
+
+
+if __name__ == '__main__':
+    UTILS.log('Warm-up service started')
+    run()